@@ -7,7 +7,7 @@ from typing import Dict, Any
 from dataclasses import dataclass
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
     """Agent message structure"""
     sender: str
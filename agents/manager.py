@@ -2,6 +2,7 @@
 Agent Manager
 """
 
+import asyncio
 import logging
 from typing import Dict, List
 from agents.base import BaseAgent, AgentMessage, SimpleAgent
@@ -25,22 +26,25 @@ class AgentManager:
         try:
             await agent.start()
             self.agents[agent.name] = agent
-            logger.info(f"Agent {agent.name} registered")
+            logger.info("Agent %s registered", agent.name)
             return True
-        except Exception as e:
-            logger.error(f"Failed to register agent {agent.name}: {e}")
+        except Exception:
+            logger.exception("Failed to register agent %s", agent.name)
             return False
     
     async def route_message(self, message: AgentMessage) -> List[str]:
         """Route message to all agents"""
+        agents = [agent for agent in self.agents.values() if agent.is_active]
+        results = await asyncio.gather(
+            *(agent.process_message(message) for agent in agents),
+            return_exceptions=True,
+        )
         responses = []
-        for agent in self.agents.values():
-            if agent.is_active:
-                try:
-                    response = await agent.process_message(message)
-                    responses.append(response)
-                except Exception as e:
-                    logger.error(f"Error in agent {agent.name}: {e}")
+        for agent, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.error("Error in agent %s", agent.name, exc_info=result)
+            else:
+                responses.append(result)
         return responses
     
     async def shutdown(self):
@@ -3,23 +3,34 @@ FastAPI REST API
 """
 
 from fastapi import FastAPI
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 
-app = FastAPI(title="Telegram Bot API", version="1.0.0")
+app = FastAPI(
+    title="Telegram Bot API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+)
+
+# Static payloads are encoded once at import
+_ROOT_RESPONSE = ORJSONResponse({"status": "running", "version": "1.0.0"})
+_HEALTH_RESPONSE = ORJSONResponse({"status": "healthy"})
 
 class MessageRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     chat_id: int
     text: str
 
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {"status": "running", "version": "1.0.0"}
+    return _ROOT_RESPONSE
 
 @app.get("/health")
 async def health():
     """Health check"""
-    return {"status": "healthy"}
+    return _HEALTH_RESPONSE
 
 @app.post("/message")
 async def send_message(request: MessageRequest):
@@ -4,24 +4,27 @@ Main Telegram Bot Application
 
 import asyncio
 import logging
+import signal
 from telegram.ext import Application
-from config.settings import settings
+from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
 class TelegramBot:
     """Production-ready Telegram bot"""
     
-    def __init__(self):
+    def __init__(self, settings):
+        self.settings = settings
         self.application = None
     
     async def initialize(self):
         """Initialize bot with webhook or polling"""
+        settings = self.settings
         self.application = Application.builder().token(settings.BOT_TOKEN).build()
         
         if settings.WEBHOOK_URL:
             await self.application.bot.set_webhook(settings.WEBHOOK_URL)
-            logger.info(f"Webhook set to: {settings.WEBHOOK_URL}")
+            logger.info("Webhook set to: %s", settings.WEBHOOK_URL)
         else:
             logger.info("Running in polling mode")
     
@@ -30,7 +33,7 @@ class TelegramBot:
         await self.application.initialize()
         await self.application.start()
         
-        if settings.WEBHOOK_URL:
+        if self.settings.WEBHOOK_URL:
             await self.application.updater.start_webhook()
         else:
             await self.application.updater.start_polling()
@@ -44,14 +47,17 @@ class TelegramBot:
 
 async def main():
     """Main entry point"""
-    bot = TelegramBot()
+    bot = TelegramBot(get_settings())
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
     try:
         await bot.initialize()
         await bot.start()
         
-        # Keep running
-        while True:
-            await asyncio.sleep(1)
+        # Keep running until a shutdown signal arrives
+        await stop.wait()
     except KeyboardInterrupt:
         logger.info("Shutting down...")
     finally:
@@ -59,4 +65,10 @@ async def main():
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is unavailable on Windows; use the default asyncio loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
@@ -2,6 +2,7 @@
 Configuration settings
 """
 
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -24,4 +25,7 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per process, on first use"""
+    return Settings()
@@ -19,22 +19,35 @@ Production-ready components for Telegram bot development including:
 - And more...
 """
 
+import logging
+
+# Library convention: stay silent unless the application configures logging
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 # Core Components
-from .core import TelegramBot, BotConfig, BotMode, WebhookManager, UpdateProcessor
+from .core import (
+    TelegramBot, BotConfig, BotMode, WebhookManager, UpdateProcessor,
+    UpdateKind, BotStatus, BotInfo, WebhookInfo
+)
 
 # Handlers
 from .handlers import (
     MessageHandler, CommandHandler, CallbackHandler, 
     InlineQueryHandler, MediaHandler, ChatMemberHandler, PollHandler,
-    HandlerFactory
+    HandlerFactory, cpu_bound
 )
 
 # Models
-from .models.telegram_models import *
+from .models.telegram_models import (
+    ChatType, MessageType, UpdateType,
+    TelegramUser, TelegramChat, TelegramMessage, TelegramUpdate, TelegramUpdateBatch,
+    TelegramUserModel, TelegramChatModel, TelegramMessageModel, TelegramUpdateModel,
+    decode_update
+)
 from .models.database_models import *
 
 # Services
-from .services.api_service import TelegramAPIService
+from .services.api_service import BatchingSender, TelegramAPIService
 from .services.database_service import DatabaseService, ServiceFactory
 from .services.memory_service import MemoryService, ConversationMemory
 
@@ -53,22 +66,25 @@ __author__ = "StackConsult"
 __all__ = [
     # Core
     "TelegramBot", "BotConfig", "BotMode", "WebhookManager", "UpdateProcessor",
+    "UpdateKind", "BotStatus", "BotInfo", "WebhookInfo",
     
     # Handlers
     "MessageHandler", "CommandHandler", "CallbackHandler", 
     "InlineQueryHandler", "MediaHandler", "ChatMemberHandler", "PollHandler",
-    "HandlerFactory",
+    "HandlerFactory", "cpu_bound",
     
     # Models (Telegram)
     "TelegramUser", "TelegramChat", "TelegramMessage", "TelegramUpdate",
-    "ChatType", "MessageType", "UpdateType",
+    "TelegramUpdateBatch", "ChatType", "MessageType", "UpdateType",
+    "TelegramUserModel", "TelegramChatModel", "TelegramMessageModel",
+    "TelegramUpdateModel", "decode_update",
     
     # Models (Database)
     "User", "Chat", "Message", "ChatMember", "BotCommand", 
     "UserSession", "BotLog", "BotStats",
     
     # Services
-    "TelegramAPIService", "DatabaseService", "ServiceFactory",
+    "TelegramAPIService", "BatchingSender", "DatabaseService", "ServiceFactory",
     "MemoryService", "ConversationMemory",
     
     # Utilities
@@ -5,36 +5,207 @@ Production-ready core components for Telegram bot applications.
 """
 
 import asyncio
+import inspect
 import logging
-from typing import Dict, List, Optional, Callable, Any, Union
-from dataclasses import dataclass, field
+import queue
+import signal
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Awaitable, Dict, Final, List, Optional, Callable, Any, Tuple, Union
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 
 from telegram import Update, Bot, InlineKeyboardMarkup, ReplyKeyboardMarkup
 from telegram.ext import (
     Application,
+    ApplicationHandlerStop,
+    BaseHandler,
+    BaseUpdateProcessor,
     CommandHandler,
     MessageHandler,
     CallbackQueryHandler,
     InlineQueryHandler,
+    ChosenInlineResultHandler,
+    ShippingQueryHandler,
+    PreCheckoutQueryHandler,
+    PollHandler,
+    PollAnswerHandler,
+    ChatMemberHandler,
+    ChatJoinRequestHandler,
+    TypeHandler,
     filters,
 )
-from telegram.request import BaseRequest
+from telegram.request import BaseRequest, HTTPXRequest
 
-from ..config.settings import settings
+from ..config.settings import get_settings
 from ..models.telegram_models import (
     TelegramUpdate,
     TelegramMessage,
     TelegramUser,
     TelegramChat,
 )
+from ..handlers import HandlerFactory
 from ..services.api_service import TelegramAPIService
 from ..utils.keyboards import KeyboardBuilder
 from ..utils.formatters import MessageFormatter
 
 logger = logging.getLogger(__name__)
 
+# Update types consumed by the handlers in TelegramBot._register_default_handlers
+_DEFAULT_UPDATES = ("message", "callback_query")
+
+# Handler group for UpdateProcessor handlers, after the default handlers in group 0
+_PROCESSOR_GROUP = 1
+
+# Number of dispatched updates between reorderings of the update type checks
+_RECOMPILE_INTERVAL = 1024
+
+# Plain text messages that are not bot commands
+_TEXT_NOT_COMMAND = filters.TEXT & ~filters.COMMAND
+
+# Background listener that owns the real log handlers (see _install_queue_logging)
+_log_listener: Optional[QueueListener] = None
+_log_queue_handler: Optional[QueueHandler] = None
+
+# Log level names accepted in BotConfig.log_level
+_LEVEL_MAP = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO,
+    "DEBUG": logging.DEBUG,
+}
+
+# Seconds between "dropped log records" reports
+_DROP_REPORT_INTERVAL = 1.0
+
+# Static replies for the built-in commands
+_WELCOME_TEXT: Final = (
+    "🤖 Welcome to the Telegram Bot API Template!\n\n"
+    "This is a production-ready bot with comprehensive features.\n\n"
+    "Available commands:\n"
+    "/help - Show help\n"
+    "/status - Check bot status"
+)
+
+_HELP_TEXT: Final = (
+    "📚 **Bot Help**\n\n"
+    "**Commands:**\n"
+    "/start - Start the bot\n"
+    "/help - Show this help\n"
+    "/status - Check bot status\n\n"
+    "**Features:**\n"
+    "• Message handling\n"
+    "• Command processing\n"
+    "• Callback queries\n"
+    "• Inline queries\n"
+    "• Webhook support\n"
+    "• Rate limiting\n"
+    "• User management"
+)
+
+
+class DropOnFullQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DropReportingQueueListener(QueueListener):
+    """Queue listener that periodically reports records dropped by the handler"""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        source: DropOnFullQueueHandler,
+        *handlers: logging.Handler,
+        respect_handler_level: bool = False,
+    ):
+        super().__init__(
+            log_queue, *handlers, respect_handler_level=respect_handler_level
+        )
+        self._source = source
+        self._last_report = time.monotonic()
+
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; wait for room instead of raising
+        self.queue.put(self._sentinel)
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            self._report_dropped()
+            try:
+                return self.queue.get(block, timeout=_DROP_REPORT_INTERVAL)
+            except queue.Empty:
+                if not block:
+                    raise
+
+    def _report_dropped(self):
+        now = time.monotonic()
+        if now - self._last_report < _DROP_REPORT_INTERVAL:
+            return
+        self._last_report = now
+
+        dropped = self._source.dropped
+        if dropped:
+            self._source.dropped -= dropped
+            self.handle(
+                logging.makeLogRecord(
+                    {
+                        "name": __name__,
+                        "levelno": logging.WARNING,
+                        "levelname": "WARNING",
+                        "msg": "Dropped %d log records",
+                        "args": (dropped,),
+                    }
+                )
+            )
+
+
+def _install_queue_logging(level: int, max_size: int) -> QueueListener:
+    """Route root logging through a bounded queue drained by a background thread"""
+    global _log_listener, _log_queue_handler
+
+    if _log_listener is not None:
+        return _log_listener
+
+    log_queue: queue.Queue = queue.Queue(max_size)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+
+    _log_queue_handler = DropOnFullQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_log_queue_handler)
+    root.setLevel(level)
+
+    _log_listener = _DropReportingQueueListener(
+        log_queue, _log_queue_handler, stream_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    return _log_listener
+
+
+def _stop_queue_logging():
+    """Flush and stop the background log listener"""
+    global _log_listener, _log_queue_handler
+
+    if _log_listener is None:
+        return
+
+    logging.getLogger().removeHandler(_log_queue_handler)
+    _log_listener.stop()
+    _log_listener = None
+    _log_queue_handler = None
+
 
 class BotMode(str, Enum):
     """Bot operation modes"""
@@ -44,7 +215,64 @@ class BotMode(str, Enum):
     WEBHOOK_APP = "webhook_app"
 
 
-@dataclass
+class UpdateKind(IntEnum):
+    """Update kinds, used as indexes into the handler registry"""
+
+    MESSAGE = 0
+    EDITED_MESSAGE = 1
+    CHANNEL_POST = 2
+    EDITED_CHANNEL_POST = 3
+    CALLBACK_QUERY = 4
+    INLINE_QUERY = 5
+    CHOSEN_INLINE_RESULT = 6
+    SHIPPING_QUERY = 7
+    PRE_CHECKOUT_QUERY = 8
+    POLL = 9
+    POLL_ANSWER = 10
+    MY_CHAT_MEMBER = 11
+    CHAT_MEMBER = 12
+    CHAT_JOIN_REQUEST = 13
+    COMMAND = 14
+
+
+# Kinds that correspond to a field on telegram.Update
+_UPDATE_KINDS = tuple(kind for kind in UpdateKind if kind is not UpdateKind.COMMAND)
+
+# Message filters for the message-like kinds; plain messages exclude commands
+# so MESSAGE and COMMAND handlers never compete within the processor group
+_MESSAGE_FILTERS = {
+    UpdateKind.MESSAGE: filters.UpdateType.MESSAGE & ~filters.COMMAND,
+    UpdateKind.EDITED_MESSAGE: filters.UpdateType.EDITED_MESSAGE,
+    UpdateKind.CHANNEL_POST: filters.UpdateType.CHANNEL_POST,
+    UpdateKind.EDITED_CHANNEL_POST: filters.UpdateType.EDITED_CHANNEL_POST,
+    UpdateKind.COMMAND: filters.UpdateType.MESSAGE & filters.COMMAND,
+}
+
+# PTB handler classes for the remaining kinds
+_NATIVE_HANDLERS = {
+    UpdateKind.CALLBACK_QUERY: CallbackQueryHandler,
+    UpdateKind.INLINE_QUERY: InlineQueryHandler,
+    UpdateKind.CHOSEN_INLINE_RESULT: ChosenInlineResultHandler,
+    UpdateKind.SHIPPING_QUERY: ShippingQueryHandler,
+    UpdateKind.PRE_CHECKOUT_QUERY: PreCheckoutQueryHandler,
+    UpdateKind.POLL: PollHandler,
+    UpdateKind.POLL_ANSWER: PollAnswerHandler,
+    UpdateKind.CHAT_JOIN_REQUEST: ChatJoinRequestHandler,
+}
+
+
+def _native_handler(kind: UpdateKind, callback: Callable) -> BaseHandler:
+    """Build the PTB handler that matches an update kind"""
+    if kind in _MESSAGE_FILTERS:
+        return MessageHandler(_MESSAGE_FILTERS[kind], callback)
+    if kind is UpdateKind.MY_CHAT_MEMBER:
+        return ChatMemberHandler(callback, ChatMemberHandler.MY_CHAT_MEMBER)
+    if kind is UpdateKind.CHAT_MEMBER:
+        return ChatMemberHandler(callback, ChatMemberHandler.CHAT_MEMBER)
+    return _NATIVE_HANDLERS[kind](callback)
+
+
+@dataclass(slots=True)
 class BotConfig:
     """Bot configuration"""
 
@@ -57,17 +285,99 @@ class BotConfig:
     rate_limit_per_minute: int = 30
     enable_logging: bool = True
     log_level: str = "INFO"
+    log_queue_size: int = 10_000
+    update_workers: int = 4
+    update_queue_size: int = 10_000
+    chat_queue_size: int = 1_000
+    connection_pool_size: int = 256
+    read_pool_size: int = 16
+    get_updates_pool_size: int = 1
+    pool_timeout: float = 10.0
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    http_version: str = "2"
+
+
+@dataclass(slots=True, frozen=True)
+class WebhookInfo:
+    """Webhook information"""
+
+    url: str
+    has_custom_certificate: bool
+    pending_update_count: int
+    last_error_date: Optional[datetime] = None
+    last_error_message: Optional[str] = None
+    max_connections: Optional[int] = None
+    allowed_updates: Optional[List[str]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class BotInfo:
+    """Bot account information"""
+
+    id: int
+    is_bot: bool
+    first_name: str
+    username: Optional[str] = None
+    can_join_groups: Optional[bool] = None
+    can_read_all_group_messages: Optional[bool] = None
+    supports_inline_queries: Optional[bool] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
+@dataclass(slots=True, frozen=True)
+class BotStatus:
+    """Bot status snapshot"""
+
+    is_running: bool
+    mode: str
+    token_configured: bool
+    webhook_configured: bool
+    admin_users: int
+    allowed_users: int
+    rate_limit: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
 
 
 class WebhookManager:
     """Manages Telegram bot webhooks"""
 
-    def __init__(self, bot: Bot, config: BotConfig):
+    __slots__ = ("bot", "config", "update_processor", "default_updates")
+
+    logger = logging.getLogger(f"{__name__}.WebhookManager")
+
+    def __init__(
+        self,
+        bot: Bot,
+        config: BotConfig,
+        update_processor: Optional["UpdateProcessor"] = None,
+        default_updates: Tuple[str, ...] = (),
+    ):
         self.bot = bot
         self.config = config
-        self.logger = logging.getLogger(f"{__name__}.WebhookManager")
+        self.update_processor = update_processor
+        self.default_updates = default_updates
+
+    def allowed_updates(self) -> Optional[List[str]]:
+        """Update types Telegram should deliver, or None for all of them"""
+        if self.update_processor is None:
+            return None
 
-    async def setup_webhook(self) -> bool:
+        allowed = set(self.default_updates)
+        allowed.update(self.update_processor.allowed_updates())
+        return sorted(allowed)
+
+    async def setup_webhook(self, drop_pending_updates: bool = True) -> bool:
         """Setup webhook for the bot"""
         try:
             if not self.config.webhook_url:
@@ -80,14 +390,15 @@ class WebhookManager:
                 url=webhook_url,
                 secret_token=self.config.token,
                 max_connections=40,
-                allowed_updates=None,
+                allowed_updates=self.allowed_updates(),
+                drop_pending_updates=drop_pending_updates,
             )
 
-            self.logger.info(f"Webhook set to: {webhook_url}")
+            self.logger.info("Webhook set to: %s", webhook_url)
             return True
 
-        except Exception as e:
-            self.logger.error(f"Failed to setup webhook: {e}")
+        except Exception:
+            self.logger.exception("Failed to setup webhook")
             return False
 
     async def remove_webhook(self) -> bool:
@@ -96,198 +407,450 @@ class WebhookManager:
             await self.bot.delete_webhook()
             self.logger.info("Webhook removed")
             return True
-        except Exception as e:
-            self.logger.error(f"Failed to remove webhook: {e}")
+        except Exception:
+            self.logger.exception("Failed to remove webhook")
             return False
 
-    async def get_webhook_info(self) -> Dict[str, Any]:
+    async def get_webhook_info(self) -> Optional[WebhookInfo]:
         """Get current webhook information"""
         try:
             info = await self.bot.get_webhook_info()
-            return {
-                "url": info.url,
-                "has_custom_certificate": info.has_custom_certificate,
-                "pending_update_count": info.pending_update_count,
-                "last_error_date": info.last_error_date,
-                "last_error_message": info.last_error_message,
-                "max_connections": info.max_connections,
-                "allowed_updates": info.allowed_updates,
-            }
-        except Exception as e:
-            self.logger.error(f"Failed to get webhook info: {e}")
-            return {}
+            return WebhookInfo(
+                url=info.url,
+                has_custom_certificate=info.has_custom_certificate,
+                pending_update_count=info.pending_update_count,
+                last_error_date=info.last_error_date,
+                last_error_message=info.last_error_message,
+                max_connections=info.max_connections,
+                allowed_updates=info.allowed_updates,
+            )
+        except Exception:
+            self.logger.exception("Failed to get webhook info")
+            return None
+
+
+class ChatOrderedUpdateProcessor(BaseUpdateProcessor):
+    """Processes updates of one chat in order and different chats concurrently"""
+
+    __slots__ = ("max_pending", "_tails", "_pending")
+
+    logger = logging.getLogger(f"{__name__}.ChatOrderedUpdateProcessor")
+
+    def __init__(self, max_concurrent_updates: int, max_pending: int = 1_000):
+        super().__init__(max_concurrent_updates)
+        self.max_pending = max_pending
+        # chat id -> future resolved when the chat's latest update finishes
+        self._tails: Dict[int, asyncio.Future] = {}
+        self._pending: Dict[int, int] = {}
+
+    async def process_update(self, update: object, coroutine: Awaitable[Any]):
+        """Run the update once the same chat's earlier updates have finished
+
+        Waiting happens before the base class takes its semaphore, so a busy
+        chat only ever holds one of the max_concurrent_updates slots.
+        """
+        chat = getattr(update, "effective_chat", None)
+        if chat is None:
+            await super().process_update(update, coroutine)
+            return
+
+        chat_id = chat.id
+        pending = self._pending.get(chat_id, 0)
+        if pending >= self.max_pending:
+            if asyncio.iscoroutine(coroutine):
+                coroutine.close()
+            self.logger.warning(
+                "Update queue full for chat %s, dropping update", chat_id
+            )
+            return
+
+        previous = self._tails.get(chat_id)
+        done = asyncio.get_running_loop().create_future()
+        done.add_done_callback(lambda _: self._release_tail(chat_id, done))
+        self._tails[chat_id] = done
+        self._pending[chat_id] = pending + 1
+        try:
+            if previous is not None:
+                # Shielded so a cancelled waiter does not cancel the chain
+                await asyncio.shield(previous)
+            await super().process_update(update, coroutine)
+        finally:
+            if (
+                asyncio.iscoroutine(coroutine)
+                and inspect.getcoroutinestate(coroutine) == inspect.CORO_CREATED
+            ):
+                # Cancelled before its turn came
+                coroutine.close()
+            if previous is None or previous.done():
+                done.set_result(None)
+            else:
+                # Keep later updates behind the one we were waiting for
+                previous.add_done_callback(lambda _: done.set_result(None))
+            self._pending[chat_id] -= 1
+            if not self._pending[chat_id]:
+                del self._pending[chat_id]
+
+    def _release_tail(self, chat_id: int, done: asyncio.Future):
+        """Forget the chat's tail once its last update has finished"""
+        if self._tails.get(chat_id) is done:
+            del self._tails[chat_id]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]):
+        """Run the update; ordering is handled in process_update"""
+        await coroutine
+
+    async def _drain(self):
+        """Wait until every chat's queued updates have run"""
+        while self._tails:
+            await asyncio.wait(list(self._tails.values()))
+
+    async def initialize(self):
+        """Let updates left over from a previous run finish first"""
+        await self._drain()
+
+    async def shutdown(self):
+        """Wait for the queued updates of every chat"""
+        await self._drain()
 
 
 class UpdateProcessor:
     """Processes Telegram updates"""
 
+    __slots__ = (
+        "config",
+        "_handlers",
+        "_queue",
+        "_workers",
+        "_type_hits",
+        "_dispatched",
+        "_get_update_type",
+        "_application",
+        "_group",
+        "_attached",
+    )
+
+    logger = logging.getLogger(f"{__name__}.UpdateProcessor")
+
     def __init__(self, config: BotConfig):
         self.config = config
-        self.logger = logging.getLogger(f"{__name__}.UpdateProcessor")
-        self.handlers: Dict[str, List[Callable]] = {
-            "message": [],
-            "command": [],
-            "callback_query": [],
-            "inline_query": [],
-            "edited_message": [],
-            "channel_post": [],
-            "edited_channel_post": [],
-            "chosen_inline_result": [],
-            "shipping_query": [],
-            "pre_checkout_query": [],
-            "poll": [],
-            "poll_answer": [],
-            "my_chat_member": [],
-            "chat_member": [],
-            "chat_join_request": [],
-        }
-
-    def register_handler(self, update_type: str, handler: Callable):
+        self._handlers: Tuple[Tuple[Callable, ...], ...] = tuple(() for _ in UpdateKind)
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._type_hits: List[int] = [0] * len(UpdateKind)
+        self._dispatched = 0
+        self._application: Optional[Application] = None
+        self._group = _PROCESSOR_GROUP
+        self._attached: List[bool] = [False] * len(UpdateKind)
+        self._compile_update_type()
+
+    @property
+    def handlers(self) -> Dict[str, Tuple[Callable, ...]]:
+        """Registered handlers keyed by update type name"""
+        return {kind.name.lower(): self._handlers[kind] for kind in UpdateKind}
+
+    def allowed_updates(self) -> List[str]:
+        """Names of the update types that have at least one handler"""
+        allowed = [
+            kind.name.lower() for kind in _UPDATE_KINDS if self._handlers[kind]
+        ]
+        if self._handlers[UpdateKind.COMMAND] and "message" not in allowed:
+            allowed.append("message")
+        return allowed
+
+    def register_handler(self, update_type: Union[str, UpdateKind], handler: Callable):
         """Register handler for specific update type"""
-        if update_type in self.handlers:
-            self.handlers[update_type].append(handler)
-        else:
-            self.logger.warning(f"Unknown update type: {update_type}")
+        try:
+            kind = (
+                update_type
+                if isinstance(update_type, UpdateKind)
+                else UpdateKind[update_type.upper()]
+            )
+        except KeyError:
+            self.logger.warning("Unknown update type: %s", update_type)
+            return
+
+        handlers = list(self._handlers)
+        handlers[kind] = handlers[kind] + (handler,)
+        self._handlers = tuple(handlers)
+        self._compile_update_type()
+
+        if self._application is not None:
+            self._attach_kind(kind)
+
+    def attach(self, application: Application, group: int = _PROCESSOR_GROUP):
+        """Dispatch registered handlers through the application's own handlers"""
+        self._application = application
+        self._group = group
+        for kind in UpdateKind:
+            if self._handlers[kind]:
+                self._attach_kind(kind)
+
+    def _attach_kind(self, kind: UpdateKind):
+        """Add one PTB handler for a kind; it runs whatever is registered then"""
+        if self._attached[kind]:
+            return
+
+        async def callback(update: Update, context):
+            await self._run_handlers(kind, update)
+
+        self._application.add_handler(_native_handler(kind, callback), self._group)
+        self._attached[kind] = True
+
+    async def start(self):
+        """Start the update worker pool"""
+        if self._workers:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.config.update_queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker())
+            for _ in range(max(1, self.config.update_workers))
+        ]
+
+    async def drain(self):
+        """Wait until every queued update has been processed"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self):
+        """Stop the update worker pool"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
 
     async def process_update(self, update: Update) -> bool:
-        """Process incoming update"""
+        """Queue an update received outside the application, e.g. by a web app"""
+        if self._queue is None:
+            # Worker pool not started, dispatch inline
+            return await self._dispatch(update)
+
         try:
-            # Convert to our model
-            telegram_update = TelegramUpdate.from_telegram_update(update)
+            self._queue.put_nowait(update)
+            return True
+        except asyncio.QueueFull:
+            self.logger.warning("Update queue full, dropping update")
+            return False
 
-            # Determine update type and route to handlers
-            update_type = self._get_update_type(update)
+    async def _worker(self):
+        """Consume queued updates"""
+        queue = self._queue
+        while True:
+            update = await queue.get()
+            try:
+                await self._dispatch(update)
+            finally:
+                queue.task_done()
+
+    async def _dispatch(self, update: Update) -> bool:
+        """Route update to registered handlers"""
+        # Determine update type before paying for the model conversion
+        kind = self._get_update_type(update)
+        if kind < 0:
+            self.logger.warning("No handlers for update type")
+            return False
 
-            if update_type in self.handlers:
-                for handler in self.handlers[update_type]:
-                    try:
-                        await handler(telegram_update)
-                    except Exception as e:
-                        self.logger.error(f"Handler error for {update_type}: {e}")
-                        continue
-                return True
-            else:
-                self.logger.warning(f"No handlers for update type: {update_type}")
-                return False
+        self._record_hit(kind)
+        return await self._run_handlers(kind, update)
+
+    async def _run_handlers(self, kind: int, update: Update) -> bool:
+        """Run the handlers registered for a kind on one update"""
+        try:
+            # Snapshot handlers so registration during dispatch is not seen
+            handlers = self._handlers[kind]
+
+            # Convert to our model
+            telegram_update = TelegramUpdate.from_telegram_update(update)
+            results = await asyncio.gather(
+                *(handler(telegram_update) for handler in handlers),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(
+                        "Handler error for %s",
+                        UpdateKind(kind).name.lower(),
+                        exc_info=result,
+                    )
+            return True
 
-        except Exception as e:
-            self.logger.error(f"Error processing update: {e}")
+        except Exception:
+            self.logger.exception("Error processing update")
             return False
 
-    def _get_update_type(self, update: Update) -> str:
-        """Determine update type"""
-        if update.message:
-            return "message"
-        elif update.edited_message:
-            return "edited_message"
-        elif update.channel_post:
-            return "channel_post"
-        elif update.edited_channel_post:
-            return "edited_channel_post"
-        elif update.callback_query:
-            return "callback_query"
-        elif update.inline_query:
-            return "inline_query"
-        elif update.chosen_inline_result:
-            return "chosen_inline_result"
-        elif update.shipping_query:
-            return "shipping_query"
-        elif update.pre_checkout_query:
-            return "pre_checkout_query"
-        elif update.poll:
-            return "poll"
-        elif update.poll_answer:
-            return "poll_answer"
-        elif update.my_chat_member:
-            return "my_chat_member"
-        elif update.chat_member:
-            return "chat_member"
-        elif update.chat_join_request:
-            return "chat_join_request"
-        else:
-            return "unknown"
+    def _record_hit(self, kind: int):
+        """Count update kinds and periodically reorder the kind checks"""
+        self._type_hits[kind] += 1
+        self._dispatched += 1
+        if self._dispatched % _RECOMPILE_INTERVAL == 0:
+            self._compile_update_type()
+
+    def _compile_update_type(self):
+        """Generate _get_update_type specialized to the kinds with handlers"""
+        # Telegram sets exactly one update field, so check order only affects
+        # speed: the most frequently seen kinds are tested first
+        active = sorted(
+            (kind for kind in _UPDATE_KINDS if self._handlers[kind]),
+            key=lambda kind: -self._type_hits[kind],
+        )
+        lines = ["def _get_update_type(update):"]
+        for kind in active:
+            lines.append(f"    if update.{kind.name.lower()} is not None:")
+            lines.append(f"        return {int(kind)}")
+        lines.append("    return -1")
+
+        namespace: Dict[str, Any] = {}
+        exec("\n".join(lines), namespace)
+        self._get_update_type = namespace["_get_update_type"]
 
 
 class TelegramBot:
     """Main Telegram bot class with production features"""
 
     def __init__(self, config: Optional[BotConfig] = None):
-        self.config = config or BotConfig(
-            token=settings.BOT_TOKEN,
-            mode=BotMode.WEBHOOK if settings.WEBHOOK_URL else BotMode.POLLING,
-            webhook_url=settings.WEBHOOK_URL,
-            admin_users=[settings.ADMIN_USER_ID] if settings.ADMIN_USER_ID else [],
-        )
+        if config is None:
+            settings = get_settings()
+            config = BotConfig(
+                token=settings.BOT_TOKEN,
+                mode=BotMode.WEBHOOK if settings.WEBHOOK_URL else BotMode.POLLING,
+                webhook_url=settings.WEBHOOK_URL,
+                admin_users=[settings.ADMIN_USER_ID] if settings.ADMIN_USER_ID else [],
+            )
+        self.config = config
 
         self.bot: Optional[Bot] = None
         self.application: Optional[Application] = None
         self.webhook_manager: Optional[WebhookManager] = None
         self.update_processor: UpdateProcessor = UpdateProcessor(self.config)
         self.api_service: Optional[TelegramAPIService] = None
+        self.handler_factory: Optional[HandlerFactory] = None
 
         self.logger = logging.getLogger(__name__)
         self._is_running = False
-
-        # Setup logging
-        if self.config.enable_logging:
-            logging.basicConfig(level=getattr(logging, self.config.log_level))
+        self._stop_event = asyncio.Event()
+        self._status_cache: Optional[BotStatus] = None
+        self._bot_info: Optional[BotInfo] = None
+        # Whether this bot installed the process-wide log listener
+        self._owns_log_listener = False
 
     async def initialize(self) -> bool:
         """Initialize the bot and all components"""
+        # Setup logging, unless the application already configured it
+        if self.config.enable_logging and not logging.getLogger().handlers:
+            _install_queue_logging(
+                _LEVEL_MAP.get(self.config.log_level.upper(), logging.INFO),
+                self.config.log_queue_size,
+            )
+            self._owns_log_listener = True
+
+        read_bot: Optional[Bot] = None
         try:
             self.logger.info("Initializing Telegram Bot...")
 
             # Create bot application
-            self.application = Application.builder().token(self.config.token).build()
+            self.application = (
+                Application.builder()
+                .token(self.config.token)
+                .connection_pool_size(self.config.connection_pool_size)
+                .pool_timeout(self.config.pool_timeout)
+                .connect_timeout(self.config.connect_timeout)
+                .read_timeout(self.config.read_timeout)
+                .http_version(self.config.http_version)
+                .get_updates_connection_pool_size(self.config.get_updates_pool_size)
+                .get_updates_read_timeout(self.config.read_timeout)
+                .concurrent_updates(
+                    ChatOrderedUpdateProcessor(
+                        max(1, self.config.update_workers),
+                        self.config.chat_queue_size,
+                    )
+                )
+                .build()
+            )
             self.bot = self.application.bot
 
             # Initialize services
-            self.api_service = TelegramAPIService(self.bot)
-            self.webhook_manager = WebhookManager(self.bot, self.config)
+            read_bot = Bot(
+                self.config.token,
+                request=HTTPXRequest(
+                    connection_pool_size=self.config.read_pool_size,
+                    pool_timeout=self.config.pool_timeout,
+                    connect_timeout=self.config.connect_timeout,
+                    read_timeout=self.config.read_timeout,
+                    http_version=self.config.http_version,
+                ),
+            )
+            # Opens its pool; TelegramAPIService.shutdown() closes it again
+            await read_bot.initialize()
+            self.api_service = TelegramAPIService(self.bot, read_bot=read_bot)
+            self.handler_factory = HandlerFactory(self.bot, self.api_service)
+            self.webhook_manager = WebhookManager(
+                self.bot, self.config, self.update_processor, _DEFAULT_UPDATES
+            )
 
             # Setup webhook if needed
             if self.config.mode == BotMode.WEBHOOK:
                 success = await self.webhook_manager.setup_webhook()
                 if not success:
                     self.logger.error("Failed to setup webhook")
+                    await self._release_services(read_bot)
                     return False
 
-            # Register default handlers
+            # Register default handlers, then route UpdateProcessor handlers
+            # through the application so each update is dispatched once
             await self._register_default_handlers()
+            self.update_processor.attach(self.application)
 
             self.logger.info("Bot initialized successfully")
             return True
 
-        except Exception as e:
-            self.logger.error(f"Failed to initialize bot: {e}")
+        except Exception:
+            self.logger.exception("Failed to initialize bot")
+            await self._release_services(read_bot)
             return False
 
+    async def _release_services(self, read_bot: Optional[Bot]):
+        """Close what a failed initialize() already opened"""
+        try:
+            if self.handler_factory:
+                self.handler_factory.close()
+                self.handler_factory = None
+            if self.api_service:
+                # Also shuts down read_bot
+                await self.api_service.shutdown()
+                self.api_service = None
+            elif read_bot is not None:
+                await read_bot.shutdown()
+        except Exception:
+            self.logger.exception("Error releasing services")
+
     async def _register_default_handlers(self):
         """Register default update handlers"""
         if not self.application:
             return
 
-        # Message handlers
-        message_handler = MessageHandler(
-            filters.TEXT & ~filters.COMMAND, self._handle_message
+        # Runs before every other group, so unauthorized users reach neither
+        # the default handlers nor UpdateProcessor handlers
+        self.application.add_handler(
+            TypeHandler(Update, self._check_allowed_user), group=-1
         )
-        self.application.add_handler(message_handler)
 
-        # Command handlers
+        # Command handlers go first so PTB stops at them within the group
+        # and never evaluates the text filter for /start or /help
         command_handler = CommandHandler("start", self._handle_start)
         self.application.add_handler(command_handler)
 
         command_handler = CommandHandler("help", self._handle_help)
         self.application.add_handler(command_handler)
 
+        # Message handlers
+        message_handler = MessageHandler(_TEXT_NOT_COMMAND, self._handle_message)
+        self.application.add_handler(message_handler)
+
         # Callback query handlers
         callback_handler = CallbackQueryHandler(self._handle_callback_query)
         self.application.add_handler(callback_handler)
 
-        # Inline query handlers
-        inline_handler = InlineQueryHandler(self._handle_inline_query)
-        self.application.add_handler(inline_handler)
-
     async def start(self) -> bool:
         """Start the bot"""
         try:
@@ -297,9 +860,12 @@ class TelegramBot:
 
             await self.application.initialize()
             await self.application.start()
+            await self.update_processor.start()
 
             if self.config.mode == BotMode.POLLING:
-                await self.application.updater.start_polling()
+                await self.application.updater.start_polling(
+                    allowed_updates=self.webhook_manager.allowed_updates()
+                )
                 self.logger.info("Bot started in polling mode")
             else:
                 await self.application.updater.start_webhook(
@@ -307,14 +873,17 @@ class TelegramBot:
                     port=8000,
                     url_path=self.config.webhook_path,
                     webhook_url=f"{self.config.webhook_url}{self.config.webhook_path}",
+                    allowed_updates=self.webhook_manager.allowed_updates(),
                 )
                 self.logger.info("Bot started in webhook mode")
 
             self._is_running = True
+            self._status_cache = None
+            self._stop_event.clear()
             return True
 
-        except Exception as e:
-            self.logger.error(f"Failed to start bot: {e}")
+        except Exception:
+            self.logger.exception("Failed to start bot")
             return False
 
     async def stop(self):
@@ -324,12 +893,29 @@ class TelegramBot:
                 await self.application.updater.stop()
                 await self.application.stop()
                 await self.application.shutdown()
+            # Let updates already fed to process_update() finish first
+            await self.update_processor.drain()
+            await self.update_processor.stop()
+            if self.handler_factory:
+                self.handler_factory.close()
+            if self.api_service:
+                await self.api_service.shutdown()
 
             self._is_running = False
+            self._status_cache = None
             self.logger.info("Bot stopped")
 
-        except Exception as e:
-            self.logger.error(f"Error stopping bot: {e}")
+        except Exception:
+            self.logger.exception("Error stopping bot")
+        finally:
+            if self._owns_log_listener:
+                _stop_queue_logging()
+                self._owns_log_listener = False
+            self._stop_event.set()
+
+    async def wait_closed(self):
+        """Wait until the bot is asked to stop or has been stopped"""
+        await self._stop_event.wait()
 
     async def send_message(
         self,
@@ -350,73 +936,52 @@ class TelegramBot:
                     **kwargs,
                 )
                 return True
-        except Exception as e:
-            self.logger.error(f"Failed to send message: {e}")
+        except Exception:
+            self.logger.exception("Failed to send message")
         return False
 
-    async def _handle_message(self, update: Update, context):
-        """Handle incoming messages"""
-        try:
-            message = update.message
-            user_id = message.from_user.id
+    async def _check_allowed_user(self, update: Update, context):
+        """Stop updates from users outside allowed_users before any handler"""
+        user = update.effective_user
+        allowed_users = self.config.allowed_users
+        if not allowed_users or user is None or user.id in allowed_users:
+            return
 
-            # Check if user is allowed
-            if self.config.allowed_users and user_id not in self.config.allowed_users:
-                await message.reply_text(
+        if update.message:
+            try:
+                await update.message.reply_text(
                     "Sorry, you're not authorized to use this bot."
                 )
-                return
+            except Exception:
+                self.logger.exception("Error replying to unauthorized user")
+        raise ApplicationHandlerStop
 
-            # Process message through update processor
-            await self.update_processor.process_update(update)
+    async def _handle_message(self, update: Update, context):
+        """Handle incoming messages"""
+        try:
+            message = update.message
 
             # Echo message for demo
             await message.reply_text(f"Received: {message.text}")
 
-        except Exception as e:
-            self.logger.error(f"Error handling message: {e}")
+        except Exception:
+            self.logger.exception("Error handling message")
 
     async def _handle_start(self, update: Update, context):
         """Handle /start command"""
         try:
-            message = update.message
-            welcome_text = (
-                "🤖 Welcome to the Telegram Bot API Template!\n\n"
-                "This is a production-ready bot with comprehensive features.\n\n"
-                "Available commands:\n"
-                "/help - Show help\n"
-                "/status - Check bot status"
-            )
-
-            await message.reply_text(welcome_text)
+            await update.message.reply_text(_WELCOME_TEXT)
 
-        except Exception as e:
-            self.logger.error(f"Error handling start command: {e}")
+        except Exception:
+            self.logger.exception("Error handling start command")
 
     async def _handle_help(self, update: Update, context):
         """Handle /help command"""
         try:
-            message = update.message
-            help_text = (
-                "📚 **Bot Help**\n\n"
-                "**Commands:**\n"
-                "/start - Start the bot\n"
-                "/help - Show this help\n"
-                "/status - Check bot status\n\n"
-                "**Features:**\n"
-                "• Message handling\n"
-                "• Command processing\n"
-                "• Callback queries\n"
-                "• Inline queries\n"
-                "• Webhook support\n"
-                "• Rate limiting\n"
-                "• User management"
-            )
+            await update.message.reply_text(_HELP_TEXT, parse_mode="Markdown")
 
-            await message.reply_text(help_text, parse_mode="Markdown")
-
-        except Exception as e:
-            self.logger.error(f"Error handling help command: {e}")
+        except Exception:
+            self.logger.exception("Error handling help command")
 
     async def _handle_callback_query(self, update: Update, context):
         """Handle callback queries"""
@@ -424,51 +989,47 @@ class TelegramBot:
             callback_query = update.callback_query
             await callback_query.answer()
 
-            # Process callback through update processor
-            await self.update_processor.process_update(update)
-
-        except Exception as e:
-            self.logger.error(f"Error handling callback query: {e}")
+        except Exception:
+            self.logger.exception("Error handling callback query")
 
-    async def _handle_inline_query(self, update: Update, context):
-        """Handle inline queries"""
-        try:
-            inline_query = update.inline_query
-
-            # Process inline query through update processor
-            await self.update_processor.process_update(update)
+    def get_status(self) -> BotStatus:
+        """Get bot status"""
+        if self._status_cache is None:
+            self._status_cache = BotStatus(
+                is_running=self._is_running,
+                mode=self.config.mode.value,
+                token_configured=bool(self.config.token),
+                webhook_configured=bool(self.config.webhook_url),
+                admin_users=len(self.config.admin_users),
+                allowed_users=len(self.config.allowed_users),
+                rate_limit=self.config.rate_limit_per_minute,
+            )
+        return self._status_cache
 
-        except Exception as e:
-            self.logger.error(f"Error handling inline query: {e}")
+    def invalidate_status(self):
+        """Drop the cached status, e.g. after changing the config"""
+        self._status_cache = None
 
-    def get_status(self) -> Dict[str, Any]:
-        """Get bot status"""
-        return {
-            "is_running": self._is_running,
-            "mode": self.config.mode.value,
-            "token_configured": bool(self.config.token),
-            "webhook_configured": bool(self.config.webhook_url),
-            "admin_users": len(self.config.admin_users),
-            "allowed_users": len(self.config.allowed_users),
-            "rate_limit": self.config.rate_limit_per_minute,
-        }
-
-    async def get_me(self) -> Optional[Dict[str, Any]]:
+    async def get_me(self) -> Optional[BotInfo]:
         """Get bot information"""
+        if self._bot_info is not None:
+            return self._bot_info
+
         try:
             if self.bot:
                 bot_info = await self.bot.get_me()
-                return {
-                    "id": bot_info.id,
-                    "is_bot": bot_info.is_bot,
-                    "first_name": bot_info.first_name,
-                    "username": bot_info.username,
-                    "can_join_groups": bot_info.can_join_groups,
-                    "can_read_all_group_messages": bot_info.can_read_all_group_messages,
-                    "supports_inline_queries": bot_info.supports_inline_queries,
-                }
-        except Exception as e:
-            self.logger.error(f"Failed to get bot info: {e}")
+                self._bot_info = BotInfo(
+                    id=bot_info.id,
+                    is_bot=bot_info.is_bot,
+                    first_name=bot_info.first_name,
+                    username=bot_info.username,
+                    can_join_groups=bot_info.can_join_groups,
+                    can_read_all_group_messages=bot_info.can_read_all_group_messages,
+                    supports_inline_queries=bot_info.supports_inline_queries,
+                )
+                return self._bot_info
+        except Exception:
+            self.logger.exception("Failed to get bot info")
         return None
 
 
@@ -479,18 +1040,25 @@ bot_instance = TelegramBot()
 async def main():
     """Main entry point"""
     try:
-        if await bot_instance.initialize():
-            if await bot_instance.start():
-                # Keep running
-                while bot_instance._is_running:
-                    await asyncio.sleep(1)
+        if await bot_instance.initialize() and await bot_instance.start():
+            # Keep running until a shutdown signal arrives or the bot is stopped
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, bot_instance._stop_event.set)
+            await bot_instance.wait_closed()
     except KeyboardInterrupt:
         print("Shutting down bot...")
-    except Exception as e:
-        logger.error(f"Bot error: {e}")
+    except Exception:
+        logger.exception("Bot error")
     finally:
         await bot_instance.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        import uvloop
+    except ImportError:
+        # uvloop is unavailable on Windows; use the default asyncio loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
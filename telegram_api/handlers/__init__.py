@@ -5,8 +5,15 @@ Production-ready handlers for all Telegram update types.
 """
 
 import asyncio
+import functools
+import itertools
 import logging
-from typing import Dict, List, Optional, Callable, Any
+import operator
+import os
+import re
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, FrozenSet, Iterable, List, Optional, Callable, Any, Pattern
 from abc import ABC, abstractmethod
 
 from telegram import Update, Bot
@@ -19,20 +26,103 @@ from ..models.telegram_models import (
     TelegramUser,
     TelegramChat,
 )
-from ..services.api_service import TelegramAPIService
+from ..services.api_service import BatchingSender, TelegramAPIService
 from ..utils.keyboards import KeyboardBuilder
 from ..utils.formatters import MessageFormatter
 
 logger = logging.getLogger(__name__)
 
+# "/command args" with surrounding whitespace; groups are (command, args)
+_COMMAND_RE = re.compile(r"\s*/(\S*)(?:\s+(.*?))?\s*", re.DOTALL)
+
+# Media fields in detection order, paired with a getter built once
+_MEDIA_FIELDS = tuple(
+    (media_type, operator.attrgetter(media_type))
+    for media_type in (
+        "photo",
+        "video",
+        "audio",
+        "voice",
+        "document",
+        "sticker",
+        "animation",
+        "video_note",
+    )
+)
+
+
+class TokenBucketFilter(logging.Filter):
+    """Rate-limit error records per logger and message template"""
+
+    def __init__(self, rate: float = 10.0, burst: int = 100):
+        super().__init__()
+        self.rate = rate
+        self.burst = burst
+        # (logger name, msg) -> [tokens, last refill time]
+        self._buckets: Dict[Any, List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR:
+            return True
+
+        now = time.monotonic()
+        key = (record.name, record.msg)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._buckets[key] = [self.burst - 1, now]
+            return True
+
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            return False
+        bucket[0] = tokens - 1
+        return True
+
+
+# Shared by every handler logger so error storms cannot flood the logs
+_ERROR_SAMPLER = TokenBucketFilter()
+
+
+def cpu_bound(func: Callable) -> Callable:
+    """Mark a command handler to run in the handlers' process pool
+
+    The handler must be a plain module-level function taking
+    ``(update_dict, args)``; if it returns a string, that is sent as the reply.
+    """
+    func._cpu_bound = True
+    return func
+
+
+def _compile_literals(literals) -> Pattern:
+    """Compile literal strings into one alternation, tried in the given order"""
+    return re.compile("|".join(re.escape(literal) for literal in literals))
+
+
+def _compile_occurrences(literals) -> Pattern:
+    """Like _compile_literals, but finditer reports every position where one starts"""
+    return re.compile(f"(?=({_compile_literals(literals).pattern}))")
+
 
 class BaseHandler(ABC):
     """Base handler class"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
+    __slots__ = ("bot", "api_service", "sender", "logger", "process_pool")
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
         self.bot = bot
         self.api_service = api_service
+        self.sender = sender
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+        self.logger.addFilter(_ERROR_SAMPLER)
+        # Executor for @cpu_bound command handlers, shared through HandlerFactory
+        self.process_pool: Optional[Executor] = None
 
     @abstractmethod
     async def handle(
@@ -45,14 +135,50 @@ class BaseHandler(ABC):
         """Check if handler can process this update"""
         return True
 
+    async def _run_command(
+        self,
+        handler: Callable,
+        update: TelegramUpdate,
+        context: ContextTypes.DEFAULT_TYPE,
+        args: str,
+    ):
+        """Run a command handler, off the event loop if it is CPU bound"""
+        if not getattr(handler, "_cpu_bound", False):
+            return await handler(update, context, args)
+
+        # The context is not picklable; the worker gets the update as a dict
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.process_pool, functools.partial(handler, update.to_dict(), args)
+        )
+        if isinstance(result, str):
+            await self._reply(update.message.chat.id, result)
+        return result
+
+    async def _reply(self, chat_id: int, text: str):
+        """Send a default reply, batched when a sender is configured"""
+        if self.sender is not None:
+            await self.sender.send_message(chat_id, text)
+        else:
+            await self.api_service.send_message(chat_id, text)
+
 
 class MessageHandler(BaseHandler):
     """Handle text and media messages"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("commands", "middleware", "_pipeline")
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.commands: Dict[str, Callable] = {}
         self.middleware: List[Callable] = []
+        # No middleware: messages go straight to _process_message
+        self._pipeline: Callable = self._process_message
 
     def register_command(self, command: str, handler: Callable):
         """Register a command handler"""
@@ -61,6 +187,24 @@ class MessageHandler(BaseHandler):
     def add_middleware(self, middleware: Callable):
         """Add middleware to message processing"""
         self.middleware.append(middleware)
+        self._pipeline = functools.reduce(
+            self._wrap_middleware, reversed(self.middleware), self._process_message
+        )
+
+    def _wrap_middleware(self, inner: Callable, middleware_func: Callable) -> Callable:
+        """Run one middleware in front of the rest of the pipeline"""
+
+        async def layer(update, context) -> bool:
+            # Only the middleware call is guarded; errors from later stages
+            # keep their own handling. A failing middleware is skipped
+            try:
+                if await middleware_func(update, context) is False:
+                    return False  # Middleware blocked the message
+            except Exception as e:
+                self.logger.error("Middleware error: %s", e)
+            return await inner(update, context)
+
+        return layer
 
     async def handle(
         self, update: TelegramUpdate, context: ContextTypes.DEFAULT_TYPE
@@ -69,30 +213,28 @@ class MessageHandler(BaseHandler):
         if not update.message or not update.message.text:
             return False
 
-        message = update.message
-        text = message.text.strip()
+        return await self._pipeline(update, context)
 
-        # Apply middleware
-        for middleware_func in self.middleware:
-            try:
-                result = await middleware_func(update, context)
-                if result is False:  # Middleware blocked the message
-                    return False
-            except Exception as e:
-                self.logger.error(f"Middleware error: {e}")
+    async def _process_message(
+        self, update: TelegramUpdate, context: ContextTypes.DEFAULT_TYPE
+    ) -> bool:
+        """Handle a message that passed the middleware"""
+        message = update.message
 
         # Check if it's a command
-        if text.startswith("/"):
-            parts = text[1:].split(" ", 1)
-            command = parts[0].lower()
-            args = parts[1] if len(parts) > 1 else ""
+        match = _COMMAND_RE.fullmatch(message.text)
+        if match:
+            command = match.group(1).lower()
+            handler = self.commands.get(command)
 
-            if command in self.commands:
+            if handler is not None:
                 try:
-                    await self.commands[command](update, context, args)
+                    await self._run_command(
+                        handler, update, context, match.group(2) or ""
+                    )
                     return True
                 except Exception as e:
-                    self.logger.error(f"Command handler error for {command}: {e}")
+                    self.logger.error("Command handler error for %s: %s", command, e)
                     await self.api_service.send_message(
                         message.chat.id,
                         "Sorry, there was an error processing your command.",
@@ -110,19 +252,24 @@ class MessageHandler(BaseHandler):
         message = update.message
 
         # Echo for demo
-        await self.api_service.send_message(
-            message.chat.id, f"You said: {message.text}"
-        )
+        await self._reply(message.chat.id, f"You said: {message.text}")
 
 
 class CommandHandler(BaseHandler):
     """Handle bot commands"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("commands", "admin_commands", "admin_users")
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.commands: Dict[str, Callable] = {}
         self.admin_commands: Dict[str, Callable] = {}
-        self.admin_users: List[int] = []
+        self.admin_users: FrozenSet[int] = frozenset()
 
     def register_command(
         self, command: str, handler: Callable, admin_only: bool = False
@@ -133,9 +280,9 @@ class CommandHandler(BaseHandler):
         else:
             self.commands[command.lower()] = handler
 
-    def set_admin_users(self, user_ids: List[int]):
+    def set_admin_users(self, user_ids: Iterable[int]):
         """Set admin user IDs"""
-        self.admin_users = user_ids
+        self.admin_users = frozenset(user_ids)
 
     async def handle(
         self, update: TelegramUpdate, context: ContextTypes.DEFAULT_TYPE
@@ -145,23 +292,23 @@ class CommandHandler(BaseHandler):
             return False
 
         message = update.message
-        text = message.text.strip()
-
-        if not text.startswith("/"):
+        match = _COMMAND_RE.fullmatch(message.text)
+        if not match:
             return False
 
-        parts = text[1:].split(" ", 1)
-        command = parts[0].lower()
-        args = parts[1] if len(parts) > 1 else ""
+        command = match.group(1).lower()
+        args = match.group(2) or ""
 
         # Check admin commands
         if command in self.admin_commands:
             if message.from_user and message.from_user.id in self.admin_users:
                 try:
-                    await self.admin_commands[command](update, context, args)
+                    await self._run_command(
+                        self.admin_commands[command], update, context, args
+                    )
                     return True
                 except Exception as e:
-                    self.logger.error(f"Admin command error for {command}: {e}")
+                    self.logger.error("Admin command error for %s: %s", command, e)
             else:
                 await self.api_service.send_message(
                     message.chat.id, "This command is for admins only."
@@ -171,10 +318,10 @@ class CommandHandler(BaseHandler):
         # Check regular commands
         if command in self.commands:
             try:
-                await self.commands[command](update, context, args)
+                await self._run_command(self.commands[command], update, context, args)
                 return True
             except Exception as e:
-                self.logger.error(f"Command error for {command}: {e}")
+                self.logger.error("Command error for %s: %s", command, e)
                 await self.api_service.send_message(
                     message.chat.id,
                     "Sorry, there was an error processing your command.",
@@ -186,13 +333,23 @@ class CommandHandler(BaseHandler):
 class CallbackHandler(BaseHandler):
     """Handle callback queries from inline keyboards"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("callbacks", "_callback_re", "_callback_order")
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.callbacks: Dict[str, Callable] = {}
+        self._callback_re: Optional[Pattern] = None
+        self._callback_order: Dict[str, int] = {}
 
     def register_callback(self, pattern: str, handler: Callable):
         """Register a callback handler"""
         self.callbacks[pattern] = handler
+        self._callback_re = None
 
     async def handle(
         self, update: TelegramUpdate, context: ContextTypes.DEFAULT_TYPE
@@ -207,14 +364,35 @@ class CallbackHandler(BaseHandler):
         if not data:
             return False
 
-        # Find matching callback handler
-        for pattern, handler in self.callbacks.items():
-            if pattern in data:
-                try:
-                    await handler(update, context)
-                    return True
-                except Exception as e:
-                    self.logger.error(f"Callback handler error for {pattern}: {e}")
+        # Find matching callback handler: the first registered pattern that
+        # occurs in the data. One scan reports, at each position, the first
+        # registered pattern starting there, so the earliest of those wins
+        if self.callbacks:
+            if self._callback_re is None:
+                self._callback_re = _compile_occurrences(self.callbacks)
+                self._callback_order = {
+                    pattern: index for index, pattern in enumerate(self.callbacks)
+                }
+
+            order = self._callback_order
+            first = min(
+                (match.group(1) for match in self._callback_re.finditer(data)),
+                key=order.__getitem__,
+                default=None,
+            )
+            if first is not None:
+                # A failing handler falls through to the next matching pattern
+                later = itertools.islice(self.callbacks, order[first] + 1, None)
+                for pattern in itertools.chain(
+                    (first,), (pattern for pattern in later if pattern in data)
+                ):
+                    try:
+                        await self.callbacks[pattern](update, context)
+                        return True
+                    except Exception as e:
+                        self.logger.error(
+                            "Callback handler error for %s: %s", pattern, e
+                        )
 
         # Default callback handling
         await callback_query.answer("Unknown action")
@@ -224,13 +402,22 @@ class CallbackHandler(BaseHandler):
 class InlineHandler(BaseHandler):
     """Handle inline queries"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("inline_handlers", "_prefix_re")
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.inline_handlers: Dict[str, Callable] = {}
+        self._prefix_re: Optional[Pattern] = None
 
     def register_inline_handler(self, query_prefix: str, handler: Callable):
         """Register an inline query handler"""
         self.inline_handlers[query_prefix] = handler
+        self._prefix_re = None
 
     async def handle(
         self, update: TelegramUpdate, context: ContextTypes.DEFAULT_TYPE
@@ -242,14 +429,19 @@ class InlineHandler(BaseHandler):
         inline_query = update.inline_query
         query = inline_query.query.lower()
 
-        # Find matching handler
-        for prefix, handler in self.inline_handlers.items():
-            if query.startswith(prefix):
+        # Find matching handler; the first registered matching prefix wins
+        if self.inline_handlers:
+            if self._prefix_re is None:
+                self._prefix_re = _compile_literals(self.inline_handlers)
+
+            match = self._prefix_re.match(query)
+            if match:
+                prefix = match.group(0)
                 try:
-                    await handler(update, context)
+                    await self.inline_handlers[prefix](update, context)
                     return True
                 except Exception as e:
-                    self.logger.error(f"Inline handler error for {prefix}: {e}")
+                    self.logger.error("Inline handler error for %s: %s", prefix, e)
 
         return False
 
@@ -257,8 +449,15 @@ class InlineHandler(BaseHandler):
 class MediaHandler(BaseHandler):
     """Handle media messages (photo, video, audio, etc.)"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("media_handlers",)
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.media_handlers: Dict[str, Callable] = {}
 
     def register_media_handler(self, media_type: str, handler: Callable):
@@ -275,23 +474,9 @@ class MediaHandler(BaseHandler):
         message = update.message
 
         # Determine media type
-        media_type = None
-        if message.photo:
-            media_type = "photo"
-        elif message.video:
-            media_type = "video"
-        elif message.audio:
-            media_type = "audio"
-        elif message.voice:
-            media_type = "voice"
-        elif message.document:
-            media_type = "document"
-        elif message.sticker:
-            media_type = "sticker"
-        elif message.animation:
-            media_type = "animation"
-        elif message.video_note:
-            media_type = "video_note"
+        media_type = next(
+            (media_type for media_type, get in _MEDIA_FIELDS if get(message)), None
+        )
 
         if not media_type:
             return False
@@ -302,7 +487,7 @@ class MediaHandler(BaseHandler):
                 await self.media_handlers[media_type](update, context)
                 return True
             except Exception as e:
-                self.logger.error(f"Media handler error for {media_type}: {e}")
+                self.logger.error("Media handler error for %s: %s", media_type, e)
 
         # Default media handling
         await self._handle_default_media(update, context, media_type)
@@ -317,24 +502,30 @@ class MediaHandler(BaseHandler):
         """Default media handling"""
         message = update.message
 
-        # Get file info for logging
-        file_info = f"{media_type} received"
-        if message.caption:
-            file_info += f" with caption: {message.caption}"
+        # Get file info for logging, only when it will be emitted
+        if self.logger.isEnabledFor(logging.DEBUG):
+            file_info = f"{media_type} received"
+            if message.caption:
+                file_info += f" with caption: {message.caption}"
 
-        self.logger.info(f"Media received in chat {message.chat.id}: {file_info}")
+            self.logger.debug("Media received in chat %s: %s", message.chat.id, file_info)
 
         # Acknowledge receipt
-        await self.api_service.send_message(
-            message.chat.id, f"✅ {media_type.title()} received!"
-        )
+        await self._reply(message.chat.id, f"✅ {media_type.title()} received!")
 
 
 class ChatMemberHandler(BaseHandler):
     """Handle chat member updates (join, leave, promote, etc.)"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("member_handlers",)
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.member_handlers: Dict[str, Callable] = {}
 
     def register_member_handler(self, event_type: str, handler: Callable):
@@ -346,12 +537,9 @@ class ChatMemberHandler(BaseHandler):
     ) -> bool:
         """Handle chat member updates"""
         # Handle different member update types
-        if update.chat_member:
-            return await self._handle_chat_member(update, context)
-        elif update.my_chat_member:
-            return await self._handle_my_chat_member(update, context)
-        elif update.chat_join_request:
-            return await self._handle_chat_join_request(update, context)
+        for get, method in self._DISPATCH:
+            if get(update):
+                return await method(self, update, context)
 
         return False
 
@@ -360,7 +548,7 @@ class ChatMemberHandler(BaseHandler):
     ) -> bool:
         """Handle chat member updates"""
         chat_member = update.chat_member
-        self.logger.info(f"Chat member update in {chat_member.chat.id}")
+        self.logger.info("Chat member update in %s", chat_member.chat.id)
         return True
 
     async def _handle_my_chat_member(
@@ -368,7 +556,7 @@ class ChatMemberHandler(BaseHandler):
     ) -> bool:
         """Handle bot's own chat member updates"""
         my_chat_member = update.my_chat_member
-        self.logger.info(f"My chat member update in {my_chat_member.chat.id}")
+        self.logger.info("My chat member update in %s", my_chat_member.chat.id)
         return True
 
     async def _handle_chat_join_request(
@@ -377,16 +565,32 @@ class ChatMemberHandler(BaseHandler):
         """Handle chat join requests"""
         join_request = update.chat_join_request
         self.logger.info(
-            f"Chat join request in {join_request.chat.id} from {join_request.from_user.id}"
+            "Chat join request in %s from %s",
+            join_request.chat.id,
+            join_request.from_user.id,
         )
         return True
 
+    # Update field getters and the method handling each, in dispatch order
+    _DISPATCH = (
+        (operator.attrgetter("chat_member"), _handle_chat_member),
+        (operator.attrgetter("my_chat_member"), _handle_my_chat_member),
+        (operator.attrgetter("chat_join_request"), _handle_chat_join_request),
+    )
+
 
 class PollHandler(BaseHandler):
     """Handle poll updates"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
-        super().__init__(bot, api_service)
+    __slots__ = ("poll_handlers",)
+
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
+        super().__init__(bot, api_service, sender)
         self.poll_handlers: Dict[str, Callable] = {}
 
     def register_poll_handler(self, poll_type: str, handler: Callable):
@@ -409,7 +613,7 @@ class PollHandler(BaseHandler):
     ) -> bool:
         """Handle poll updates"""
         poll = update.poll
-        self.logger.info(f"Poll update: {poll.question}")
+        self.logger.info("Poll update: %s", poll.question)
         return True
 
     async def _handle_poll_answer(
@@ -417,63 +621,96 @@ class PollHandler(BaseHandler):
     ) -> bool:
         """Handle poll answers"""
         poll_answer = update.poll_answer
-        self.logger.info(f"Poll answer from {poll_answer.user.id}")
+        self.logger.info("Poll answer from %s", poll_answer.user.id)
         return True
 
 
+# Standard handler classes by handler type
+_HANDLER_CLASSES = {
+    "message": MessageHandler,
+    "command": CommandHandler,
+    "callback": CallbackHandler,
+    "inline": InlineHandler,
+    "media": MediaHandler,
+    "chat_member": ChatMemberHandler,
+    "poll": PollHandler,
+}
+
+
+class _LazyProcessPool(Executor):
+    """Process pool that is only created on the first submit"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, fn, /, *args, **kwargs):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+            self._pool = None
+
+
 # Handler Factory
 class HandlerFactory:
     """Factory for creating and managing handlers"""
 
-    def __init__(self, bot: Bot, api_service: TelegramAPIService):
+    def __init__(
+        self,
+        bot: Bot,
+        api_service: TelegramAPIService,
+        sender: Optional[BatchingSender] = None,
+    ):
         self.bot = bot
         self.api_service = api_service
+        self.sender = sender
         self.handlers: Dict[str, BaseHandler] = {}
+        self.handler_classes: Dict[str, type] = dict(_HANDLER_CLASSES)
+        # The process pool is only created on the first @cpu_bound call
+        self.process_pool = _LazyProcessPool(max_workers=os.cpu_count())
 
     def create_handler(self, handler_type: str) -> BaseHandler:
         """Create a handler instance"""
-        if handler_type == "message":
-            return MessageHandler(self.bot, self.api_service)
-        elif handler_type == "command":
-            return CommandHandler(self.bot, self.api_service)
-        elif handler_type == "callback":
-            return CallbackHandler(self.bot, self.api_service)
-        elif handler_type == "inline":
-            return InlineHandler(self.bot, self.api_service)
-        elif handler_type == "media":
-            return MediaHandler(self.bot, self.api_service)
-        elif handler_type == "chat_member":
-            return ChatMemberHandler(self.bot, self.api_service)
-        elif handler_type == "poll":
-            return PollHandler(self.bot, self.api_service)
-        else:
+        handler_class = self.handler_classes.get(handler_type)
+        if handler_class is None:
             raise ValueError(f"Unknown handler type: {handler_type}")
 
+        handler = handler_class(self.bot, self.api_service, self.sender)
+        handler.process_pool = self.process_pool
+        return handler
+
+    def register_handler_class(self, handler_type: str, handler_class: type):
+        """Register a handler class, e.g. a third-party handler, under a type name"""
+        if not (isinstance(handler_class, type) and issubclass(handler_class, BaseHandler)):
+            raise TypeError(f"{handler_class!r} is not a BaseHandler subclass")
+        self.handler_classes[handler_type] = handler_class
+
     def register_handler(self, handler_type: str, handler: BaseHandler):
         """Register a handler instance"""
         self.handlers[handler_type] = handler
 
     def get_handler(self, handler_type: str) -> Optional[BaseHandler]:
-        """Get a registered handler"""
-        return self.handlers.get(handler_type)
+        """Get a handler, creating and registering it on first use"""
+        handler = self.handlers.get(handler_type)
+        if handler is None and handler_type in self.handler_classes:
+            handler = self.create_handler(handler_type)
+            self.register_handler(handler_type, handler)
+        return handler
+
+    def close(self):
+        """Stop the worker processes used by @cpu_bound handlers, if any started"""
+        self.process_pool.shutdown(wait=False, cancel_futures=True)
 
     def create_all_handlers(self) -> Dict[str, BaseHandler]:
-        """Create all standard handlers"""
-        handler_types = [
-            "message",
-            "command",
-            "callback",
-            "inline",
-            "media",
-            "chat_member",
-            "poll",
-        ]
-
-        for handler_type in handler_types:
+        """Create all known handlers up front; get_handler creates them lazily"""
+        for handler_type in self.handler_classes:
             try:
-                handler = self.create_handler(handler_type)
-                self.register_handler(handler_type, handler)
+                self.get_handler(handler_type)
             except Exception as e:
-                logger.error(f"Failed to create {handler_type} handler: {e}")
+                logger.error("Failed to create %s handler: %s", handler_type, e)
 
         return self.handlers
@@ -2,6 +2,9 @@
 Enhanced message handler with memory integration
 """
 
+import functools
+import logging
+
 import structlog
 from telegram_api.handlers.message_handler import MessageHandler as BaseMessageHandler
 from telegram_api.services.memory_service import MemoryService, ConversationMemory
@@ -9,6 +12,16 @@ from telegram_api.models.telegram_models import TelegramUpdate, TelegramMessage
 
 logger = structlog.get_logger(__name__)
 
+# structlog is not set up to filter by level, so per-message events check the
+# stdlib level first and skip the processor chain when it is disabled
+_level_logger = logging.getLogger(__name__)
+_memory_logger = logger.bind(component="memory_handler")
+
+@functools.lru_cache(maxsize=65536)
+def _uid_str(user_id: int) -> str:
+    """Memory key for a Telegram user id"""
+    return str(user_id)
+
 class MessageHandler(BaseMessageHandler):
     """Enhanced message handler with memory integration"""
     
@@ -25,9 +38,10 @@ class MessageHandler(BaseMessageHandler):
         # Store message in memory if service is available
         if self.memory_service and update.message.from_user:
             try:
-                user_id = str(update.message.from_user.id)
+                user_id = _uid_str(update.message.from_user.id)
                 await self.conversation_memory.add_message(user_id, update.message)
-                logger.info("Message stored in memory", user_id=user_id)
+                if _level_logger.isEnabledFor(logging.DEBUG):
+                    _memory_logger.debug("Message stored in memory", user_id=user_id)
             except Exception as e:
                 logger.error("Failed to store message in memory", error=str(e))
         
@@ -16,6 +16,7 @@ class TelegramBot(BaseTelegramBot):
     def __init__(self, config: BotConfig):
         super().__init__(config)
         self.memory_service = None
+        self.message_handler = None
         self._initialize_memory_service()
     
     def _initialize_memory_service(self):
@@ -24,20 +25,27 @@ class TelegramBot(BaseTelegramBot):
             mem0_api_key = os.getenv("MEM0_API_KEY")
             if mem0_api_key:
                 self.memory_service = MemoryService(api_key=mem0_api_key)
-                
-                # Replace message handler with memory-enabled version
-                self.message_handler = MessageHandler(
-                    self, 
-                    self.api_service, 
-                    self.memory_service
-                )
-                
                 logger.info("Memory service initialized successfully")
             else:
                 logger.warning("MEM0_API_KEY not found, memory features disabled")
         except Exception as e:
             logger.error("Failed to initialize memory service", error=str(e))
     
+    async def initialize(self) -> bool:
+        """Initialize the bot, then the memory-enabled message handler"""
+        if not await super().initialize():
+            return False
+        
+        # Replace message handler with memory-enabled version; it shares the
+        # bot's API service and therefore its HTTP connection pool
+        if self.memory_service:
+            self.message_handler = MessageHandler(
+                self.bot,
+                self.api_service,
+                self.memory_service
+            )
+        return True
+    
     async def get_user_context(self, user_id: str, query: str = None) -> str:
         """Get conversation context for a user"""
         if not self.memory_service:
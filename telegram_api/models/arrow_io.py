@@ -0,0 +1,88 @@
+"""
+Arrow Export
+
+Columnar Arrow record batches of Telegram updates for analytics consumers.
+Requires the optional pyarrow package (requirements-optional.txt).
+"""
+
+from typing import BinaryIO, Iterable, List, Optional
+
+import pyarrow as pa
+
+from .telegram_models import TelegramMessage, TelegramUpdate
+
+_DICTIONARY_STRING = pa.dictionary(pa.int32(), pa.string())
+
+UPDATE_SCHEMA = pa.schema(
+    [
+        pa.field("update_id", pa.int64(), nullable=False),
+        pa.field("update_type", _DICTIONARY_STRING, nullable=False),
+        pa.field("chat_id", pa.int64()),
+        pa.field("chat_type", _DICTIONARY_STRING),
+        pa.field("user_id", pa.int64()),
+        pa.field("date", pa.timestamp("s", tz="UTC")),
+        pa.field("text", pa.string()),
+    ]
+)
+
+
+def _effective_message(update: TelegramUpdate) -> Optional[TelegramMessage]:
+    """First message-like payload carried by the update"""
+    return (
+        update.message
+        or update.edited_message
+        or update.channel_post
+        or update.edited_channel_post
+    )
+
+
+def updates_to_record_batch(updates: List[TelegramUpdate]) -> pa.RecordBatch:
+    """Build a record batch laid out as UPDATE_SCHEMA"""
+    update_ids = []
+    update_types = []
+    chat_ids = []
+    chat_types = []
+    user_ids = []
+    dates = []
+    texts = []
+    for update in updates:
+        update_ids.append(update.update_id)
+        update_types.append(update.get_update_type().value)
+        message = _effective_message(update)
+        if message is None:
+            chat_ids.append(None)
+            chat_types.append(None)
+            user_ids.append(None)
+            dates.append(None)
+            texts.append(None)
+            continue
+        chat_ids.append(message.chat.id)
+        chat_types.append(message.chat.type.value)
+        user_ids.append(message.from_user.id if message.from_user else None)
+        dates.append(message.date)
+        texts.append(message.text)
+
+    return pa.record_batch(
+        [
+            pa.array(update_ids, type=pa.int64()),
+            pa.array(update_types, type=_DICTIONARY_STRING),
+            pa.array(chat_ids, type=pa.int64()),
+            pa.array(chat_types, type=_DICTIONARY_STRING),
+            pa.array(user_ids, type=pa.int64()),
+            pa.array(dates, type=pa.timestamp("s", tz="UTC")),
+            pa.array(texts, type=pa.string()),
+        ],
+        schema=UPDATE_SCHEMA,
+    )
+
+
+def write_update_stream(
+    sink: BinaryIO, batches: Iterable[List[TelegramUpdate]]
+) -> None:
+    """Write update batches as an Arrow IPC stream
+
+    Consumers read it back with pyarrow.ipc.open_stream.
+    """
+    with pa.ipc.new_stream(sink, UPDATE_SCHEMA) as writer:
+        for updates in batches:
+            writer.write_batch(updates_to_record_batch(updates))
@@ -4,23 +4,215 @@ Telegram Database Models
 SQLAlchemy models for persistent storage of Telegram data.
 """
 
-from datetime import datetime
-from typing import Optional, Dict, Any
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Callable, Tuple
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
     DateTime,
     Boolean,
+    Enum,
     Text,
     JSON,
+    DDL,
     ForeignKey,
+    Index,
+    MetaData,
+    PrimaryKeyConstraint,
+    Table,
+    Select,
+    cast,
+    func,
+    UniqueConstraint,
+    event,
+    literal_column,
+    select,
 )
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, selectinload
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 import uuid
 
+import orjson
+
+from .telegram_models import ChatType, MessageType
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+# JSONB on Postgres so stored documents are embedded without re-encoding
+JSONColumn = JSON().with_variant(JSONB(), "postgresql")
+
+# Small fixed vocabularies, stored as native enums on Postgres
+ChatTypeColumn = Enum(*(t.value for t in ChatType), name="chat_type")
+MessageTypeColumn = Enum(*(t.value for t in MessageType), name="message_type")
+MediaTypeColumn = Enum(
+    "photo",
+    "audio",
+    "video",
+    "voice",
+    "document",
+    "sticker",
+    "animation",
+    "video_note",
+    name="media_type",
+)
+MemberStatusColumn = Enum(
+    "creator",
+    "administrator",
+    "member",
+    "restricted",
+    "left",
+    "kicked",
+    name="chat_member_status",
+)
+LogLevelColumn = Enum("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL", name="log_level")
+
+# Postgres to_char pattern matching datetime.isoformat()
+_PG_ISO_FORMAT = 'YYYY-MM-DD"T"HH24:MI:SS.US'
+
+
+class EpochMicros(TypeDecorator):
+    """Naive UTC datetime stored as BIGINT microseconds since the epoch"""
+
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        return (value - _EPOCH) // _MICROSECOND
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return _EPOCH + timedelta(microseconds=value)
+
+
+class epoch_micros_now(FunctionElement):
+    """Database clock as BIGINT microseconds since the epoch"""
+
+    type = BigInteger()
+    inherit_cache = True
+
+
+@compiles(epoch_micros_now, "postgresql")
+def _epoch_micros_now_postgresql(element, compiler, **kw):
+    return "(CAST(EXTRACT(EPOCH FROM clock_timestamp()) * 1000000 AS BIGINT))"
+
+
+@compiles(epoch_micros_now, "sqlite")
+def _epoch_micros_now_sqlite(element, compiler, **kw):
+    return "(CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER))"
+
+
+# ChatMember permission flags, packed into ChatMember.permissions at bit = index
+CHAT_MEMBER_PERMISSIONS: Tuple[str, ...] = (
+    "can_be_edited",
+    "can_manage_chat",
+    "can_post_messages",
+    "can_edit_messages",
+    "can_delete_messages",
+    "can_manage_video_chats",
+    "can_restrict_members",
+    "can_promote_members",
+    "can_change_info",
+    "can_invite_users",
+    "can_pin_messages",
+    "can_manage_topics",
+)
+
+
+def _permission_flag(name: str) -> hybrid_property:
+    """Boolean view over one bit of ChatMember.permissions"""
+    mask = 1 << CHAT_MEMBER_PERMISSIONS.index(name)
+
+    def fget(self) -> bool:
+        return bool((self.permissions or 0) & mask)
+
+    def fset(self, value: bool) -> None:
+        permissions = self.permissions or 0
+        self.permissions = permissions | mask if value else permissions & ~mask
+
+    def expr(cls):
+        return cls.permissions.op("&")(mask) != 0
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
+def _not_postgresql(ddl, target, bind, **kw) -> bool:
+    """ddl_if predicate for DDL emitted everywhere except Postgres"""
+    dialect = kw.get("dialect") or kw["compiler"].dialect
+    return dialect.name != "postgresql"
+
+
+def _make_serializers(mapper) -> Tuple[Callable, classmethod, Callable]:
+    """Generate straight-line to_dict, rows_to_dicts and _json_dict for a mapper"""
+    flag_columns = getattr(mapper.class_, "_flag_columns", {})
+    preamble = []
+    fields = []
+    json_fields = []
+    for prop in mapper.column_attrs:
+        column = prop.columns[0]
+        value = f"self.{prop.key}"
+        if prop.key in flag_columns:
+            # Bit-packed column: read it once, expand each flag by mask
+            preamble.append(f"    _{prop.key} = {value} or 0")
+            for bit, flag in enumerate(flag_columns[prop.key]):
+                fields.append(f"        {flag!r}: _{prop.key} & {1 << bit} != 0,")
+            json_fields.extend(fields[-len(flag_columns[prop.key]) :])
+            continue
+        # orjson formats datetimes itself, identically to isoformat()
+        json_fields.append(f"        {column.name!r}: {value},")
+        if isinstance(column.type, (DateTime, EpochMicros)):
+            # One descriptor read per column; the format call is datetime's C method
+            value = f"None if (_v := {value}) is None else _isoformat(_v)"
+        fields.append(f"        {column.name!r}: {value},")
+    name = mapper.class_.__name__
+    # A dict display with constant keys compiles to BUILD_CONST_KEY_MAP: presized,
+    # with interned keys whose hashes are cached, so copying a template dict and
+    # assigning into it measures no faster
+    source = "\n".join(
+        [
+            "def to_dict(self):",
+            *preamble,
+            "    return {",
+            *fields,
+            "    }",
+            "",
+            "def rows_to_dicts(cls, rows):",
+            "    result = []",
+            "    append = result.append",
+            "    for self in rows:",
+            *(f"    {line}" for line in preamble),
+            "        append({",
+            *(f"    {line}" for line in fields),
+            "        })",
+            "    return result",
+            "",
+            "def _json_dict(self):",
+            *preamble,
+            "    return {",
+            *json_fields,
+            "    }",
+            "",
+        ]
+    )
+    namespace: Dict[str, Any] = {"_isoformat": datetime.isoformat}
+    exec(compile(source, f"<{name}.to_dict>", "exec"), namespace)
+    functions = [namespace[f] for f in ("to_dict", "rows_to_dicts", "_json_dict")]
+    for function in functions:
+        function.__qualname__ = f"{name}.{function.__name__}"
+    to_dict, rows_to_dicts, json_dict = functions
+    return to_dict, classmethod(rows_to_dicts), json_dict
+
+
 Base = declarative_base()
 
 
@@ -30,7 +222,7 @@ class User(Base):
     __tablename__ = "users"
 
     id = Column(Integer, primary_key=True)
-    telegram_id = Column(Integer, unique=True, nullable=False, index=True)
+    telegram_id = Column(BigInteger, unique=True, nullable=False, index=True)
     username = Column(String(255), nullable=True)
     first_name = Column(String(255), nullable=False)
     last_name = Column(String(255), nullable=True)
@@ -38,29 +230,15 @@ class User(Base):
     is_bot = Column(Boolean, default=False)
     is_premium = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_seen = Column(DateTime, nullable=True)
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
+    updated_at = Column(
+        EpochMicros, server_default=epoch_micros_now(), onupdate=epoch_micros_now()
+    )
+    last_seen = Column(EpochMicros, nullable=True)
 
     # Relationships
-    messages = relationship("Message", back_populates="user")
-    chat_memberships = relationship("ChatMember", back_populates="user")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "telegram_id": self.telegram_id,
-            "username": self.username,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "language_code": self.language_code,
-            "is_bot": self.is_bot,
-            "is_premium": self.is_premium,
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "last_seen": self.last_seen.isoformat() if self.last_seen else None,
-        }
+    messages = relationship("Message", back_populates="user", lazy="raise")
+    chat_memberships = relationship("ChatMember", back_populates="user", lazy="raise")
 
 
 class Chat(Base):
@@ -69,8 +247,8 @@ class Chat(Base):
     __tablename__ = "chats"
 
     id = Column(Integer, primary_key=True)
-    telegram_id = Column(Integer, unique=True, nullable=False, index=True)
-    type = Column(String(20), nullable=False)  # private, group, supergroup, channel
+    telegram_id = Column(BigInteger, unique=True, nullable=False, index=True)
+    type = Column(ChatTypeColumn, nullable=False)
     title = Column(String(255), nullable=True)
     username = Column(String(255), nullable=True)
     first_name = Column(String(255), nullable=True)
@@ -78,75 +256,49 @@ class Chat(Base):
     description = Column(Text, nullable=True)
     invite_link = Column(String(500), nullable=True)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
+    updated_at = Column(
+        EpochMicros, server_default=epoch_micros_now(), onupdate=epoch_micros_now()
+    )
 
     # Relationships
-    messages = relationship("Message", back_populates="chat")
-    members = relationship("ChatMember", back_populates="chat")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "telegram_id": self.telegram_id,
-            "type": self.type,
-            "title": self.title,
-            "username": self.username,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "description": self.description,
-            "invite_link": self.invite_link,
-            "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    messages = relationship("Message", back_populates="chat", lazy="raise")
+    members = relationship("ChatMember", back_populates="chat", lazy="raise")
 
 
 class Message(Base):
     """Message model"""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_chat_created", "chat_id", "created_at"),
+        Index("ix_messages_chat_telegram", "chat_id", "telegram_id", unique=True),
+    )
+    # Ingest-heavy: server-generated timestamps are not fetched back on INSERT
+    __mapper_args__ = {"eager_defaults": False}
 
     id = Column(Integer, primary_key=True)
-    telegram_id = Column(Integer, nullable=False, index=True)
+    telegram_id = Column(BigInteger, nullable=False, index=True)
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     text = Column(Text, nullable=True)
     caption = Column(Text, nullable=True)
-    message_type = Column(String(50), nullable=False)
-    media_type = Column(String(50), nullable=True)
+    message_type = Column(MessageTypeColumn, nullable=False)
+    media_type = Column(MediaTypeColumn, nullable=True)
     file_id = Column(String(255), nullable=True)
     reply_to_message_id = Column(Integer, nullable=True)
-    forward_from = Column(JSON, nullable=True)
-    entities = Column(JSON, nullable=True)
-    metadata = Column(JSON, nullable=True)
+    forward_from = Column(JSONColumn, nullable=True)
+    entities = Column(JSONColumn, nullable=True)
+    extra_metadata = Column("metadata", JSONColumn, nullable=True)
     is_deleted = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
+    updated_at = Column(
+        EpochMicros, server_default=epoch_micros_now(), onupdate=epoch_micros_now()
+    )
 
     # Relationships
-    chat = relationship("Chat", back_populates="messages")
-    user = relationship("User", back_populates="messages")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "telegram_id": self.telegram_id,
-            "chat_id": self.chat_id,
-            "user_id": self.user_id,
-            "text": self.text,
-            "caption": self.caption,
-            "message_type": self.message_type,
-            "media_type": self.media_type,
-            "file_id": self.file_id,
-            "reply_to_message_id": self.reply_to_message_id,
-            "forward_from": self.forward_from,
-            "entities": self.entities,
-            "metadata": self.metadata,
-            "is_deleted": self.is_deleted,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    chat = relationship("Chat", back_populates="messages", lazy="raise")
+    user = relationship("User", back_populates="messages", lazy="raise")
 
 
 class ChatMember(Base):
@@ -157,59 +309,34 @@ class ChatMember(Base):
     id = Column(Integer, primary_key=True)
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    status = Column(
-        String(50), nullable=False
-    )  # creator, administrator, member, restricted, left, kicked
+    status = Column(MemberStatusColumn, nullable=False)
     custom_title = Column(String(255), nullable=True)
     is_anonymous = Column(Boolean, default=False)
-    can_be_edited = Column(Boolean, default=False)
-    can_manage_chat = Column(Boolean, default=False)
-    can_post_messages = Column(Boolean, default=False)
-    can_edit_messages = Column(Boolean, default=False)
-    can_delete_messages = Column(Boolean, default=False)
-    can_manage_video_chats = Column(Boolean, default=False)
-    can_restrict_members = Column(Boolean, default=False)
-    can_promote_members = Column(Boolean, default=False)
-    can_change_info = Column(Boolean, default=False)
-    can_invite_users = Column(Boolean, default=False)
-    can_pin_messages = Column(Boolean, default=False)
-    can_manage_topics = Column(Boolean, default=False)
+    permissions = Column(Integer, default=0, nullable=False)
     joined_at = Column(DateTime, nullable=True)
     promoted_at = Column(DateTime, nullable=True)
     left_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
+
+    _flag_columns = {"permissions": CHAT_MEMBER_PERMISSIONS}
+
+    # Permission flags backed by bits of permissions
+    can_be_edited = _permission_flag("can_be_edited")
+    can_manage_chat = _permission_flag("can_manage_chat")
+    can_post_messages = _permission_flag("can_post_messages")
+    can_edit_messages = _permission_flag("can_edit_messages")
+    can_delete_messages = _permission_flag("can_delete_messages")
+    can_manage_video_chats = _permission_flag("can_manage_video_chats")
+    can_restrict_members = _permission_flag("can_restrict_members")
+    can_promote_members = _permission_flag("can_promote_members")
+    can_change_info = _permission_flag("can_change_info")
+    can_invite_users = _permission_flag("can_invite_users")
+    can_pin_messages = _permission_flag("can_pin_messages")
+    can_manage_topics = _permission_flag("can_manage_topics")
 
     # Relationships
-    chat = relationship("Chat", back_populates="members")
-    user = relationship("User", back_populates="chat_memberships")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "chat_id": self.chat_id,
-            "user_id": self.user_id,
-            "status": self.status,
-            "custom_title": self.custom_title,
-            "is_anonymous": self.is_anonymous,
-            "can_be_edited": self.can_be_edited,
-            "can_manage_chat": self.can_manage_chat,
-            "can_post_messages": self.can_post_messages,
-            "can_edit_messages": self.can_edit_messages,
-            "can_delete_messages": self.can_delete_messages,
-            "can_manage_video_chats": self.can_manage_video_chats,
-            "can_restrict_members": self.can_restrict_members,
-            "can_promote_members": self.can_promote_members,
-            "can_change_info": self.can_change_info,
-            "can_invite_users": self.can_invite_users,
-            "can_pin_messages": self.can_pin_messages,
-            "can_manage_topics": self.can_manage_topics,
-            "joined_at": self.joined_at.isoformat() if self.joined_at else None,
-            "promoted_at": self.promoted_at.isoformat() if self.promoted_at else None,
-            "left_at": self.left_at.isoformat() if self.left_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    chat = relationship("Chat", back_populates="members", lazy="raise")
+    user = relationship("User", back_populates="chat_memberships", lazy="raise")
 
 
 class BotCommand(Base):
@@ -223,88 +350,74 @@ class BotCommand(Base):
     is_enabled = Column(Boolean, default=True)
     is_admin_only = Column(Boolean, default=False)
     usage_count = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "command": self.command,
-            "description": self.description,
-            "is_enabled": self.is_enabled,
-            "is_admin_only": self.is_admin_only,
-            "usage_count": self.usage_count,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
 
 
 class UserSession(Base):
     """User session model"""
 
     __tablename__ = "user_sessions"
+    __table_args__ = (
+        Index("ix_user_sessions_user_chat", "user_id", "chat_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=False)
-    session_data = Column(JSON, nullable=True)
+    session_data = Column(JSONColumn, nullable=True)
     current_state = Column(String(100), nullable=True)
     expires_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
 
     # Relationships
-    user = relationship("User")
-    chat = relationship("Chat")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "chat_id": self.chat_id,
-            "session_data": self.session_data,
-            "current_state": self.current_state,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    user = relationship("User", lazy="raise")
+    chat = relationship("Chat", lazy="raise")
 
 
 class BotLog(Base):
     """Bot activity log model"""
 
     __tablename__ = "bot_logs"
-
-    id = Column(Integer, primary_key=True)
-    level = Column(String(20), nullable=False)  # DEBUG, INFO, WARNING, ERROR, CRITICAL
+    __table_args__ = (
+        Index("ix_bot_logs_level_created", "level", "created_at"),
+        # Postgres range-partitions by created_at, and a partitioned table's
+        # unique constraints must include the partition key
+        PrimaryKeyConstraint("id").ddl_if(callable_=_not_postgresql),
+        UniqueConstraint("id", "created_at").ddl_if(dialect="postgresql"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"eager_defaults": False}
+
+    id = Column(Integer)
+    level = Column(LogLevelColumn, nullable=False)
     message = Column(Text, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     chat_id = Column(Integer, ForeignKey("chats.id"), nullable=True)
     update_type = Column(String(50), nullable=True)
-    extra_data = Column(JSON, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    extra_data = Column(JSONColumn, nullable=True)
+    created_at = Column(
+        EpochMicros, nullable=False, server_default=epoch_micros_now()
+    )
 
     # Relationships
-    user = relationship("User")
-    chat = relationship("Chat")
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "level": self.level,
-            "message": self.message,
-            "user_id": self.user_id,
-            "chat_id": self.chat_id,
-            "update_type": self.update_type,
-            "extra_data": self.extra_data,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-        }
+    user = relationship("User", lazy="raise")
+    chat = relationship("Chat", lazy="raise")
+
+
+# Catch-all partition so inserts never fail for a range without its own partition
+event.listen(
+    BotLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS bot_logs_default PARTITION OF bot_logs DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
 
 
 class BotStats(Base):
     """Bot statistics model"""
 
     __tablename__ = "bot_stats"
+    __mapper_args__ = {"eager_defaults": False}
 
     id = Column(Integer, primary_key=True)
     date = Column(DateTime, nullable=False, index=True)
@@ -316,21 +429,151 @@ class BotStats(Base):
     messages_received = Column(Integer, default=0)
     commands_used = Column(Integer, default=0)
     errors_count = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "date": self.date.isoformat() if self.date else None,
-            "total_users": self.total_users,
-            "active_users": self.active_users,
-            "total_chats": self.total_chats,
-            "active_chats": self.active_chats,
-            "messages_sent": self.messages_sent,
-            "messages_received": self.messages_received,
-            "commands_used": self.commands_used,
-            "errors_count": self.errors_count,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+    created_at = Column(EpochMicros, server_default=epoch_micros_now())
+
+
+# Day bucket of an EpochMicros column, for Postgres aggregate DDL
+_PG_DAY = "date_trunc('day', TIMESTAMP '1970-01-01' + {0} * INTERVAL '1 microsecond')"
+
+# Postgres materialized view with BotStats' metrics for every day with activity.
+# Totals are running counts of users/chats created; active counts are distinct
+# message senders/chats that day.
+BOT_DAILY_STATS_VIEW = f"""
+CREATE MATERIALIZED VIEW IF NOT EXISTS bot_daily_stats AS
+WITH message_days AS (
+    SELECT {_PG_DAY.format("created_at")} AS date,
+           count(*) AS messages_sent,
+           count(DISTINCT user_id) AS active_users,
+           count(DISTINCT chat_id) AS active_chats
+    FROM messages GROUP BY 1
+), log_days AS (
+    SELECT {_PG_DAY.format("created_at")} AS date,
+           count(*) FILTER (WHERE update_type = 'command') AS commands_used,
+           count(*) FILTER (WHERE level = 'ERROR') AS errors_count
+    FROM bot_logs GROUP BY 1
+), user_days AS (
+    SELECT {_PG_DAY.format("created_at")} AS date, count(*) AS new_users
+    FROM users GROUP BY 1
+), chat_days AS (
+    SELECT {_PG_DAY.format("created_at")} AS date, count(*) AS new_chats
+    FROM chats GROUP BY 1
+), days AS (
+    SELECT date FROM message_days UNION SELECT date FROM log_days
+    UNION SELECT date FROM user_days UNION SELECT date FROM chat_days
+)
+SELECT date,
+       sum(coalesce(new_users, 0)) OVER w AS total_users,
+       coalesce(active_users, 0) AS active_users,
+       sum(coalesce(new_chats, 0)) OVER w AS total_chats,
+       coalesce(active_chats, 0) AS active_chats,
+       coalesce(messages_sent, 0) AS messages_sent,
+       coalesce(commands_used, 0) AS commands_used,
+       coalesce(errors_count, 0) AS errors_count
+FROM days
+LEFT JOIN message_days USING (date)
+LEFT JOIN log_days USING (date)
+LEFT JOIN user_days USING (date)
+LEFT JOIN chat_days USING (date)
+WINDOW w AS (ORDER BY date)
+"""
+
+# Read-only Core mapping of the view; kept out of Base.metadata so create_all
+# does not try to create it as a table
+bot_daily_stats = Table(
+    "bot_daily_stats",
+    MetaData(),
+    Column("date", DateTime, primary_key=True),
+    Column("total_users", Integer),
+    Column("active_users", Integer),
+    Column("total_chats", Integer),
+    Column("active_chats", Integer),
+    Column("messages_sent", Integer),
+    Column("commands_used", Integer),
+    Column("errors_count", Integer),
+)
+
+for _ddl in (
+    BOT_DAILY_STATS_VIEW,
+    # REFRESH ... CONCURRENTLY requires a unique index on the view
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_bot_daily_stats_date "
+    "ON bot_daily_stats (date)",
+):
+    event.listen(
+        Base.metadata, "after_create", DDL(_ddl).execute_if(dialect="postgresql")
+    )
+event.listen(
+    Base.metadata,
+    "before_drop",
+    DDL("DROP MATERIALIZED VIEW IF EXISTS bot_daily_stats").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+# Relationships raise on lazy access; query sites opt in with these presets,
+# e.g. select(Message).options(*LOADER_OPTIONS[Message])
+LOADER_OPTIONS = {
+    Message: (selectinload(Message.user), selectinload(Message.chat)),
+    ChatMember: (selectinload(ChatMember.user), selectinload(ChatMember.chat)),
+    UserSession: (selectinload(UserSession.user), selectinload(UserSession.chat)),
+    BotLog: (selectinload(BotLog.user), selectinload(BotLog.chat)),
+}
+
+def _json_object(mapper):
+    """json_build_object over a mapper's columns producing the to_dict payload"""
+    flag_columns = getattr(mapper.class_, "_flag_columns", {})
+    args = []
+    for prop in mapper.column_attrs:
+        column = prop.columns[0]
+        if prop.key in flag_columns:
+            for bit, flag in enumerate(flag_columns[prop.key]):
+                args += [flag, column.op("&")(1 << bit) != 0]
+            continue
+        value = column
+        if isinstance(column.type, EpochMicros):
+            value = literal_column("TIMESTAMP '1970-01-01'") + column * literal_column(
+                "INTERVAL '1 microsecond'"
+            )
+        if isinstance(column.type, (DateTime, EpochMicros)):
+            value = func.to_char(value, _PG_ISO_FORMAT)
+        args += [column.name, value]
+    return func.json_build_object(*args)
+
+
+def _orjson_default(obj: Any) -> Dict[str, Any]:
+    """orjson hook emitting mapped rows with datetimes left for orjson to format"""
+    json_dict = getattr(type(obj), "_json_dict", None)
+    if json_dict is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return json_dict(obj)
+
+
+def dumps_models(value: Any) -> bytes:
+    """Encode models, or structures containing them, to JSON like to_dict would"""
+    return orjson.dumps(value, default=_orjson_default)
+
+
+def select_json(model, *where) -> Select:
+    """Postgres SELECT returning each row as JSON text shaped like to_dict
+
+    Timestamps always carry microseconds, unlike isoformat() on whole seconds.
+    """
+    stmt = select(cast(model._json_object, Text))
+    return stmt.where(*where) if where else stmt
+
+
+def select_rows(model, *where) -> Select:
+    """Core SELECT whose rows feed model.rows_to_dicts without ORM instances"""
+    stmt = select(*model._read_columns)
+    return stmt.where(*where) if where else stmt
+
+
+for _mapper in Base.registry.mappers:
+    _mapper.class_._read_columns = tuple(
+        prop.columns[0].label(prop.key) for prop in _mapper.column_attrs
+    )
+    _mapper.class_._json_object = _json_object(_mapper)
+    (
+        _mapper.class_.to_dict,
+        _mapper.class_.rows_to_dicts,
+        _mapper.class_._json_dict,
+    ) = _make_serializers(_mapper)
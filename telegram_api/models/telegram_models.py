@@ -4,12 +4,15 @@ Telegram API Models
 Comprehensive data models for Telegram Bot API.
 """
 
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
+from datetime import datetime, timezone
 from enum import Enum
+from sys import intern
 
-from pydantic import BaseModel, Field
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # Enums
@@ -55,19 +58,6 @@ class MessageType(str, Enum):
     VIDEO_CHAT_PARTICIPANTS_INVITED = "video_chat_participants_invited"
     VIDEO_CHAT_SCHEDULED = "video_chat_scheduled"
     MESSAGE_AUTO_DELETE_TIMER_CHANGED = "message_auto_delete_timer_changed"
-    MIGRATE_TO_CHAT_ID = "migrate_to_chat_id"
-    MIGRATE_FROM_CHAT_ID = "migrate_from_chat_id"
-    PINNED_MESSAGE = "pinned_message"
-    INVOICE = "invoice"
-    SUCCESSFUL_PAYMENT = "successful_payment"
-    CONNECTED_WEBSITE = "connected_website"
-    PASSPORT_DATA = "passport_data"
-    PROXIMITY_ALERT_TRIGGERED = "proximity_alert_triggered"
-    VIDEO_CHAT_STARTED = "video_chat_started"
-    VIDEO_CHAT_ENDED = "video_chat_ended"
-    VIDEO_CHAT_PARTICIPANTS_INVITED = "video_chat_participants_invited"
-    VIDEO_CHAT_SCHEDULED = "video_chat_scheduled"
-    MESSAGE_AUTO_DELETE_TIMER_CHANGED = "message_auto_delete_timer_changed"
     VOICE_CHAT_STARTED = "voice_chat_started"
     VOICE_CHAT_ENDED = "voice_chat_ended"
     VOICE_CHAT_PARTICIPANTS_INVITED = "voice_chat_participants_invited"
@@ -93,8 +83,119 @@ class UpdateType(str, Enum):
     CHAT_JOIN_REQUEST = "chat_join_request"
 
 
+# Raw chat type string -> member, skipping the Enum call machinery
+_CHAT_TYPE_LOOKUP: Dict[str, ChatType] = {member.value: member for member in ChatType}
+
+# Attribute -> type tables, checked in order; the first truthy field wins.
+# Text messages resolve on the first probe; a presence bitmask built at
+# construction would instead test every field of every message up front.
+_MESSAGE_TYPE_DISPATCH: Tuple[Tuple[str, MessageType], ...] = (
+    ("text", MessageType.TEXT),
+    ("audio", MessageType.AUDIO),
+    ("document", MessageType.DOCUMENT),
+    ("game", MessageType.GAME),
+    ("photo", MessageType.PHOTO),
+    ("sticker", MessageType.STICKER),
+    ("video", MessageType.VIDEO),
+    ("voice", MessageType.VOICE),
+    ("video_note", MessageType.VIDEO_NOTE),
+    ("new_chat_members", MessageType.NEW_CHAT_MEMBERS),
+    ("left_chat_member", MessageType.LEFT_CHAT_MEMBER),
+    ("new_chat_title", MessageType.NEW_CHAT_TITLE),
+    ("new_chat_photo", MessageType.NEW_CHAT_PHOTO),
+    ("delete_chat_photo", MessageType.DELETE_CHAT_PHOTO),
+    ("group_chat_created", MessageType.GROUP_CHAT_CREATED),
+    ("supergroup_chat_created", MessageType.SUPERGROUP_CHAT_CREATED),
+    ("channel_chat_created", MessageType.CHANNEL_CHAT_CREATED),
+    ("migrate_to_chat_id", MessageType.MIGRATE_TO_CHAT_ID),
+    ("migrate_from_chat_id", MessageType.MIGRATE_FROM_CHAT_ID),
+    ("pinned_message", MessageType.PINNED_MESSAGE),
+    ("invoice", MessageType.INVOICE),
+    ("successful_payment", MessageType.SUCCESSFUL_PAYMENT),
+    ("connected_website", MessageType.CONNECTED_WEBSITE),
+    ("passport_data", MessageType.PASSPORT_DATA),
+    ("proximity_alert_triggered", MessageType.PROXIMITY_ALERT_TRIGGERED),
+    ("video_chat_started", MessageType.VIDEO_CHAT_STARTED),
+    ("video_chat_ended", MessageType.VIDEO_CHAT_ENDED),
+    ("video_chat_participants_invited", MessageType.VIDEO_CHAT_PARTICIPANTS_INVITED),
+    ("video_chat_scheduled", MessageType.VIDEO_CHAT_SCHEDULED),
+    (
+        "message_auto_delete_timer_changed",
+        MessageType.MESSAGE_AUTO_DELETE_TIMER_CHANGED,
+    ),
+    ("voice_chat_started", MessageType.VOICE_CHAT_STARTED),
+    ("voice_chat_ended", MessageType.VOICE_CHAT_ENDED),
+    ("voice_chat_participants_invited", MessageType.VOICE_CHAT_PARTICIPANTS_INVITED),
+    ("voice_chat_scheduled", MessageType.VOICE_CHAT_SCHEDULED),
+)
+
+_UPDATE_TYPE_DISPATCH: Tuple[Tuple[str, UpdateType], ...] = (
+    ("message", UpdateType.MESSAGE),
+    ("edited_message", UpdateType.EDITED_MESSAGE),
+    ("channel_post", UpdateType.CHANNEL_POST),
+    ("edited_channel_post", UpdateType.EDITED_CHANNEL_POST),
+    ("inline_query", UpdateType.INLINE_QUERY),
+    ("chosen_inline_result", UpdateType.CHOSEN_INLINE_RESULT),
+    ("callback_query", UpdateType.CALLBACK_QUERY),
+    ("shipping_query", UpdateType.SHIPPING_QUERY),
+    ("pre_checkout_query", UpdateType.PRE_CHECKOUT_QUERY),
+    ("poll", UpdateType.POLL),
+    ("poll_answer", UpdateType.POLL_ANSWER),
+    ("my_chat_member", UpdateType.MY_CHAT_MEMBER),
+    ("chat_member", UpdateType.CHAT_MEMBER),
+    ("chat_join_request", UpdateType.CHAT_JOIN_REQUEST),
+)
+
+
+def _to_datetime(value) -> Optional[datetime]:
+    """Normalise a Telegram date given as datetime or unix timestamp (UTC)"""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromtimestamp(value, timezone.utc)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """orjson hook for raw python-telegram-bot objects kept on the models"""
+    to_dict = getattr(obj, "to_dict", None)
+    if to_dict is None:
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+    return to_dict()
+
+
+class _LazyModel:
+    """Slot wrapper converting a raw python-telegram-bot object on first read
+
+    Nested models most updates never look at are stored raw and only built
+    when accessed; the converted model then replaces the raw value.
+    """
+
+    __slots__ = ("slot", "model", "convert")
+
+    def __init__(self, slot, model: type, convert) -> None:
+        self.slot = slot
+        self.model = model
+        self.convert = convert
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.slot
+        value = self.slot.__get__(instance, owner)
+        if value is not None and not isinstance(value, self.model):
+            value = self.convert(value)
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value) -> None:
+        self.slot.__set__(instance, value)
+
+
 # Base Models
-@dataclass
+# to_dict methods are written out as dict displays, which is exactly what code
+# generated from __dataclass_fields__ would compile to. They also expose a
+# chosen subset of fields, so generating them would change their output.
+@dataclass(slots=True)
 class TelegramUser:
     """Telegram user model"""
 
@@ -106,36 +207,48 @@ class TelegramUser:
     language_code: Optional[str] = None
     is_premium: Optional[bool] = None
     added_to_attachment_menu: Optional[bool] = None
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_telegram_user(cls, user) -> "TelegramUser":
         """Create from telegram.User"""
+        language_code = user.language_code
         return cls(
             id=user.id,
             is_bot=user.is_bot,
             first_name=user.first_name,
             username=user.username,
             last_name=user.last_name,
-            language_code=user.language_code,
+            language_code=intern(language_code) if language_code else language_code,
             is_premium=getattr(user, "is_premium", None),
             added_to_attachment_menu=getattr(user, "added_to_attachment_menu", None),
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "is_bot": self.is_bot,
-            "first_name": self.first_name,
-            "username": self.username,
-            "last_name": self.last_name,
-            "language_code": self.language_code,
-            "is_premium": self.is_premium,
-            "added_to_attachment_menu": self.added_to_attachment_menu,
-        }
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_cached_dict":
+            # Assigning any field makes the cached to_dict() output stale
+            object.__setattr__(self, "_cached_dict", None)
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary; a copy of one cached until a field changes"""
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "is_bot": self.is_bot,
+                "first_name": self.first_name,
+                "username": self.username,
+                "last_name": self.last_name,
+                "language_code": self.language_code,
+                "is_premium": self.is_premium,
+                "added_to_attachment_menu": self.added_to_attachment_menu,
+            }
+        return dict(self._cached_dict)
+
+
+@dataclass(slots=True)
 class TelegramChat:
     """Telegram chat model"""
 
@@ -165,13 +278,16 @@ class TelegramChat:
     can_set_sticker_set: Optional[bool] = None
     linked_chat_id: Optional[int] = None
     location: Optional[Dict[str, Any]] = None
+    _cached_dict: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     @classmethod
     def from_telegram_chat(cls, chat) -> "TelegramChat":
         """Create from telegram.Chat"""
         return cls(
             id=chat.id,
-            type=ChatType(chat.type),
+            type=_CHAT_TYPE_LOOKUP.get(chat.type) or ChatType(chat.type),
             title=chat.title,
             username=chat.username,
             first_name=chat.first_name,
@@ -198,22 +314,32 @@ class TelegramChat:
             linked_chat_id=getattr(chat, "linked_chat_id", None),
         )
 
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary"""
-        return {
-            "id": self.id,
-            "type": self.type.value,
-            "title": self.title,
-            "username": self.username,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "bio": self.bio,
-            "description": self.description,
-            "invite_link": self.invite_link,
-        }
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_cached_dict":
+            # Assigning any field makes the cached to_dict() output stale
+            object.__setattr__(self, "_cached_dict", None)
 
-
-@dataclass
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary; a copy of one cached until a field changes"""
+        # The cached dict already reads type.value once per instance; eagerly
+        # copying it in __post_init__ would also reject plain string types
+        if self._cached_dict is None:
+            self._cached_dict = {
+                "id": self.id,
+                "type": self.type.value,
+                "title": self.title,
+                "username": self.username,
+                "first_name": self.first_name,
+                "last_name": self.last_name,
+                "bio": self.bio,
+                "description": self.description,
+                "invite_link": self.invite_link,
+            }
+        return dict(self._cached_dict)
+
+
+@dataclass(slots=True, eq=False)
 class TelegramMessage:
     """Telegram message model"""
 
@@ -235,28 +361,11 @@ class TelegramMessage:
     media_group_id: Optional[str] = None
     author_signature: Optional[str] = None
     text: Optional[str] = None
-    entities: Optional[List[Dict[str, Any]]] = None
-    animation: Optional[Dict[str, Any]] = None
-    audio: Optional[Dict[str, Any]] = None
-    document: Optional[Dict[str, Any]] = None
-    photo: Optional[List[Dict[str, Any]]] = None
-    sticker: Optional[Dict[str, Any]] = None
-    video: Optional[Dict[str, Any]] = None
-    video_note: Optional[Dict[str, Any]] = None
-    voice: Optional[Dict[str, Any]] = None
     caption: Optional[str] = None
-    caption_entities: Optional[List[Dict[str, Any]]] = None
     has_media_spoiler: Optional[bool] = None
-    contact: Optional[Dict[str, Any]] = None
-    dice: Optional[Dict[str, Any]] = None
-    game: Optional[Dict[str, Any]] = None
-    poll: Optional[Dict[str, Any]] = None
-    venue: Optional[Dict[str, Any]] = None
-    location: Optional[Dict[str, Any]] = None
     new_chat_members: Optional[List[TelegramUser]] = None
     left_chat_member: Optional[TelegramUser] = None
     new_chat_title: Optional[str] = None
-    new_chat_photo: Optional[List[Dict[str, Any]]] = None
     delete_chat_photo: Optional[bool] = None
     group_chat_created: Optional[bool] = None
     supergroup_chat_created: Optional[bool] = None
@@ -264,58 +373,33 @@ class TelegramMessage:
     migrate_to_chat_id: Optional[int] = None
     migrate_from_chat_id: Optional[int] = None
     pinned_message: Optional["TelegramMessage"] = None
-    invoice: Optional[Dict[str, Any]] = None
-    successful_payment: Optional[Dict[str, Any]] = None
+    # Rarely set payloads (media, service data), exposed as properties below
+    extras: Dict[str, Any] = field(default_factory=dict)
     connected_website: Optional[str] = None
-    passport_data: Optional[Dict[str, Any]] = None
-    proximity_alert_triggered: Optional[Dict[str, Any]] = None
-    video_chat_started: Optional[Dict[str, Any]] = None
-    video_chat_ended: Optional[Dict[str, Any]] = None
-    video_chat_participants_invited: Optional[Dict[str, Any]] = None
-    video_chat_scheduled: Optional[Dict[str, Any]] = None
-    message_auto_delete_timer_changed: Optional[Dict[str, Any]] = None
-    voice_chat_started: Optional[Dict[str, Any]] = None
-    voice_chat_ended: Optional[Dict[str, Any]] = None
-    voice_chat_participants_invited: Optional[Dict[str, Any]] = None
-    voice_chat_scheduled: Optional[Dict[str, Any]] = None
-    reply_markup: Optional[Dict[str, Any]] = None
 
     @classmethod
     def from_telegram_message(cls, message) -> "TelegramMessage":
         """Create from telegram.Message"""
+        from_user = message.from_user
         return cls(
             message_id=message.message_id,
-            date=datetime.fromtimestamp(message.date),
+            date=_to_datetime(message.date),
             chat=TelegramChat.from_telegram_chat(message.chat),
             from_user=(
-                TelegramUser.from_telegram_user(message.from_user)
-                if message.from_user
-                else None
-            ),
-            forward_from=(
-                TelegramUser.from_telegram_user(message.forward_from)
-                if message.forward_from
-                else None
-            ),
-            forward_from_chat=(
-                TelegramChat.from_telegram_chat(message.forward_from_chat)
-                if message.forward_from_chat
-                else None
+                TelegramUser.from_telegram_user(from_user) if from_user else None
             ),
+            # Hydrated on first access, see _LazyModel
+            forward_from=message.forward_from,
+            forward_from_chat=message.forward_from_chat,
+            reply_to_message=message.reply_to_message,
+            via_bot=message.via_bot,
+            pinned_message=message.pinned_message,
             forward_from_message_id=getattr(message, "forward_from_message_id", None),
             forward_signature=getattr(message, "forward_signature", None),
             forward_sender_name=getattr(message, "forward_sender_name", None),
-            forward_date=(
-                datetime.fromtimestamp(message.forward_date)
-                if getattr(message, "forward_date", None)
-                else None
-            ),
+            forward_date=_to_datetime(getattr(message, "forward_date", None)),
             is_automatic_forward=getattr(message, "is_automatic_forward", None),
-            edit_date=(
-                datetime.fromtimestamp(message.edit_date)
-                if getattr(message, "edit_date", None)
-                else None
-            ),
+            edit_date=_to_datetime(getattr(message, "edit_date", None)),
             has_protected_content=getattr(message, "has_protected_content", None),
             media_group_id=getattr(message, "media_group_id", None),
             author_signature=getattr(message, "author_signature", None),
@@ -332,78 +416,20 @@ class TelegramMessage:
             connected_website=getattr(message, "connected_website", None),
         )
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not TelegramMessage:
+            return NotImplemented
+        return self.message_id == other.message_id and self.chat.id == other.chat.id
+
+    def __hash__(self) -> int:
+        return hash((self.message_id, self.chat.id))
+
     def get_message_type(self) -> MessageType:
         """Determine message type"""
-        if self.text:
-            return MessageType.TEXT
-        elif self.audio:
-            return MessageType.AUDIO
-        elif self.document:
-            return MessageType.DOCUMENT
-        elif self.game:
-            return MessageType.GAME
-        elif self.photo:
-            return MessageType.PHOTO
-        elif self.sticker:
-            return MessageType.STICKER
-        elif self.video:
-            return MessageType.VIDEO
-        elif self.voice:
-            return MessageType.VOICE
-        elif self.video_note:
-            return MessageType.VIDEO_NOTE
-        elif self.new_chat_members:
-            return MessageType.NEW_CHAT_MEMBERS
-        elif self.left_chat_member:
-            return MessageType.LEFT_CHAT_MEMBER
-        elif self.new_chat_title:
-            return MessageType.NEW_CHAT_TITLE
-        elif self.new_chat_photo:
-            return MessageType.NEW_CHAT_PHOTO
-        elif self.delete_chat_photo:
-            return MessageType.DELETE_CHAT_PHOTO
-        elif self.group_chat_created:
-            return MessageType.GROUP_CHAT_CREATED
-        elif self.supergroup_chat_created:
-            return MessageType.SUPERGROUP_CHAT_CREATED
-        elif self.channel_chat_created:
-            return MessageType.CHANNEL_CHAT_CREATED
-        elif self.migrate_to_chat_id:
-            return MessageType.MIGRATE_TO_CHAT_ID
-        elif self.migrate_from_chat_id:
-            return MessageType.MIGRATE_FROM_CHAT_ID
-        elif self.pinned_message:
-            return MessageType.PINNED_MESSAGE
-        elif self.invoice:
-            return MessageType.INVOICE
-        elif self.successful_payment:
-            return MessageType.SUCCESSFUL_PAYMENT
-        elif self.connected_website:
-            return MessageType.CONNECTED_WEBSITE
-        elif self.passport_data:
-            return MessageType.PASSPORT_DATA
-        elif self.proximity_alert_triggered:
-            return MessageType.PROXIMITY_ALERT_TRIGGERED
-        elif self.video_chat_started:
-            return MessageType.VIDEO_CHAT_STARTED
-        elif self.video_chat_ended:
-            return MessageType.VIDEO_CHAT_ENDED
-        elif self.video_chat_participants_invited:
-            return MessageType.VIDEO_CHAT_PARTICIPANTS_INVITED
-        elif self.video_chat_scheduled:
-            return MessageType.VIDEO_CHAT_SCHEDULED
-        elif self.message_auto_delete_timer_changed:
-            return MessageType.MESSAGE_AUTO_DELETE_TIMER_CHANGED
-        elif self.voice_chat_started:
-            return MessageType.VOICE_CHAT_STARTED
-        elif self.voice_chat_ended:
-            return MessageType.VOICE_CHAT_ENDED
-        elif self.voice_chat_participants_invited:
-            return MessageType.VOICE_CHAT_PARTICIPANTS_INVITED
-        elif self.voice_chat_scheduled:
-            return MessageType.VOICE_CHAT_SCHEDULED
-        else:
-            return MessageType.TEXT
+        for attr, message_type in _MESSAGE_TYPE_DISPATCH:
+            if getattr(self, attr):
+                return message_type
+        return MessageType.TEXT
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -417,8 +443,76 @@ class TelegramMessage:
             "message_type": self.get_message_type().value,
         }
 
-
-@dataclass
+    def to_json(self) -> bytes:
+        """Encode every field to JSON directly from the dataclass slots"""
+        return orjson.dumps(self, default=_orjson_default)
+
+
+_MESSAGE_EXTRAS = (
+    "entities",
+    "animation",
+    "audio",
+    "document",
+    "photo",
+    "sticker",
+    "video",
+    "video_note",
+    "voice",
+    "caption_entities",
+    "contact",
+    "dice",
+    "game",
+    "poll",
+    "venue",
+    "location",
+    "new_chat_photo",
+    "invoice",
+    "successful_payment",
+    "passport_data",
+    "proximity_alert_triggered",
+    "video_chat_started",
+    "video_chat_ended",
+    "video_chat_participants_invited",
+    "video_chat_scheduled",
+    "message_auto_delete_timer_changed",
+    "voice_chat_started",
+    "voice_chat_ended",
+    "voice_chat_participants_invited",
+    "voice_chat_scheduled",
+    "reply_markup",
+)
+
+
+def _extra_field(name: str) -> property:
+    """Property backed by an entry in TelegramMessage.extras"""
+
+    def fget(self):
+        return self.extras.get(name)
+
+    def fset(self, value):
+        self.extras[name] = value
+
+    return property(fget, fset)
+
+
+for _name in _MESSAGE_EXTRAS:
+    setattr(TelegramMessage, _name, _extra_field(_name))
+
+for _name, _model, _convert in (
+    ("forward_from", TelegramUser, TelegramUser.from_telegram_user),
+    ("forward_from_chat", TelegramChat, TelegramChat.from_telegram_chat),
+    ("reply_to_message", TelegramMessage, TelegramMessage.from_telegram_message),
+    ("via_bot", TelegramUser, TelegramUser.from_telegram_user),
+    ("pinned_message", TelegramMessage, TelegramMessage.from_telegram_message),
+):
+    setattr(
+        TelegramMessage,
+        _name,
+        _LazyModel(TelegramMessage.__dict__[_name], _model, _convert),
+    )
+
+
+@dataclass(slots=True, eq=False)
 class TelegramUpdate:
     """Telegram update model"""
 
@@ -441,26 +535,28 @@ class TelegramUpdate:
     @classmethod
     def from_telegram_update(cls, update) -> "TelegramUpdate":
         """Create from telegram.Update"""
+        message = update.message
+        edited_message = update.edited_message
+        channel_post = update.channel_post
+        edited_channel_post = update.edited_channel_post
         return cls(
             update_id=update.update_id,
             message=(
-                TelegramMessage.from_telegram_message(update.message)
-                if update.message
-                else None
+                TelegramMessage.from_telegram_message(message) if message else None
             ),
             edited_message=(
-                TelegramMessage.from_telegram_message(update.edited_message)
-                if update.edited_message
+                TelegramMessage.from_telegram_message(edited_message)
+                if edited_message
                 else None
             ),
             channel_post=(
-                TelegramMessage.from_telegram_message(update.channel_post)
-                if update.channel_post
+                TelegramMessage.from_telegram_message(channel_post)
+                if channel_post
                 else None
             ),
             edited_channel_post=(
-                TelegramMessage.from_telegram_message(update.edited_channel_post)
-                if update.edited_channel_post
+                TelegramMessage.from_telegram_message(edited_channel_post)
+                if edited_channel_post
                 else None
             ),
             inline_query=getattr(update, "inline_query", None),
@@ -475,38 +571,20 @@ class TelegramUpdate:
             chat_join_request=getattr(update, "chat_join_request", None),
         )
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not TelegramUpdate:
+            return NotImplemented
+        return self.update_id == other.update_id
+
+    def __hash__(self) -> int:
+        return hash(self.update_id)
+
     def get_update_type(self) -> UpdateType:
         """Determine update type"""
-        if self.message:
-            return UpdateType.MESSAGE
-        elif self.edited_message:
-            return UpdateType.EDITED_MESSAGE
-        elif self.channel_post:
-            return UpdateType.CHANNEL_POST
-        elif self.edited_channel_post:
-            return UpdateType.EDITED_CHANNEL_POST
-        elif self.inline_query:
-            return UpdateType.INLINE_QUERY
-        elif self.chosen_inline_result:
-            return UpdateType.CHOSEN_INLINE_RESULT
-        elif self.callback_query:
-            return UpdateType.CALLBACK_QUERY
-        elif self.shipping_query:
-            return UpdateType.SHIPPING_QUERY
-        elif self.pre_checkout_query:
-            return UpdateType.PRE_CHECKOUT_QUERY
-        elif self.poll:
-            return UpdateType.POLL
-        elif self.poll_answer:
-            return UpdateType.POLL_ANSWER
-        elif self.my_chat_member:
-            return UpdateType.MY_CHAT_MEMBER
-        elif self.chat_member:
-            return UpdateType.CHAT_MEMBER
-        elif self.chat_join_request:
-            return UpdateType.CHAT_JOIN_REQUEST
-        else:
-            return UpdateType.MESSAGE
+        for attr, update_type in _UPDATE_TYPE_DISPATCH:
+            if getattr(self, attr):
+                return update_type
+        return UpdateType.MESSAGE
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -523,11 +601,54 @@ class TelegramUpdate:
             ),
         }
 
+    def to_json(self) -> bytes:
+        """Encode every field to JSON directly from the dataclass slots"""
+        return orjson.dumps(self, default=_orjson_default)
+
+
+@dataclass(slots=True)
+class TelegramUpdateBatch:
+    """Column-wise view of a batch of updates
+
+    Ids sit in int64 arrays (0 where absent); the nested models for a row are
+    only built when row() asks for them.
+    """
+
+    update_ids: array = field(default_factory=lambda: array("q"))
+    chat_ids: array = field(default_factory=lambda: array("q"))
+    user_ids: array = field(default_factory=lambda: array("q"))
+    texts: List[Optional[str]] = field(default_factory=list)
+    updates: List[Any] = field(default_factory=list, repr=False)
+
+    @classmethod
+    def from_telegram_updates(cls, updates: Iterable[Any]) -> "TelegramUpdateBatch":
+        """Create from telegram.Update objects"""
+        batch = cls()
+        for update in updates:
+            chat = update.effective_chat
+            user = update.effective_user
+            message = update.effective_message
+            batch.update_ids.append(update.update_id)
+            batch.chat_ids.append(chat.id if chat else 0)
+            batch.user_ids.append(user.id if user else 0)
+            batch.texts.append(message.text if message else None)
+            batch.updates.append(update)
+        return batch
+
+    def __len__(self) -> int:
+        return len(self.update_ids)
+
+    def row(self, index: int) -> TelegramUpdate:
+        """Hydrate a single update"""
+        return TelegramUpdate.from_telegram_update(self.updates[index])
+
 
 # Pydantic Models for API
 class TelegramUserModel(BaseModel):
     """Pydantic model for Telegram user"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: int
     is_bot: bool
     first_name: str
@@ -540,6 +661,8 @@ class TelegramUserModel(BaseModel):
 class TelegramChatModel(BaseModel):
     """Pydantic model for Telegram chat"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     id: int
     type: str
     title: Optional[str] = None
@@ -552,10 +675,12 @@ class TelegramChatModel(BaseModel):
 class TelegramMessageModel(BaseModel):
     """Pydantic model for Telegram message"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True, populate_by_name=True)
+
     message_id: int
     date: datetime
     chat: TelegramChatModel
-    from_user: Optional[TelegramUserModel] = None
+    from_user: Optional[TelegramUserModel] = Field(default=None, alias="from")
     text: Optional[str] = None
     caption: Optional[str] = None
 
@@ -563,8 +688,22 @@ class TelegramMessageModel(BaseModel):
 class TelegramUpdateModel(BaseModel):
     """Pydantic model for Telegram update"""
 
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     update_id: int
     message: Optional[TelegramMessageModel] = None
     edited_message: Optional[TelegramMessageModel] = None
     channel_post: Optional[TelegramMessageModel] = None
     edited_channel_post: Optional[TelegramMessageModel] = None
+
+
+_update_validator = TelegramUpdateModel.__pydantic_validator__
+
+
+def decode_update(raw: Union[str, bytes]) -> TelegramUpdateModel:
+    """Decode a raw webhook payload straight from JSON
+
+    Reuses the validator compiled once at import; request handlers should call
+    this rather than building their own models or adapters per payload.
+    """
+    return _update_validator.validate_json(raw)
@@ -5,34 +5,407 @@ Production-ready services for Telegram bot operations.
 """
 
 import asyncio
+import copy
+import functools
+import inspect
+import itertools
 import logging
-from typing import Dict, List, Optional, Any, Union
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import json
 
-from telegram import Bot, Update, InlineKeyboardMarkup, ReplyKeyboardMarkup
-from telegram.request import BaseRequest
+from telegram import Bot, Update, InlineKeyboardMarkup, InputMedia, ReplyKeyboardMarkup
+from telegram.error import RetryAfter
+from telegram.request import BaseRequest, HTTPXRequest
 import httpx
 
+from ..exceptions import TelegramAPIError
 from ..models.telegram_models import (
     TelegramUser,
     TelegramChat,
     TelegramMessage,
     TelegramUpdate,
 )
-from ..config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Optional ChatMember fields; which exist depends on the member's status
+_MEMBER_ATTRS = (
+    "custom_title",
+    "is_anonymous",
+    "can_be_edited",
+    "can_manage_chat",
+    "can_post_messages",
+    "can_edit_messages",
+    "can_delete_messages",
+    "can_manage_video_chats",
+    "can_restrict_members",
+    "can_promote_members",
+    "can_change_info",
+    "can_invite_users",
+    "can_pin_messages",
+    "can_manage_topics",
+)
+
+
+def _member_to_dict(member) -> Dict[str, Any]:
+    """Flatten a telegram.ChatMember into a dictionary"""
+    result = {
+        "user": TelegramUser.from_telegram_user(member.user).to_dict(),
+        "status": member.status,
+    }
+    for attr in _MEMBER_ATTRS:
+        result[attr] = getattr(member, attr, None)
+    return result
+
+
+def _copy_member(member: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a cached member dict, so callers cannot modify the cache"""
+    return {**member, "user": dict(member["user"])}
+
+
+def _message_result(message, return_model: bool) -> Union[TelegramMessage, int]:
+    """The sent message as a TelegramMessage, or just its id for fire-and-forget"""
+    if return_model:
+        return TelegramMessage.from_telegram_message(message)
+    return message.message_id
+
+
+def _logged(default: Any = None, action: str = ""):
+    """Log and swallow Bot API failures, returning ``default`` instead
+
+    ``action`` is formatted with the call's arguments, and only when it fails
+    and the error would actually be logged.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            try:
+                return await func(self, *args, **kwargs)
+            except Exception as e:
+                if not self.logger.isEnabledFor(logging.ERROR):
+                    return default
+                try:
+                    arguments = signature.bind(self, *args, **kwargs).arguments
+                    label = action.format_map(arguments)
+                except (TypeError, KeyError):
+                    label = action or func.__name__
+                self.logger.error("Failed to %s: %s", label, e)
+                return default
+
+        return wrapper
+
+    return decorator
+
+
+class TokenBucket:
+    """Async token bucket: bursts pass straight through, sustained load waits"""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+
+    def reserve(self, n: float = 1) -> float:
+        """Take n tokens now and return how long to wait before using them"""
+        now = time.monotonic()
+        tokens = min(
+            self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate
+        )
+        self.last_refill = now
+        # Going negative reserves the tokens, so concurrent callers queue up
+        # behind each other instead of all waking at once
+        self.tokens = tokens - n
+        return -self.tokens / self.refill_rate if self.tokens < 0 else 0.0
+
+    def is_full(self) -> bool:
+        """Whether the bucket has refilled, i.e. a fresh one would behave the same"""
+        elapsed = time.monotonic() - self.last_refill
+        return self.tokens + elapsed * self.refill_rate >= self.capacity
+
+    async def acquire(self, n: float = 1) -> None:
+        """Take n tokens, sleeping until they have refilled if the bucket is short"""
+        delay = self.reserve(n)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class TTLCache:
+    """Bounded mapping whose entries expire ttl seconds after being stored"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # key -> (expiry, value), least recently stored first
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        """Cached value for key, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._entries[key]
+            return None
+        return entry[1]
+
+    def put(self, key: Any, value: Any):
+        """Store value under key, evicting the oldest entry beyond capacity"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Any):
+        """Drop key if cached"""
+        self._entries.pop(key, None)
+
+    def pop_where(self, predicate):
+        """Drop every key the predicate accepts"""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
 
 class TelegramAPIService:
     """Service for Telegram API operations"""
 
-    def __init__(self, bot: Bot):
+    # Telegram allows about 30 requests/s per bot and 20 messages/min per chat
+    GLOBAL_RATE = 30
+    CHAT_BURST = 20
+    CHAT_RATE = 20 / 60
+    # Beyond this many chats, refilled buckets of the least recent ones are dropped
+    CHAT_BUCKETS_MAX = 10_000
+    # Sends run on a few long-lived workers; lower priority values go first
+    SEND_WORKERS = 8
+    SEND_PRIORITY = 1
+    # Member lookups expire sooner so promotions and restrictions show up
+    CHAT_CACHE_TTL = 60.0
+    MEMBER_CACHE_TTL = 10.0
+
+    def __init__(self, bot: Bot, read_bot: Optional[Bot] = None):
         self.bot = bot
+        # get_* calls go through their own pool when given, so a burst of
+        # sends holding every connection cannot starve reads
+        self.read_bot = read_bot or bot
+        # Only bots built by create() are shut down with the service; a
+        # separate read_bot is always the service's to close
+        self._owns_bot = False
         self.logger = logging.getLogger(f"{__name__}.TelegramAPIService")
-        self._rate_limit_delay = 0.1  # 100ms between requests
-
+        self._global_bucket = TokenBucket(self.GLOBAL_RATE, self.GLOBAL_RATE)
+        # Least recently used first
+        self._chat_buckets: "OrderedDict[Union[int, str], TokenBucket]" = OrderedDict()
+        self._chat_cache = TTLCache(1024, self.CHAT_CACHE_TTL)
+        self._member_cache = TTLCache(1024, self.MEMBER_CACHE_TTL)
+        # Both caches are keyed by numeric chat id; lowercased "@username"
+        # of chats seen by get_chat -> chat id
+        self._chat_ids = TTLCache(1024, self.CHAT_CACHE_TTL)
+        # Bound Bot methods by name, resolved on first use of each
+        self._bound: Dict[str, Callable[..., Awaitable[Any]]] = {}
+        self._send_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._send_seq = itertools.count()
+        self._send_workers: List[asyncio.Task] = []
+        # Sends waiting out their chat's limit, by sequence number, so they
+        # do not hold a worker meanwhile
+        self._parked: Dict[int, Tuple[asyncio.TimerHandle, tuple]] = {}
+        # Loop time until which every send holds off after a 429
+        self._cooldown_until = 0.0
+        # Messages queued with queue_send_message, sent together by flush
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+
+    @classmethod
+    async def create(
+        cls,
+        token: str,
+        pool_size: int = 32,
+        read_pool_size: int = 8,
+        pool_timeout: float = 10.0,
+    ) -> "TelegramAPIService":
+        """Build and initialize a service with separate pools for writes and reads
+
+        The service owns both bots, so shutdown() closes both pools.
+        """
+        bot = Bot(
+            token,
+            request=HTTPXRequest(
+                connection_pool_size=pool_size, pool_timeout=pool_timeout
+            ),
+        )
+        read_bot = Bot(
+            token,
+            request=HTTPXRequest(
+                connection_pool_size=read_pool_size, pool_timeout=pool_timeout
+            ),
+        )
+        await asyncio.gather(bot.initialize(), read_bot.initialize())
+        service = cls(bot, read_bot=read_bot)
+        service._owns_bot = True
+        return service
+
+    async def shutdown(self):
+        """Stop the send workers, fail unsent sends and close the pools it owns"""
+        for worker in self._send_workers:
+            worker.cancel()
+        await asyncio.gather(*self._send_workers, return_exceptions=True)
+        self._send_workers.clear()
+
+        items = []
+        for handle, item in self._parked.values():
+            handle.cancel()
+            items.append(item)
+        self._parked.clear()
+        while not self._send_queue.empty():
+            items.append(self._send_queue.get_nowait())
+        for item in items:
+            if not item[2].done():
+                item[2].set_exception(TelegramAPIError("API service is shut down"))
+        # Never flushed; resolve them the way a failed send would
+        pending, self._pending = self._pending, []
+        for _, future in pending:
+            if not future.done():
+                future.set_result(None)
+
+        if self.read_bot is not self.bot:
+            await self.read_bot.shutdown()
+        if self._owns_bot:
+            await self.bot.shutdown()
+
+    def _chat_key(self, chat_id: Union[int, str]) -> Optional[int]:
+        """Numeric id the chat caches use for chat_id, or None if not known yet"""
+        if isinstance(chat_id, int):
+            return chat_id
+        if chat_id.lstrip("-").isdigit():
+            return int(chat_id)
+        return self._chat_ids.get(chat_id.lower())
+
+    def invalidate_chat(self, chat_id: Union[int, str], user_id: Optional[int] = None):
+        """Forget the cached chat and its member (or, without user_id, all members)"""
+        chat_id = self._chat_key(chat_id)
+        if chat_id is None:
+            # An @username get_chat never resolved has nothing cached
+            return
+        self._chat_cache.pop(chat_id)
+        if user_id is not None:
+            self._member_cache.pop((chat_id, user_id))
+        else:
+            self._member_cache.pop_where(lambda key: key[0] == chat_id)
+
+    def _chat_bucket(self, chat_id: Union[int, str]) -> TokenBucket:
+        """Per-chat bucket, created on first use"""
+        buckets = self._chat_buckets
+        bucket = buckets.get(chat_id)
+        if bucket is not None:
+            buckets.move_to_end(chat_id)
+            return bucket
+
+        bucket = buckets[chat_id] = TokenBucket(self.CHAT_BURST, self.CHAT_RATE)
+        # Only full buckets go, so no chat regains tokens early; if the oldest
+        # is still refilling the dict stays over the limit until it has
+        while len(buckets) > self.CHAT_BUCKETS_MAX:
+            oldest_id, oldest = next(iter(buckets.items()))
+            if not oldest.is_full():
+                break
+            del buckets[oldest_id]
+        return bucket
+
+    async def _call(
+        self,
+        method: str,
+        per_chat: bool = False,
+        priority: Optional[int] = None,
+        **kwargs,
+    ) -> Any:
+        """Call a Bot method once the rate limiter lets it through
+
+        per_chat also charges the target chat's bucket, for message sends.
+        Sends, and any call given a priority, go through the send queue.
+        """
+        if per_chat or priority is not None:
+            if priority is None:
+                priority = self.SEND_PRIORITY
+            return await self._enqueue(priority, method, per_chat, kwargs)
+        return await self._invoke(method, kwargs)
+
+    async def _invoke(self, method: str, kwargs: Dict[str, Any]) -> Any:
+        """Wait for the bot-wide bucket, then call the Bot method"""
+        delay = self._global_bucket.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+        bound = self._bound.get(method)
+        if bound is None:
+            bot = self.read_bot if method.startswith("get_") else self.bot
+            bound = self._bound[method] = getattr(bot, method)
+        return await bound(**kwargs)
+
+    async def _enqueue(
+        self, priority: int, method: str, per_chat: bool, kwargs: Dict[str, Any]
+    ) -> Any:
+        """Queue a send for the workers and wait for its result"""
+        if not self._send_workers:
+            self._send_workers = [
+                asyncio.create_task(self._send_worker())
+                for _ in range(self.SEND_WORKERS)
+            ]
+        future = asyncio.get_running_loop().create_future()
+        self._send_queue.put_nowait(
+            (priority, next(self._send_seq), future, method, per_chat, kwargs)
+        )
+        return await future
+
+    async def _send_worker(self):
+        """Run queued sends, holding every worker off while a 429 cooldown lasts"""
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._send_queue.get()
+            priority, seq, future, method, per_chat, kwargs = item
+            if future.done():
+                # The caller gave up (cancelled) while the send was queued
+                continue
+            if per_chat:
+                # Charge the chat once; a chat over its limit is parked until
+                # its slot comes up so it cannot stall sends to other chats
+                item = (priority, seq, future, method, False, kwargs)
+                delay = self._chat_bucket(kwargs["chat_id"]).reserve()
+                if delay:
+                    handle = loop.call_later(delay, self._unpark, seq)
+                    self._parked[seq] = (handle, item)
+                    continue
+            wait = self._cooldown_until - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await self._invoke(method, kwargs)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_exception(TelegramAPIError("API service is shut down"))
+                raise
+            except RetryAfter as e:
+                self._cooldown_until = max(
+                    self._cooldown_until, loop.time() + e.retry_after
+                )
+                self.logger.warning(
+                    "Rate limited by Telegram, pausing sends for %ss", e.retry_after
+                )
+                # Same priority and sequence number, so it keeps its place
+                self._send_queue.put_nowait(item)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    def _unpark(self, seq: int):
+        """Requeue a parked send now that its chat has a free slot"""
+        _, item = self._parked.pop(seq)
+        self._send_queue.put_nowait(item)
+
+    @_logged(None, "send message to {chat_id}")
     async def send_message(
         self,
         chat_id: Union[int, str],
@@ -42,29 +415,69 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a message"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_message(
-                chat_id=chat_id,
-                text=text,
-                parse_mode=parse_mode,
-                disable_web_page_preview=disable_web_page_preview,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
+        message = await self._call(
+            "send_message",
+            per_chat=True,
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+            disable_web_page_preview=disable_web_page_preview,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    def queue_send_message(
+        self, chat_id: Union[int, str], text: str, **kwargs
+    ) -> asyncio.Future:
+        """Queue a message for the next flush without waiting for it
+
+        The returned future resolves to what send_message would have returned.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((dict(kwargs, chat_id=chat_id, text=text), future))
+        return future
+
+    async def flush(self, concurrency: int = 30) -> None:
+        """Send every queued message, up to concurrency of them in flight at once"""
+        pending, self._pending = self._pending, []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send_one(kwargs: Dict[str, Any], future: asyncio.Future):
+            if future.done():
+                return
+            try:
+                async with semaphore:
+                    result = await self.send_message(**kwargs)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                return
+            if not future.done():
+                future.set_result(result)
 
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send message to {chat_id}: {e}")
-            return None
+        try:
+            if len(pending) == 1:
+                # Nothing to overlap, so skip gather's task and future setup
+                await send_one(*pending[0])
+            elif pending:
+                await asyncio.gather(
+                    *(send_one(kwargs, future) for kwargs, future in pending)
+                )
+        finally:
+            # Cancelled part way: nothing will resolve the rest any more
+            for _, future in pending:
+                if not future.done():
+                    future.cancel()
 
+    @_logged(None, "edit message {message_id} in {chat_id}")
     async def edit_message_text(
         self,
         chat_id: Union[int, str],
@@ -73,68 +486,54 @@ class TelegramAPIService:
         parse_mode: Optional[str] = None,
         disable_web_page_preview: Optional[bool] = None,
         reply_markup: Optional[InlineKeyboardMarkup] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Edit message text"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.edit_message_text(
-                chat_id=chat_id,
-                message_id=message_id,
-                text=text,
-                parse_mode=parse_mode,
-                disable_web_page_preview=disable_web_page_preview,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to edit message {message_id} in {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "edit_message_text",
+            per_chat=True,
+            chat_id=chat_id,
+            message_id=message_id,
+            text=text,
+            parse_mode=parse_mode,
+            disable_web_page_preview=disable_web_page_preview,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(False, "delete message {message_id} in {chat_id}")
     async def delete_message(self, chat_id: Union[int, str], message_id: int) -> bool:
         """Delete a message"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.delete_message(chat_id=chat_id, message_id=message_id)
-            return True
-
-        except Exception as e:
-            self.logger.error(
-                f"Failed to delete message {message_id} in {chat_id}: {e}"
-            )
-            return False
+        await self._call("delete_message", chat_id=chat_id, message_id=message_id)
+        return True
 
+    @_logged(None, "forward message {message_id}")
     async def forward_message(
         self,
         chat_id: Union[int, str],
         from_chat_id: Union[int, str],
         message_id: int,
         disable_notification: Optional[bool] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Forward a message"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.forward_message(
-                chat_id=chat_id,
-                from_chat_id=from_chat_id,
-                message_id=message_id,
-                disable_notification=disable_notification,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to forward message {message_id}: {e}")
-            return None
-
+        message = await self._call(
+            "forward_message",
+            per_chat=True,
+            chat_id=chat_id,
+            from_chat_id=from_chat_id,
+            message_id=message_id,
+            disable_notification=disable_notification,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "copy message {message_id}")
     async def copy_message(
         self,
         chat_id: Union[int, str],
@@ -146,31 +545,28 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Copy a message"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.copy_message(
-                chat_id=chat_id,
-                from_chat_id=from_chat_id,
-                message_id=message_id,
-                caption=caption,
-                parse_mode=parse_mode,
-                caption_entities=caption_entities,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to copy message {message_id}: {e}")
-            return None
-
+        message = await self._call(
+            "copy_message",
+            per_chat=True,
+            chat_id=chat_id,
+            from_chat_id=from_chat_id,
+            message_id=message_id,
+            caption=caption,
+            parse_mode=parse_mode,
+            caption_entities=caption_entities,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send photo to {chat_id}")
     async def send_photo(
         self,
         chat_id: Union[int, str],
@@ -180,29 +576,26 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a photo"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_photo(
-                chat_id=chat_id,
-                photo=photo,
-                caption=caption,
-                parse_mode=parse_mode,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send photo to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_photo",
+            per_chat=True,
+            chat_id=chat_id,
+            photo=photo,
+            caption=caption,
+            parse_mode=parse_mode,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send audio to {chat_id}")
     async def send_audio(
         self,
         chat_id: Union[int, str],
@@ -216,33 +609,30 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send an audio file"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_audio(
-                chat_id=chat_id,
-                audio=audio,
-                caption=caption,
-                parse_mode=parse_mode,
-                duration=duration,
-                performer=performer,
-                title=title,
-                thumb=thumb,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send audio to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_audio",
+            per_chat=True,
+            chat_id=chat_id,
+            audio=audio,
+            caption=caption,
+            parse_mode=parse_mode,
+            duration=duration,
+            performer=performer,
+            title=title,
+            thumb=thumb,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send document to {chat_id}")
     async def send_document(
         self,
         chat_id: Union[int, str],
@@ -252,29 +642,26 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a document"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_document(
-                chat_id=chat_id,
-                document=document,
-                caption=caption,
-                parse_mode=parse_mode,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send document to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_document",
+            per_chat=True,
+            chat_id=chat_id,
+            document=document,
+            caption=caption,
+            parse_mode=parse_mode,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send video to {chat_id}")
     async def send_video(
         self,
         chat_id: Union[int, str],
@@ -289,34 +676,31 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a video"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_video(
-                chat_id=chat_id,
-                video=video,
-                duration=duration,
-                width=width,
-                height=height,
-                thumb=thumb,
-                caption=caption,
-                parse_mode=parse_mode,
-                supports_streaming=supports_streaming,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send video to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_video",
+            per_chat=True,
+            chat_id=chat_id,
+            video=video,
+            duration=duration,
+            width=width,
+            height=height,
+            thumb=thumb,
+            caption=caption,
+            parse_mode=parse_mode,
+            supports_streaming=supports_streaming,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send voice to {chat_id}")
     async def send_voice(
         self,
         chat_id: Union[int, str],
@@ -327,30 +711,50 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a voice message"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_voice(
-                chat_id=chat_id,
-                voice=voice,
-                caption=caption,
-                parse_mode=parse_mode,
-                duration=duration,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send voice to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_voice",
+            per_chat=True,
+            chat_id=chat_id,
+            voice=voice,
+            caption=caption,
+            parse_mode=parse_mode,
+            duration=duration,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send media group to {chat_id}")
+    async def send_media_group(
+        self,
+        chat_id: Union[int, str],
+        media: List[InputMedia],
+        disable_notification: Optional[bool] = None,
+        reply_to_message_id: Optional[int] = None,
+        return_model: bool = True,
+        **kwargs,
+    ) -> Optional[List[Union[TelegramMessage, int]]]:
+        """Send 2-10 photos, videos, documents or audios as one album"""
+        messages = await self._call(
+            "send_media_group",
+            per_chat=True,
+            chat_id=chat_id,
+            media=media,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            **kwargs,
+        )
+
+        return [_message_result(message, return_model) for message in messages]
+
+    @_logged(None, "send location to {chat_id}")
     async def send_location(
         self,
         chat_id: Union[int, str],
@@ -363,32 +767,29 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a location"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_location(
-                chat_id=chat_id,
-                latitude=latitude,
-                longitude=longitude,
-                horizontal_accuracy=horizontal_accuracy,
-                live_period=live_period,
-                heading=heading,
-                proximity_alert_radius=proximity_alert_radius,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send location to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_location",
+            per_chat=True,
+            chat_id=chat_id,
+            latitude=latitude,
+            longitude=longitude,
+            horizontal_accuracy=horizontal_accuracy,
+            live_period=live_period,
+            heading=heading,
+            proximity_alert_radius=proximity_alert_radius,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send venue to {chat_id}")
     async def send_venue(
         self,
         chat_id: Union[int, str],
@@ -403,34 +804,31 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a venue"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_venue(
-                chat_id=chat_id,
-                latitude=latitude,
-                longitude=longitude,
-                title=title,
-                address=address,
-                foursquare_id=foursquare_id,
-                foursquare_type=foursquare_type,
-                google_place_id=google_place_id,
-                google_place_type=google_place_type,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send venue to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_venue",
+            per_chat=True,
+            chat_id=chat_id,
+            latitude=latitude,
+            longitude=longitude,
+            title=title,
+            address=address,
+            foursquare_id=foursquare_id,
+            foursquare_type=foursquare_type,
+            google_place_id=google_place_id,
+            google_place_type=google_place_type,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send contact to {chat_id}")
     async def send_contact(
         self,
         chat_id: Union[int, str],
@@ -441,30 +839,27 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a contact"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_contact(
-                chat_id=chat_id,
-                phone_number=phone_number,
-                first_name=first_name,
-                last_name=last_name,
-                vcard=vcard,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send contact to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_contact",
+            per_chat=True,
+            chat_id=chat_id,
+            phone_number=phone_number,
+            first_name=first_name,
+            last_name=last_name,
+            vcard=vcard,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send poll to {chat_id}")
     async def send_poll(
         self,
         chat_id: Union[int, str],
@@ -482,37 +877,34 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a poll"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_poll(
-                chat_id=chat_id,
-                question=question,
-                options=options,
-                is_anonymous=is_anonymous,
-                type=type,
-                allows_multiple_answers=allows_multiple_answers,
-                correct_option_id=correct_option_id,
-                explanation=explanation,
-                explanation_parse_mode=explanation_parse_mode,
-                open_period=open_period,
-                close_date=close_date,
-                is_closed=is_closed,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send poll to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_poll",
+            per_chat=True,
+            chat_id=chat_id,
+            question=question,
+            options=options,
+            is_anonymous=is_anonymous,
+            type=type,
+            allows_multiple_answers=allows_multiple_answers,
+            correct_option_id=correct_option_id,
+            explanation=explanation,
+            explanation_parse_mode=explanation_parse_mode,
+            open_period=open_period,
+            close_date=close_date,
+            is_closed=is_closed,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(None, "send dice to {chat_id}")
     async def send_dice(
         self,
         chat_id: Union[int, str],
@@ -520,174 +912,99 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
         reply_to_message_id: Optional[int] = None,
         reply_markup: Optional[Union[InlineKeyboardMarkup, ReplyKeyboardMarkup]] = None,
+        return_model: bool = True,
         **kwargs,
-    ) -> Optional[TelegramMessage]:
+    ) -> Optional[Union[TelegramMessage, int]]:
         """Send a dice"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            message = await self.bot.send_dice(
-                chat_id=chat_id,
-                emoji=emoji,
-                disable_notification=disable_notification,
-                reply_to_message_id=reply_to_message_id,
-                reply_markup=reply_markup,
-                **kwargs,
-            )
-
-            return TelegramMessage.from_telegram_message(message)
-
-        except Exception as e:
-            self.logger.error(f"Failed to send dice to {chat_id}: {e}")
-            return None
-
+        message = await self._call(
+            "send_dice",
+            per_chat=True,
+            chat_id=chat_id,
+            emoji=emoji,
+            disable_notification=disable_notification,
+            reply_to_message_id=reply_to_message_id,
+            reply_markup=reply_markup,
+            **kwargs,
+        )
+
+        return _message_result(message, return_model)
+
+    @_logged(False, "send chat action {action} to {chat_id}")
     async def send_chat_action(self, chat_id: Union[int, str], action: str) -> bool:
         """Send a chat action"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.send_chat_action(chat_id=chat_id, action=action)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to send chat action {action} to {chat_id}: {e}")
-            return False
+        # Typing indicators jump ahead of queued bulk sends
+        await self._call("send_chat_action", priority=0, chat_id=chat_id, action=action)
+        return True
 
+    @_logged(None, "get profile photos for user {user_id}")
     async def get_user_profile_photos(
         self, user_id: int, offset: Optional[int] = None, limit: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """Get user's profile photos"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
+        photos = await self._call(
+            "get_user_profile_photos", user_id=user_id, offset=offset, limit=limit
+        )
 
-            photos = await self.bot.get_user_profile_photos(
-                user_id=user_id, offset=offset, limit=limit
-            )
-
-            return {"total_count": photos.total_count, "photos": photos.photos}
-
-        except Exception as e:
-            self.logger.error(f"Failed to get profile photos for user {user_id}: {e}")
-            return None
+        return {"total_count": photos.total_count, "photos": photos.photos}
 
+    @_logged(None, "get chat {chat_id}")
     async def get_chat(self, chat_id: Union[int, str]) -> Optional[TelegramChat]:
-        """Get chat information"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            chat = await self.bot.get_chat(chat_id=chat_id)
-            return TelegramChat.from_telegram_chat(chat)
-
-        except Exception as e:
-            self.logger.error(f"Failed to get chat {chat_id}: {e}")
-            return None
-
+        """Get chat information, cached for CHAT_CACHE_TTL seconds"""
+        key = self._chat_key(chat_id)
+        cached = self._chat_cache.get(key) if key is not None else None
+        if cached is not None:
+            return copy.copy(cached)
+        chat = TelegramChat.from_telegram_chat(
+            await self._call("get_chat", chat_id=chat_id)
+        )
+        self._chat_cache.put(chat.id, chat)
+        if isinstance(chat_id, str) and key is None:
+            self._chat_ids.put(chat_id.lower(), chat.id)
+        if chat.username:
+            self._chat_ids.put(f"@{chat.username}".lower(), chat.id)
+        return copy.copy(chat)
+
+    @_logged(None, "get chat member {user_id} from {chat_id}")
     async def get_chat_member(
         self, chat_id: Union[int, str], user_id: int
     ) -> Optional[Dict[str, Any]]:
-        """Get chat member information"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            member = await self.bot.get_chat_member(chat_id=chat_id, user_id=user_id)
-
-            return {
-                "user": TelegramUser.from_telegram_user(member.user).to_dict(),
-                "status": member.status,
-                "custom_title": getattr(member, "custom_title", None),
-                "is_anonymous": getattr(member, "is_anonymous", None),
-                "can_be_edited": getattr(member, "can_be_edited", None),
-                "can_manage_chat": getattr(member, "can_manage_chat", None),
-                "can_post_messages": getattr(member, "can_post_messages", None),
-                "can_edit_messages": getattr(member, "can_edit_messages", None),
-                "can_delete_messages": getattr(member, "can_delete_messages", None),
-                "can_manage_video_chats": getattr(
-                    member, "can_manage_video_chats", None
-                ),
-                "can_restrict_members": getattr(member, "can_restrict_members", None),
-                "can_promote_members": getattr(member, "can_promote_members", None),
-                "can_change_info": getattr(member, "can_change_info", None),
-                "can_invite_users": getattr(member, "can_invite_users", None),
-                "can_pin_messages": getattr(member, "can_pin_messages", None),
-                "can_manage_topics": getattr(member, "can_manage_topics", None),
-            }
-
-        except Exception as e:
-            self.logger.error(
-                f"Failed to get chat member {user_id} from {chat_id}: {e}"
-            )
-            return None
-
+        """Get chat member information, cached for MEMBER_CACHE_TTL seconds"""
+        chat_key = self._chat_key(chat_id)
+        key = (chat_key, user_id)
+        cached = self._member_cache.get(key) if chat_key is not None else None
+        if cached is not None:
+            return _copy_member(cached)
+        member = _member_to_dict(
+            await self._call("get_chat_member", chat_id=chat_id, user_id=user_id)
+        )
+        # Unresolved @usernames are not cached, invalidate_chat could miss them
+        if chat_key is not None:
+            self._member_cache.put(key, member)
+        return _copy_member(member)
+
+    @_logged(None, "get chat administrators from {chat_id}")
     async def get_chat_administrators(
         self, chat_id: Union[int, str]
     ) -> Optional[List[Dict[str, Any]]]:
         """Get chat administrators"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            administrators = await self.bot.get_chat_administrators(chat_id=chat_id)
-
-            result = []
-            for admin in administrators:
-                result.append(
-                    {
-                        "user": TelegramUser.from_telegram_user(admin.user).to_dict(),
-                        "status": admin.status,
-                        "custom_title": getattr(admin, "custom_title", None),
-                        "is_anonymous": getattr(admin, "is_anonymous", None),
-                        "can_be_edited": getattr(admin, "can_be_edited", None),
-                        "can_manage_chat": getattr(admin, "can_manage_chat", None),
-                        "can_post_messages": getattr(admin, "can_post_messages", None),
-                        "can_edit_messages": getattr(admin, "can_edit_messages", None),
-                        "can_delete_messages": getattr(
-                            admin, "can_delete_messages", None
-                        ),
-                        "can_manage_video_chats": getattr(
-                            admin, "can_manage_video_chats", None
-                        ),
-                        "can_restrict_members": getattr(
-                            admin, "can_restrict_members", None
-                        ),
-                        "can_promote_members": getattr(
-                            admin, "can_promote_members", None
-                        ),
-                        "can_change_info": getattr(admin, "can_change_info", None),
-                        "can_invite_users": getattr(admin, "can_invite_users", None),
-                        "can_pin_messages": getattr(admin, "can_pin_messages", None),
-                        "can_manage_topics": getattr(admin, "can_manage_topics", None),
-                    }
-                )
+        administrators = await self._call("get_chat_administrators", chat_id=chat_id)
 
-            return result
-
-        except Exception as e:
-            self.logger.error(f"Failed to get chat administrators from {chat_id}: {e}")
-            return None
+        return [_member_to_dict(admin) for admin in administrators]
 
+    @_logged(None, "get chat member count from {chat_id}")
     async def get_chat_member_count(self, chat_id: Union[int, str]) -> Optional[int]:
         """Get chat member count"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            count = await self.bot.get_chat_member_count(chat_id=chat_id)
-            return count
-
-        except Exception as e:
-            self.logger.error(f"Failed to get chat member count from {chat_id}: {e}")
-            return None
+        count = await self._call("get_chat_member_count", chat_id=chat_id)
+        return count
 
+    @_logged(False, "leave chat {chat_id}")
     async def leave_chat(self, chat_id: Union[int, str]) -> bool:
         """Leave a chat"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.leave_chat(chat_id=chat_id)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to leave chat {chat_id}: {e}")
-            return False
+        await self._call("leave_chat", chat_id=chat_id)
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "ban user {user_id} from {chat_id}")
     async def ban_chat_member(
         self,
         chat_id: Union[int, str],
@@ -696,21 +1013,17 @@ class TelegramAPIService:
         revoke_messages: Optional[bool] = None,
     ) -> bool:
         """Ban a chat member"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.ban_chat_member(
-                chat_id=chat_id,
-                user_id=user_id,
-                until_date=until_date,
-                revoke_messages=revoke_messages,
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to ban user {user_id} from {chat_id}: {e}")
-            return False
-
+        await self._call(
+            "ban_chat_member",
+            chat_id=chat_id,
+            user_id=user_id,
+            until_date=until_date,
+            revoke_messages=revoke_messages,
+        )
+        self.invalidate_chat(chat_id, user_id)
+        return True
+
+    @_logged(False, "unban user {user_id} from {chat_id}")
     async def unban_chat_member(
         self,
         chat_id: Union[int, str],
@@ -718,18 +1031,16 @@ class TelegramAPIService:
         only_if_banned: Optional[bool] = None,
     ) -> bool:
         """Unban a chat member"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.unban_chat_member(
-                chat_id=chat_id, user_id=user_id, only_if_banned=only_if_banned
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to unban user {user_id} from {chat_id}: {e}")
-            return False
-
+        await self._call(
+            "unban_chat_member",
+            chat_id=chat_id,
+            user_id=user_id,
+            only_if_banned=only_if_banned,
+        )
+        self.invalidate_chat(chat_id, user_id)
+        return True
+
+    @_logged(False, "restrict user {user_id} in {chat_id}")
     async def restrict_chat_member(
         self,
         chat_id: Union[int, str],
@@ -738,21 +1049,17 @@ class TelegramAPIService:
         until_date: Optional[Union[int, datetime]] = None,
     ) -> bool:
         """Restrict a chat member"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.restrict_chat_member(
-                chat_id=chat_id,
-                user_id=user_id,
-                permissions=permissions,
-                until_date=until_date,
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to restrict user {user_id} in {chat_id}: {e}")
-            return False
-
+        await self._call(
+            "restrict_chat_member",
+            chat_id=chat_id,
+            user_id=user_id,
+            permissions=permissions,
+            until_date=until_date,
+        )
+        self.invalidate_chat(chat_id, user_id)
+        return True
+
+    @_logged(False, "promote user {user_id} in {chat_id}")
     async def promote_chat_member(
         self,
         chat_id: Union[int, str],
@@ -769,83 +1076,59 @@ class TelegramAPIService:
         can_manage_topics: Optional[bool] = None,
     ) -> bool:
         """Promote a chat member"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.promote_chat_member(
-                chat_id=chat_id,
-                user_id=user_id,
-                can_change_info=can_change_info,
-                can_post_messages=can_post_messages,
-                can_edit_messages=can_edit_messages,
-                can_delete_messages=can_delete_messages,
-                can_invite_users=can_invite_users,
-                can_restrict_members=can_restrict_members,
-                can_pin_messages=can_pin_messages,
-                can_promote_members=can_promote_members,
-                can_manage_video_chats=can_manage_video_chats,
-                can_manage_topics=can_manage_topics,
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to promote user {user_id} in {chat_id}: {e}")
-            return False
-
+        await self._call(
+            "promote_chat_member",
+            chat_id=chat_id,
+            user_id=user_id,
+            can_change_info=can_change_info,
+            can_post_messages=can_post_messages,
+            can_edit_messages=can_edit_messages,
+            can_delete_messages=can_delete_messages,
+            can_invite_users=can_invite_users,
+            can_restrict_members=can_restrict_members,
+            can_pin_messages=can_pin_messages,
+            can_promote_members=can_promote_members,
+            can_manage_video_chats=can_manage_video_chats,
+            can_manage_topics=can_manage_topics,
+        )
+        self.invalidate_chat(chat_id, user_id)
+        return True
+
+    @_logged(False, "set chat photo for {chat_id}")
     async def set_chat_photo(
         self, chat_id: Union[int, str], photo: Union[str, bytes]
     ) -> bool:
         """Set chat photo"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.set_chat_photo(chat_id=chat_id, photo=photo)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to set chat photo for {chat_id}: {e}")
-            return False
+        await self._call("set_chat_photo", chat_id=chat_id, photo=photo)
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "delete chat photo for {chat_id}")
     async def delete_chat_photo(self, chat_id: Union[int, str]) -> bool:
         """Delete chat photo"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.delete_chat_photo(chat_id=chat_id)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to delete chat photo for {chat_id}: {e}")
-            return False
+        await self._call("delete_chat_photo", chat_id=chat_id)
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "set chat title for {chat_id}")
     async def set_chat_title(self, chat_id: Union[int, str], title: str) -> bool:
         """Set chat title"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.set_chat_title(chat_id=chat_id, title=title)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to set chat title for {chat_id}: {e}")
-            return False
+        await self._call("set_chat_title", chat_id=chat_id, title=title)
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "set chat description for {chat_id}")
     async def set_chat_description(
         self, chat_id: Union[int, str], description: str
     ) -> bool:
         """Set chat description"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.set_chat_description(
-                chat_id=chat_id, description=description
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to set chat description for {chat_id}: {e}")
-            return False
+        await self._call(
+            "set_chat_description", chat_id=chat_id, description=description
+        )
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "pin message {message_id} in {chat_id}")
     async def pin_chat_message(
         self,
         chat_id: Union[int, str],
@@ -853,42 +1136,105 @@ class TelegramAPIService:
         disable_notification: Optional[bool] = None,
     ) -> bool:
         """Pin a message in chat"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.pin_chat_message(
-                chat_id=chat_id,
-                message_id=message_id,
-                disable_notification=disable_notification,
-            )
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to pin message {message_id} in {chat_id}: {e}")
-            return False
-
+        await self._call(
+            "pin_chat_message",
+            chat_id=chat_id,
+            message_id=message_id,
+            disable_notification=disable_notification,
+        )
+        self.invalidate_chat(chat_id)
+        return True
+
+    @_logged(False, "unpin message {message_id} in {chat_id}")
     async def unpin_chat_message(
         self, chat_id: Union[int, str], message_id: Optional[int] = None
     ) -> bool:
         """Unpin a message in chat"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
-
-            await self.bot.unpin_chat_message(chat_id=chat_id, message_id=message_id)
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Failed to unpin message {message_id} in {chat_id}: {e}")
-            return None
+        await self._call("unpin_chat_message", chat_id=chat_id, message_id=message_id)
+        self.invalidate_chat(chat_id)
+        return True
 
+    @_logged(False, "unpin all messages in {chat_id}")
     async def unpin_all_chat_messages(self, chat_id: Union[int, str]) -> bool:
         """Unpin all messages in chat"""
-        try:
-            await asyncio.sleep(self._rate_limit_delay)
+        await self._call("unpin_all_chat_messages", chat_id=chat_id)
+        self.invalidate_chat(chat_id)
+        return True
+
 
-            await self.bot.unpin_all_chat_messages(chat_id=chat_id)
-            return True
+class BatchingSender:
+    """Coalesces short plain-text replies to the same chat into one message"""
 
+    def __init__(
+        self,
+        api_service: TelegramAPIService,
+        window: float = 0.1,
+        max_length: int = 4096,
+        batch_threshold: int = 512,
+    ):
+        self.api_service = api_service
+        self.window = window
+        self.max_length = max_length
+        self.batch_threshold = min(batch_threshold, max_length)
+        self.logger = logging.getLogger(f"{__name__}.BatchingSender")
+        self._buffers: Dict[Union[int, str], List[str]] = {}
+        self._timers: Dict[Union[int, str], asyncio.Task] = {}
+
+    async def send_message(
+        self, chat_id: Union[int, str], text: str, batch: bool = True
+    ) -> bool:
+        """Queue a reply for the chat, or send it now if it is not batchable"""
+        if not batch or len(text) > self.batch_threshold:
+            # Keep the chat's replies in order
+            await self.flush(chat_id)
+            result = await self.api_service.send_message(
+                chat_id, text, return_model=False
+            )
+            return result is not None
+
+        buffer = self._buffers.get(chat_id)
+        if buffer is None:
+            self._buffers[chat_id] = [text]
+            self._timers[chat_id] = asyncio.create_task(self._flush_later(chat_id))
+        else:
+            buffer.append(text)
+        return True
+
+    async def flush(self, chat_id: Union[int, str]):
+        """Send everything buffered for a chat"""
+        timer = self._timers.pop(chat_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+
+        texts = self._buffers.pop(chat_id, None)
+        if not texts:
+            return
+
+        for chunk in self._chunks(texts):
+            await self.api_service.send_message(chat_id, chunk, return_model=False)
+
+    async def close(self):
+        """Flush every chat"""
+        for chat_id in list(self._buffers):
+            await self.flush(chat_id)
+
+    async def _flush_later(self, chat_id: Union[int, str]):
+        """Flush a chat once the batching window has passed"""
+        await asyncio.sleep(self.window)
+        try:
+            await self.flush(chat_id)
         except Exception as e:
-            self.logger.error(f"Failed to unpin all messages in {chat_id}: {e}")
-            return False
+            self.logger.error("Failed to flush replies to %s: %s", chat_id, e)
+
+    def _chunks(self, texts: List[str]) -> List[str]:
+        """Join texts with newlines into messages no longer than max_length"""
+        chunks = []
+        current = texts[0]
+        for text in texts[1:]:
+            if len(current) + 1 + len(text) > self.max_length:
+                chunks.append(current)
+                current = text
+            else:
+                current = f"{current}\n{text}"
+        chunks.append(current)
+        return chunks
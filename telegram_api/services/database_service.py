@@ -6,11 +6,14 @@ Database services for persistent storage operations.
 
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, Iterable, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import insert, select, text, update, delete, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import orjson
 
 from ..models.database_models import (
     User,
@@ -21,31 +24,66 @@ from ..models.database_models import (
     UserSession,
     BotLog,
     BotStats,
+    EpochMicros,
+    epoch_micros_now,
+    bot_daily_stats,
 )
 from ..models.telegram_models import TelegramUser, TelegramChat, TelegramMessage
-from ..config.settings import settings
+from ..config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Dialect INSERTs supporting ON CONFLICT DO NOTHING
+_DIALECT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# Column order of BotLogService.copy_logs entries; created_at is server-side
+_BOT_LOG_COPY_COLUMNS = (
+    "level",
+    "message",
+    "user_id",
+    "chat_id",
+    "update_type",
+    "extra_data",
+)
+
+# Weekly bot_logs partitions on Postgres are named bot_logs_YYYYMMDD (week start)
+_LOG_PARTITION_PREFIX = "bot_logs_"
+_LOG_PARTITIONS_SQL = text(
+    "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+    "WHERE i.inhparent = 'bot_logs'::regclass AND c.relname ~ '^bot_logs_[0-9]{8}$'"
+)
+_LOG_PARTITION_EXISTS_SQL = text("SELECT to_regclass(:name) IS NOT NULL")
+_WEEK = timedelta(weeks=1)
+
+
+def _dumps_json(value: Any) -> str:
+    """Encode a JSON column value with orjson"""
+    return orjson.dumps(value).decode()
+
 
 class DatabaseService:
     """Main database service"""
 
     def __init__(self, database_url: str = None):
-        self.database_url = database_url or settings.DATABASE_URL
+        self.database_url = database_url or get_settings().DATABASE_URL
         self.engine = None
         self.async_session = None
 
     async def initialize(self):
         """Initialize database connection"""
         try:
-            self.engine = create_async_engine(self.database_url, echo=False)
+            self.engine = create_async_engine(
+                self.database_url,
+                echo=False,
+                json_serializer=_dumps_json,
+                json_deserializer=orjson.loads,
+            )
             self.async_session = sessionmaker(
                 self.engine, class_=AsyncSession, expire_on_commit=False
             )
             logger.info("Database service initialized")
         except Exception as e:
-            logger.error(f"Failed to initialize database: {e}")
+            logger.error("Failed to initialize database: %s", e)
             raise
 
     async def create_tables(self):
@@ -55,12 +93,14 @@ class DatabaseService:
 
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+            # Before any insert, so this week's logs land in their own partition
+            await BotLogService(self).ensure_log_partitions()
             logger.info("Database tables created")
         except Exception as e:
-            logger.error(f"Failed to create tables: {e}")
+            logger.error("Failed to create tables: %s", e)
             raise
 
-    async def get_session(self) -> AsyncSession:
+    def get_session(self) -> AsyncSession:
         """Get database session"""
         return self.async_session()
 
@@ -93,8 +133,7 @@ class UserService:
                 user.last_name = telegram_user.last_name
                 user.language_code = telegram_user.language_code
                 user.is_premium = telegram_user.is_premium
-                user.last_seen = datetime.utcnow()
-                user.updated_at = datetime.utcnow()
+                user.last_seen = epoch_micros_now()
             else:
                 # Create new user
                 user = User(
@@ -105,7 +144,7 @@ class UserService:
                     language_code=telegram_user.language_code,
                     is_bot=telegram_user.is_bot,
                     is_premium=telegram_user.is_premium,
-                    last_seen=datetime.utcnow(),
+                    last_seen=epoch_micros_now(),
                 )
                 session.add(user)
 
@@ -133,7 +172,7 @@ class UserService:
             await session.execute(
                 update(User)
                 .where(User.telegram_id == telegram_id)
-                .values(last_seen=datetime.utcnow(), updated_at=datetime.utcnow())
+                .values(last_seen=epoch_micros_now())
             )
             await session.commit()
 
@@ -170,7 +209,6 @@ class ChatService:
                 chat.first_name = telegram_chat.first_name
                 chat.last_name = telegram_chat.last_name
                 chat.description = telegram_chat.description
-                chat.updated_at = datetime.utcnow()
             else:
                 # Create new chat
                 chat = Chat(
@@ -220,32 +258,57 @@ class MessageService:
     ) -> Message:
         """Save message to database"""
         async with self.db_service.get_session() as session:
-            message = Message(
-                telegram_id=telegram_message.message_id,
-                chat_id=chat_id,
-                user_id=user_id,
-                text=telegram_message.text,
-                caption=telegram_message.caption,
-                message_type=telegram_message.get_message_type().value,
-                media_type=self._get_media_type(telegram_message),
-                file_id=self._get_file_id(telegram_message),
-                reply_to_message_id=(
-                    telegram_message.reply_to_message.message_id
-                    if telegram_message.reply_to_message
-                    else None
-                ),
-                entities=(
-                    self._serialize_entities(telegram_message.entities)
-                    if telegram_message.entities
-                    else None
-                ),
-                metadata=self._extract_metadata(telegram_message),
-            )
+            message = Message(**self._message_row(telegram_message, user_id, chat_id))
             session.add(message)
             await session.commit()
             await session.refresh(message)
             return message
 
+    async def save_messages(
+        self, messages: Iterable[Tuple[TelegramMessage, int, int]]
+    ) -> None:
+        """Bulk insert (message, user_id, chat_id) tuples, skipping duplicates"""
+        rows = [self._message_row(*item) for item in messages]
+        if not rows:
+            return
+        async with self.db_service.get_session() as session:
+            insert_ = _DIALECT_INSERTS.get(self.db_service.engine.dialect.name)
+            if insert_ is None:
+                stmt = insert(Message)
+            else:
+                stmt = insert_(Message).on_conflict_do_nothing(
+                    index_elements=["chat_id", "telegram_id"]
+                )
+            # executemany: the driver batches rows into multi-row VALUES
+            await session.execute(stmt, rows)
+            await session.commit()
+
+    def _message_row(
+        self, telegram_message: TelegramMessage, user_id: int, chat_id: int
+    ) -> Dict[str, Any]:
+        """Build Message column values from a Telegram message"""
+        return {
+            "telegram_id": telegram_message.message_id,
+            "chat_id": chat_id,
+            "user_id": user_id,
+            "text": telegram_message.text,
+            "caption": telegram_message.caption,
+            "message_type": telegram_message.get_message_type().value,
+            "media_type": self._get_media_type(telegram_message),
+            "file_id": self._get_file_id(telegram_message),
+            "reply_to_message_id": (
+                telegram_message.reply_to_message.message_id
+                if telegram_message.reply_to_message
+                else None
+            ),
+            "entities": (
+                self._serialize_entities(telegram_message.entities)
+                if telegram_message.entities
+                else None
+            ),
+            "extra_metadata": self._extract_metadata(telegram_message),
+        }
+
     async def get_message_by_telegram_id(
         self, telegram_id: int, chat_id: int
     ) -> Optional[Message]:
@@ -305,7 +368,10 @@ class MessageService:
 
     def _get_file_id(self, message: TelegramMessage) -> Optional[str]:
         """Extract file ID from message"""
-        media = getattr(message, self._get_media_type(message), None)
+        media_type = self._get_media_type(message)
+        if media_type is None:
+            return None
+        media = getattr(message, media_type, None)
         if media and hasattr(media, "file_id"):
             return media.file_id
         return None
@@ -380,7 +446,6 @@ class ChatMemberService:
                 member.can_change_info = kwargs.get("can_change_info", False)
                 member.can_invite_users = kwargs.get("can_invite_users", False)
                 member.can_pin_messages = kwargs.get("can_pin_messages", False)
-                member.updated_at = datetime.utcnow()
 
                 # Handle status changes
                 if status == "left" and member.joined_at:
@@ -471,6 +536,30 @@ class BotLogService:
             session.add(log_entry)
             await session.commit()
 
+    async def copy_logs(self, entries: Iterable[Tuple]) -> None:
+        """Bulk load (level, message, user_id, chat_id, update_type, extra_data) tuples"""
+        engine = self.db_service.engine
+        if engine.dialect.driver == "asyncpg":
+            records = []
+            for *columns, extra_data in entries:
+                if extra_data is not None:
+                    extra_data = _dumps_json(extra_data)
+                records.append((*columns, extra_data))
+            async with engine.connect() as conn:
+                raw = await conn.get_raw_connection()
+                # COPY FROM STDIN (binary); runs outside the ORM in autocommit
+                await raw.driver_connection.copy_records_to_table(
+                    BotLog.__tablename__,
+                    records=records,
+                    columns=_BOT_LOG_COPY_COLUMNS,
+                )
+            return
+        rows = [dict(zip(_BOT_LOG_COPY_COLUMNS, entry)) for entry in entries]
+        if rows:
+            async with self.db_service.get_session() as session:
+                await session.execute(insert(BotLog), rows)
+                await session.commit()
+
     async def get_logs(
         self, level: Optional[str] = None, limit: int = 100, offset: int = 0
     ) -> List[BotLog]:
@@ -485,9 +574,78 @@ class BotLogService:
             result = await session.execute(query)
             return result.scalars().all()
 
+    async def ensure_log_partitions(self, weeks_ahead: int = 2):
+        """Create weekly bot_logs partitions from this week through weeks_ahead
+
+        Rows already in bot_logs_default for a new week are moved into it, since
+        Postgres refuses to add a partition whose range the default still holds.
+        """
+        engine = self.db_service.engine
+        if engine.dialect.name != "postgresql":
+            return
+        today = datetime.utcnow().date()
+        week_start = datetime.combine(
+            today - timedelta(days=today.weekday()), datetime.min.time()
+        )
+        to_micros = EpochMicros().process_bind_param
+        async with engine.begin() as conn:
+            for week in range(weeks_ahead + 1):
+                start = week_start + week * _WEEK
+                name = f"{_LOG_PARTITION_PREFIX}{start:%Y%m%d}"
+                exists = await conn.scalar(_LOG_PARTITION_EXISTS_SQL, {"name": name})
+                if exists:
+                    continue
+                low, high = to_micros(start, None), to_micros(start + _WEEK, None)
+                in_range = f"created_at >= {low} AND created_at < {high}"
+                stranded = await conn.scalar(
+                    text(
+                        f"SELECT EXISTS (SELECT 1 FROM bot_logs_default WHERE {in_range})"
+                    )
+                )
+                if stranded:
+                    await conn.execute(
+                        text("ALTER TABLE bot_logs DETACH PARTITION bot_logs_default")
+                    )
+                await conn.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF bot_logs "
+                        f"FOR VALUES FROM ({low}) TO ({high})"
+                    )
+                )
+                if stranded:
+                    await conn.execute(
+                        text(
+                            f"INSERT INTO {name} SELECT * FROM bot_logs_default WHERE {in_range}"
+                        )
+                    )
+                    await conn.execute(
+                        text(f"DELETE FROM bot_logs_default WHERE {in_range}")
+                    )
+                    await conn.execute(
+                        text(
+                            "ALTER TABLE bot_logs ATTACH PARTITION bot_logs_default DEFAULT"
+                        )
+                    )
+
     async def cleanup_old_logs(self, days: int = 30):
         """Clean up old logs"""
         cutoff_date = datetime.utcnow() - timedelta(days=days)
+        engine = self.db_service.engine
+        if engine.dialect.name == "postgresql":
+            # Log cleanup is the periodic maintenance job, so it also keeps the
+            # weekly partitions ahead of the clock
+            await self.ensure_log_partitions()
+            # Whole weeks past the cutoff are dropped instead of deleted row by row
+            async with engine.begin() as conn:
+                partitions = (await conn.execute(_LOG_PARTITIONS_SQL)).scalars().all()
+                for name in partitions:
+                    start = datetime.strptime(
+                        name[len(_LOG_PARTITION_PREFIX) :], "%Y%m%d"
+                    )
+                    if start + _WEEK <= cutoff_date:
+                        await conn.execute(text(f"DROP TABLE {name}"))
+        # Through the parent table, so this also clears old rows that landed in
+        # bot_logs_default or in partitions straddling the cutoff
         async with self.db_service.get_session() as session:
             await session.execute(delete(BotLog).where(BotLog.created_at < cutoff_date))
             await session.commit()
@@ -499,8 +657,29 @@ class BotStatsService:
     def __init__(self, db_service: DatabaseService):
         self.db_service = db_service
 
+    async def refresh_stats(self):
+        """Recompute daily statistics"""
+        engine = self.db_service.engine
+        if engine.dialect.name != "postgresql":
+            await self.update_daily_stats()
+            return
+        # Readers keep seeing the previous snapshot while the view rebuilds
+        async with engine.begin() as conn:
+            await conn.execute(
+                text("REFRESH MATERIALIZED VIEW CONCURRENTLY bot_daily_stats")
+            )
+
+    async def run_stats_refresher(self, interval: float = 60.0):
+        """Refresh daily statistics every interval seconds until cancelled"""
+        while True:
+            try:
+                await self.refresh_stats()
+            except Exception as e:
+                logger.error("Failed to refresh stats: %s", e)
+            await asyncio.sleep(interval)
+
     async def update_daily_stats(self, date: datetime = None):
-        """Update daily statistics"""
+        """Update daily statistics in bot_stats (used by refresh_stats off Postgres)"""
         if date is None:
             date = datetime.utcnow().date()
 
@@ -566,7 +745,6 @@ class BotStatsService:
                 stats.messages_sent = messages_sent.scalar()
                 stats.commands_used = commands_used.scalar()
                 stats.errors_count = errors_count.scalar()
-                stats.updated_at = datetime.utcnow()
             else:
                 # Create new stats
                 stats = BotStats(
@@ -583,10 +761,21 @@ class BotStatsService:
 
             await session.commit()
 
-    async def get_stats(self, days: int = 30) -> List[BotStats]:
-        """Get statistics for last N days"""
+    async def get_stats(self, days: int = 30) -> List[Any]:
+        """Get statistics for last N days
+
+        On Postgres these are rows of the bot_daily_stats materialized view,
+        elsewhere BotStats instances; both expose the same metric attributes.
+        """
         start_date = datetime.utcnow().date() - timedelta(days=days)
         async with self.db_service.get_session() as session:
+            if self.db_service.engine.dialect.name == "postgresql":
+                result = await session.execute(
+                    select(bot_daily_stats)
+                    .where(bot_daily_stats.c.date >= start_date)
+                    .order_by(bot_daily_stats.c.date.desc())
+                )
+                return result.all()
             result = await session.execute(
                 select(BotStats)
                 .where(BotStats.date >= start_date)
@@ -3,6 +3,7 @@ Memory integration service using Mem0 AI
 Provides persistent memory for Telegram bot conversations
 """
 
+import asyncio
 import os
 from typing import List, Dict, Any, Optional
 from mem0 import MemoryClient
@@ -145,29 +146,57 @@ class MemoryService:
 class ConversationMemory:
     """Helper class for managing conversation memory"""
     
-    def __init__(self, memory_service: MemoryService):
+    def __init__(
+        self,
+        memory_service: MemoryService,
+        batch_size: int = 50,
+        flush_interval: float = 0.2
+    ):
         self.memory_service = memory_service
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
         self.conversation_buffer = {}
+        self._flush_timers: Dict[str, asyncio.Task] = {}
     
     async def add_message(self, user_id: str, message: TelegramMessage):
         """Add message to conversation buffer"""
-        if user_id not in self.conversation_buffer:
-            self.conversation_buffer[user_id] = []
+        buffer = self.conversation_buffer.get(user_id)
+        if buffer is None:
+            buffer = self.conversation_buffer[user_id] = []
+        if user_id not in self._flush_timers:
+            self._flush_timers[user_id] = asyncio.create_task(self._flush_later(user_id))
         
-        self.conversation_buffer[user_id].append(message)
+        buffer.append(message)
         
-        # Add to memory every 5 messages or when conversation ends
-        if len(self.conversation_buffer[user_id]) >= 5:
+        # Add to memory in one request per batch_size messages or flush_interval
+        if len(buffer) >= self.batch_size:
             await self.flush_conversation(user_id)
     
     async def flush_conversation(self, user_id: str):
         """Flush conversation buffer to memory"""
-        if user_id in self.conversation_buffer and self.conversation_buffer[user_id]:
-            await self.memory_service.add_telegram_conversation(
-                self.conversation_buffer[user_id], 
-                user_id
-            )
-            self.conversation_buffer[user_id] = []
+        timer = self._flush_timers.pop(user_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        
+        # Swap the buffer out first so messages added during the request are kept
+        messages = self.conversation_buffer.pop(user_id, None)
+        if messages:
+            try:
+                await self.memory_service.add_telegram_conversation(messages, user_id)
+            except Exception:
+                # Put the batch back ahead of newer messages; the next message
+                # restarts the timer and retries
+                newer = self.conversation_buffer.get(user_id) or []
+                self.conversation_buffer[user_id] = messages + newer
+                raise
+    
+    async def _flush_later(self, user_id: str):
+        """Flush a user's buffer once flush_interval has passed"""
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush_conversation(user_id)
+        except Exception as e:
+            logger.error("Failed to flush conversation memory", user_id=user_id, error=str(e))
     
     async def get_context(self, user_id: str, query: str = None) -> str:
         """Get conversation context for user"""
@@ -503,7 +503,7 @@ async def safe_send_message(
         result = await api_service.send_message(chat_id, text, **kwargs)
         return result is not None
     except Exception as e:
-        logger.error(f"Failed to send message to {chat_id}: {e}")
+        logger.error("Failed to send message to %s: %s", chat_id, e)
         return False
 
 
@@ -517,7 +517,7 @@ async def safe_edit_message(
         )
         return result is not None
     except Exception as e:
-        logger.error(f"Failed to edit message {message_id} in {chat_id}: {e}")
+        logger.error("Failed to edit message %s in %s: %s", message_id, chat_id, e)
         return False
 
 
@@ -6,18 +6,30 @@ Tests all major components and functionality.
 
 import pytest
 import asyncio
+import sys
+import logging
+import orjson
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
 from typing import Dict, Any
+import telegram
+from telegram.ext import Application, ApplicationHandlerStop, PollHandler, TypeHandler
 
 # Import all components to test
-from telegram_api.core import TelegramBot, BotConfig, BotMode, WebhookManager, UpdateProcessor
-from telegram_api.models.telegram_models import TelegramUser, TelegramChat, TelegramMessage, TelegramUpdate
-from telegram_api.services.api_service import TelegramAPIService
-from telegram_api.handlers import MessageHandler, CommandHandler, CallbackHandler
+from telegram_api.core import TelegramBot, BotConfig, BotMode, BotStatus, WebhookManager, UpdateKind, UpdateProcessor, ChatOrderedUpdateProcessor, _RECOMPILE_INTERVAL
+from telegram_api.models.database_models import Base, ChatMember, Message, dumps_models, select_rows
+from telegram_api.models.telegram_models import ChatType, MessageType, TelegramUser, TelegramChat, TelegramMessage, TelegramUpdate, TelegramUpdateBatch, decode_update
+from telegram_api.services.api_service import BatchingSender, TelegramAPIService, TokenBucket
+from telegram_api.services.database_service import BotLogService, DatabaseService, MessageService
+from telegram_api.handlers import BaseHandler, MessageHandler, CommandHandler, CallbackHandler, HandlerFactory, TokenBucketFilter, cpu_bound
 from telegram_api.utils import KeyboardBuilder, MessageFormatter, Validators
 from telegram_api.exceptions import TelegramAPIError, ValidationError
 
+@cpu_bound
+def upper_args(update, args):
+    """CPU bound command used by the handler tests"""
+    return args.upper()
+
 class TestTelegramModels:
     """Test Telegram data models"""
     
@@ -49,6 +61,21 @@ class TestTelegramModels:
         assert isinstance(user_dict, dict)
         assert user_dict["id"] == 12345
         assert user_dict["first_name"] == "John"
+        assert user == TelegramUser(id=12345, is_bot=False, first_name="John")
+    
+    def test_to_dict_cache_invalidated(self):
+        """Test cached dicts follow field changes and are not shared with callers"""
+        user = TelegramUser(id=12345, is_bot=False, first_name="John")
+        user.to_dict()["first_name"] = "Mallory"
+        assert user.to_dict()["first_name"] == "John"
+        
+        user.first_name = "Jane"
+        assert user.to_dict()["first_name"] == "Jane"
+        
+        chat = TelegramChat(id=67890, type=ChatType.GROUP, title="Old")
+        assert chat.to_dict()["title"] == "Old"
+        chat.title = "New"
+        assert chat.to_dict()["title"] == "New"
     
     def test_telegram_chat_creation(self):
         """Test TelegramChat model creation"""
@@ -79,6 +106,207 @@ class TestTelegramModels:
         assert message.text == "Hello, World!"
         assert message.chat == chat
         assert message.from_user == user
+        
+        edited = TelegramMessage(message_id=1, date=datetime.utcnow(), chat=chat, text="Edited")
+        assert message == edited
+        assert len({message, edited}) == 1
+    
+    def test_telegram_message_to_json(self):
+        """Test TelegramMessage JSON encoding"""
+        chat = TelegramChat(id=67890, type=ChatType.PRIVATE)
+        message = TelegramMessage(
+            message_id=1,
+            date=datetime(2024, 1, 1, 12, 0),
+            chat=chat,
+            text="Hello"
+        )
+        
+        data = orjson.loads(message.to_json())
+        assert data["date"] == "2024-01-01T12:00:00"
+        assert data["chat"]["type"] == "private"
+        assert data["text"] == "Hello"
+        assert "_cached_dict" not in data["chat"]
+    
+    def test_update_batch_columns(self):
+        """Test TelegramUpdateBatch column extraction"""
+        chat = telegram.Chat(67890, "private")
+        user = telegram.User(12345, "John", False)
+        updates = [
+            telegram.Update(1, message=telegram.Message(1, datetime.utcnow(), chat, from_user=user, text="hi")),
+            telegram.Update(2),
+        ]
+        
+        batch = TelegramUpdateBatch.from_telegram_updates(updates)
+        assert len(batch) == 2
+        assert list(batch.update_ids) == [1, 2]
+        assert list(batch.chat_ids) == [67890, 0]
+        assert batch.texts == ["hi", None]
+        assert batch.row(0).message.from_user.first_name == "John"
+    
+    def test_message_extras_properties(self):
+        """Test rare payloads are kept in the extras bag"""
+        chat = TelegramChat(id=67890, type=ChatType.PRIVATE)
+        message = TelegramMessage(message_id=1, date=datetime.utcnow(), chat=chat, extras={"photo": [{"file_id": "a"}]})
+        
+        assert message.photo == [{"file_id": "a"}]
+        assert message.invoice is None
+        assert message.get_message_type() == MessageType.PHOTO
+        message.venue = {"title": "Cafe"}
+        assert message.extras["venue"] == {"title": "Cafe"}
+    
+    def test_reply_to_message_hydrated_lazily(self):
+        """Test nested messages are converted on first access"""
+        chat = telegram.Chat(67890, "private")
+        original = telegram.Message(1, datetime.utcnow(), chat, text="first")
+        reply = telegram.Message(2, datetime.utcnow(), chat, text="second", reply_to_message=original)
+        
+        message = TelegramMessage.from_telegram_message(reply)
+        assert message.reply_to_message.text == "first"
+        assert message.reply_to_message is message.reply_to_message
+        assert message.forward_from is None
+    
+    def test_decode_update(self):
+        """Test decoding a raw webhook payload"""
+        update = decode_update(
+            b'{"update_id": 7, "message": {"message_id": 1, "date": 1700000000,'
+            b' "chat": {"id": 5, "type": "private"},'
+            b' "from": {"id": 5, "is_bot": false, "first_name": "John"}, "text": "hi"}}'
+        )
+        
+        assert update.update_id == 7
+        assert update.message.from_user.first_name == "John"
+        assert update.message.text == "hi"
+
+class TestArrowIO:
+    """Test Arrow export of updates"""
+    
+    def test_stream_round_trip(self):
+        """Test updates survive an IPC stream, with nulls for non-message updates"""
+        pa = pytest.importorskip("pyarrow")
+        import io
+        from telegram_api.models.arrow_io import UPDATE_SCHEMA, write_update_stream
+        
+        message = TelegramMessage(
+            message_id=1,
+            date=datetime(2024, 1, 2, 3, 4, 5),
+            chat=TelegramChat(id=67890, type=ChatType.PRIVATE),
+            from_user=TelegramUser(id=12345, is_bot=False, first_name="John"),
+            text="Hello, bot!"
+        )
+        batches = [
+            [TelegramUpdate(update_id=1, message=message)],
+            [TelegramUpdate(update_id=2, callback_query={"id": "1"})],
+        ]
+        sink = io.BytesIO()
+        write_update_stream(sink, batches)
+        
+        table = pa.ipc.open_stream(sink.getvalue()).read_all()
+        assert table.schema.equals(UPDATE_SCHEMA)
+        rows = table.to_pylist()
+        assert rows[0]["update_id"] == 1
+        assert rows[0]["update_type"] == "message"
+        assert rows[0]["chat_id"] == 67890
+        assert rows[0]["chat_type"] == "private"
+        assert rows[0]["user_id"] == 12345
+        assert rows[0]["date"].replace(tzinfo=None) == datetime(2024, 1, 2, 3, 4, 5)
+        assert rows[0]["text"] == "Hello, bot!"
+        assert rows[1]["update_type"] == "callback_query"
+        assert [rows[1][name] for name in ("chat_id", "chat_type", "user_id", "date", "text")] == [None] * 5
+
+class TestDatabaseModels:
+    """Test database model serialization"""
+    
+    def test_message_to_dict(self):
+        """Test the metadata column and timestamp formatting"""
+        created = datetime(2024, 1, 2, 3, 4, 5, 6)
+        message = Message(
+            id=1,
+            telegram_id=2,
+            chat_id=3,
+            message_type="text",
+            extra_metadata={"source": "test"},
+            created_at=created
+        )
+        
+        data = message.to_dict()
+        assert data["metadata"] == {"source": "test"}
+        assert data["created_at"] == "2024-01-02T03:04:05.000006"
+        assert data["updated_at"] is None
+        assert Message.__table__.c.metadata.name == "metadata"
+    
+    def test_chat_member_permission_bits(self):
+        """Test permission flags packed into one column"""
+        member = ChatMember(
+            chat_id=1, user_id=2, status="administrator",
+            can_manage_chat=True, can_pin_messages=True
+        )
+        member.can_pin_messages = False
+        member.can_manage_topics = True
+        
+        assert member.permissions == (1 << 1) | (1 << 11)
+        assert member.can_manage_chat is True
+        assert member.can_pin_messages is False
+        data = member.to_dict()
+        assert data["can_manage_chat"] is True
+        assert data["can_manage_topics"] is True
+        assert data["can_be_edited"] is False
+        assert "permissions" not in data
+    
+    def test_rows_to_dicts(self):
+        """Test batch serialization matches per-row to_dict"""
+        members = [
+            ChatMember(id=i, chat_id=1, user_id=i, status="member", can_invite_users=True)
+            for i in range(3)
+        ]
+        
+        assert ChatMember.rows_to_dicts(members) == [m.to_dict() for m in members]
+        assert ChatMember.rows_to_dicts([]) == []
+    
+    def test_dumps_models(self):
+        """Test orjson encoding of models matches to_dict"""
+        import orjson
+        
+        message = Message(
+            id=1, telegram_id=2, chat_id=3, message_type="text",
+            created_at=datetime(2024, 1, 2, 3, 4, 5)
+        )
+        
+        assert orjson.loads(dumps_models({"items": [message]})) == {"items": [message.to_dict()]}
+        with pytest.raises(TypeError):
+            dumps_models(object())
+    
+    def test_select_rows(self):
+        """Test Core rows serialize like ORM instances"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(ChatMember(chat_id=1, user_id=2, status="member", can_pin_messages=True))
+            session.commit()
+            
+            rows = session.execute(select_rows(ChatMember, ChatMember.can_pin_messages)).all()
+            member = session.get(ChatMember, rows[0].id)
+            
+            assert ChatMember.rows_to_dicts(rows) == [member.to_dict()]
+    
+    def test_last_seen_database_clock(self):
+        """Test last_seen is written from the database clock like updated_at"""
+        from sqlalchemy import create_engine, update
+        from sqlalchemy.orm import Session
+        from telegram_api.models.database_models import User, epoch_micros_now
+        
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as session:
+            session.add(User(telegram_id=1, first_name="John", last_seen=epoch_micros_now()))
+            session.commit()
+            session.execute(update(User).values(last_seen=epoch_micros_now()))
+            user = session.get(User, 1)
+            
+            assert abs(user.last_seen - datetime.utcnow()).total_seconds() < 5
+            assert user.updated_at is not None
 
 class TestBotConfig:
     """Test bot configuration"""
@@ -300,6 +528,64 @@ class TestMessageHandler:
         
         # Verify API service was called
         mock_api_service.send_message.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_middleware_chain(self, message_handler, mock_api_service):
+        """Test middleware runs in order and can block messages"""
+        calls = []
+        
+        async def first(update, context):
+            calls.append("first")
+        
+        async def block(update, context):
+            calls.append("block")
+            return False
+        
+        message_handler.add_middleware(first)
+        message_handler.add_middleware(block)
+        
+        telegram_update = TelegramUpdate(
+            update_id=1,
+            message=TelegramMessage(
+                message_id=1,
+                date=datetime.utcnow(),
+                chat=TelegramChat(id=67890, type="private"),
+                from_user=TelegramUser(id=12345, is_bot=False, first_name="John"),
+                text="Hello, bot!"
+            )
+        )
+        
+        result = await message_handler.handle(telegram_update, Mock())
+        assert result is False
+        assert calls == ["first", "block"]
+        mock_api_service.send_message.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_middleware_error_skipped(self, message_handler, mock_api_service):
+        """Test a failing middleware is skipped and handler errors are not blamed on it"""
+        async def broken(update, context):
+            raise RuntimeError("boom")
+        
+        message_handler.add_middleware(broken)
+        
+        telegram_update = TelegramUpdate(
+            update_id=1,
+            message=TelegramMessage(
+                message_id=1,
+                date=datetime.utcnow(),
+                chat=TelegramChat(id=67890, type="private"),
+                from_user=TelegramUser(id=12345, is_bot=False, first_name="John"),
+                text="Hello, bot!"
+            )
+        )
+        
+        result = await message_handler.handle(telegram_update, Mock())
+        assert result is True
+        mock_api_service.send_message.assert_called_once()
+        
+        mock_api_service.send_message.side_effect = RuntimeError("send failed")
+        with pytest.raises(RuntimeError, match="send failed"):
+            await message_handler.handle(telegram_update, Mock())
 
 class TestCommandHandler:
     """Test command handler"""
@@ -363,6 +649,719 @@ class TestCommandHandler:
         
         # Verify command was executed
         mock_api_service.send_message.assert_called_once_with(67890, "Command executed")
+    
+    @pytest.mark.asyncio
+    async def test_cpu_bound_command(self, command_handler, mock_api_service):
+        """Test CPU bound commands run in the executor and reply with their result"""
+        command_handler.register_command("upper", upper_args)
+        
+        telegram_update = TelegramUpdate(
+            update_id=1,
+            message=TelegramMessage(
+                message_id=1,
+                date=datetime.utcnow(),
+                chat=TelegramChat(id=67890, type=ChatType.PRIVATE),
+                from_user=TelegramUser(id=12345, is_bot=False, first_name="John"),
+                text="/upper hello"
+            )
+        )
+        
+        result = await command_handler.handle(telegram_update, Mock())
+        assert result is True
+        mock_api_service.send_message.assert_called_once_with(67890, "HELLO")
+
+class TestCallbackHandler:
+    """Test callback query handler"""
+    
+    @pytest.fixture
+    def callback_handler(self):
+        """Create callback handler instance"""
+        return CallbackHandler(Mock(), AsyncMock())
+    
+    @pytest.fixture
+    def make_update(self):
+        """Build a mock update carrying callback data"""
+        def make(data):
+            update = Mock()
+            update.callback_query.data = data
+            update.callback_query.answer = AsyncMock()
+            return update
+        return make
+    
+    @pytest.mark.asyncio
+    async def test_pattern_dispatch(self, callback_handler, make_update):
+        """Test callback data is routed to the matching pattern"""
+        calls = []
+        
+        async def menu(update, context):
+            calls.append("menu")
+        
+        async def menu_item(update, context):
+            calls.append("menu_item")
+        
+        callback_handler.register_callback("menu", menu)
+        callback_handler.register_callback("item", menu_item)
+        
+        assert await callback_handler.handle(make_update("menu:1"), Mock()) is True
+        assert await callback_handler.handle(make_update("buy_item"), Mock()) is True
+        assert calls == ["menu", "menu_item"]
+    
+    @pytest.mark.asyncio
+    async def test_registration_order_wins(self, callback_handler, make_update):
+        """Test the first registered pattern occurring anywhere in the data wins"""
+        calls = []
+        
+        def record(name):
+            async def handler(update, context):
+                calls.append(name)
+            return handler
+        
+        callback_handler.register_callback("item", record("item"))
+        callback_handler.register_callback("menu", record("menu"))
+        callback_handler.register_callback("me", record("me"))
+        callback_handler.register_callback("enu", record("enu"))
+        
+        await callback_handler.handle(make_update("menu:item"), Mock())
+        await callback_handler.handle(make_update("menu"), Mock())
+        await callback_handler.handle(make_update("xenu"), Mock())
+        assert calls == ["item", "menu", "enu"]
+    
+    @pytest.mark.asyncio
+    async def test_failing_callback_falls_through(self, callback_handler, make_update):
+        """Test a raising handler hands the update to the next matching pattern"""
+        calls = []
+        
+        async def broken(update, context):
+            raise RuntimeError("boom")
+        
+        async def item(update, context):
+            calls.append("item")
+        
+        callback_handler.register_callback("menu", broken)
+        callback_handler.register_callback("other", AsyncMock())
+        callback_handler.register_callback("item", item)
+        update = make_update("menu_item")
+        
+        assert await callback_handler.handle(update, Mock()) is True
+        assert calls == ["item"]
+        update.callback_query.answer.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_unknown_callback(self, callback_handler, make_update):
+        """Test unmatched callback data gets the default answer"""
+        callback_handler.register_callback("menu", AsyncMock())
+        update = make_update("other")
+        
+        assert await callback_handler.handle(update, Mock()) is True
+        update.callback_query.answer.assert_called_once_with("Unknown action")
+
+class TestTokenBucketFilter:
+    """Test error log sampling"""
+    
+    def test_error_burst_limited(self):
+        """Test error records beyond the burst are dropped"""
+        sampler = TokenBucketFilter(rate=0.001, burst=3)
+        
+        def record(level):
+            return logging.makeLogRecord({"name": "test", "msg": "error %s", "levelno": level})
+        
+        results = [sampler.filter(record(logging.ERROR)) for _ in range(5)]
+        assert results == [True, True, True, False, False]
+        assert sampler.filter(record(logging.INFO)) is True
+
+class TestHandlerFactory:
+    """Test handler factory"""
+    
+    @pytest.fixture
+    def factory(self):
+        """Create handler factory instance"""
+        factory = HandlerFactory(Mock(), AsyncMock())
+        yield factory
+        factory.close()
+    
+    def test_lazy_handlers(self, factory):
+        """Test handlers are created on first use and reused"""
+        assert factory.handlers == {}
+        
+        handler = factory.get_handler("message")
+        assert isinstance(handler, MessageHandler)
+        assert factory.get_handler("message") is handler
+        assert list(factory.handlers) == ["message"]
+    
+    @pytest.mark.asyncio
+    async def test_process_pool_started_lazily(self, factory):
+        """Test worker processes only start on the first cpu_bound command"""
+        handler = factory.get_handler("command")
+        assert factory.process_pool._pool is None
+        
+        handler.register_command("upper", upper_args)
+        telegram_update = TelegramUpdate(
+            update_id=1,
+            message=TelegramMessage(
+                message_id=1,
+                date=datetime.utcnow(),
+                chat=TelegramChat(id=67890, type=ChatType.PRIVATE),
+                from_user=TelegramUser(id=12345, is_bot=False, first_name="John"),
+                text="/upper hello"
+            )
+        )
+        
+        assert await handler.handle(telegram_update, Mock()) is True
+        assert factory.process_pool._pool is not None
+        
+        factory.close()
+        assert factory.process_pool._pool is None
+    
+    def test_register_handler_class(self, factory):
+        """Test third-party handler classes can be registered"""
+        class EchoHandler(BaseHandler):
+            async def handle(self, update, context):
+                return True
+        
+        factory.register_handler_class("echo", EchoHandler)
+        assert isinstance(factory.get_handler("echo"), EchoHandler)
+        
+        with pytest.raises(TypeError):
+            factory.register_handler_class("bad", object)
+        with pytest.raises(ValueError):
+            factory.create_handler("unknown")
+
+class TestTokenBucket:
+    """Test the API rate limiter"""
+    
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        """Test a burst passes immediately and the next call waits for a refill"""
+        bucket = TokenBucket(capacity=3, refill_rate=20)
+        loop = asyncio.get_running_loop()
+        
+        start = loop.time()
+        for _ in range(3):
+            await bucket.acquire()
+        assert loop.time() - start < 0.02
+        
+        await bucket.acquire()
+        assert loop.time() - start >= 0.04
+    
+    def test_chat_buckets_bounded(self):
+        """Test idle chats' buckets are dropped once over the limit, busy ones kept"""
+        service = TelegramAPIService(AsyncMock())
+        service.CHAT_BUCKETS_MAX = 2
+        
+        service._chat_bucket(1).reserve()
+        service._chat_bucket(2)
+        service._chat_bucket(3)
+        assert list(service._chat_buckets) == [1, 2, 3]
+        
+        service._chat_bucket(1)
+        service._chat_bucket(4)
+        assert list(service._chat_buckets) == [1, 4]
+
+class TestTelegramAPIService:
+    """Test the Bot API wrapper service"""
+    
+    @pytest.mark.asyncio
+    async def test_reads_use_read_pool(self):
+        """Test get_* calls go to the read bot and sends to the main bot"""
+        bot, read_bot = AsyncMock(), AsyncMock()
+        service = TelegramAPIService(bot, read_bot=read_bot)
+        
+        assert await service.leave_chat(1) is True
+        await service.get_chat_member_count(1)
+        
+        bot.leave_chat.assert_awaited_once_with(chat_id=1)
+        read_bot.get_chat_member_count.assert_awaited_once_with(chat_id=1)
+        bot.get_chat_member_count.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_create_closes_pools_on_shutdown(self):
+        """Test both connection pools opened by create() are closed by shutdown()"""
+        with patch.object(telegram.Bot, "get_me", AsyncMock()):
+            service = await TelegramAPIService.create("123:abc")
+        requests = [service.bot.request, service.read_bot.request]
+        assert not any(request._client.is_closed for request in requests)
+        
+        await service.shutdown()
+        assert all(request._client.is_closed for request in requests)
+    
+    @pytest.mark.asyncio
+    async def test_failures_logged_with_default(self):
+        """Test a failing Bot call is logged and returns the method's default"""
+        bot = AsyncMock()
+        bot.leave_chat.side_effect = RuntimeError("boom")
+        bot.send_message.side_effect = RuntimeError("boom")
+        service = TelegramAPIService(bot)
+        service.logger = Mock()
+        
+        assert await service.leave_chat(42) is False
+        bot.unpin_chat_message.side_effect = RuntimeError("boom")
+        assert await service.unpin_chat_message(42) is False
+        assert await service.send_message(42, "hi") is None
+        service.logger.error.assert_called_with(
+            "Failed to %s: %s", "send message to 42", bot.send_message.side_effect
+        )
+        await service.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_send_retried_after_429(self):
+        """Test a rate-limited send is requeued and retried after the cooldown"""
+        bot = AsyncMock()
+        bot.send_chat_action.side_effect = [telegram.error.RetryAfter(0), True]
+        service = TelegramAPIService(bot)
+        
+        assert await service.send_chat_action(42, "typing") is True
+        assert bot.send_chat_action.await_count == 2
+        await service.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_busy_chat_does_not_block_others(self):
+        """Test a chat over its limit waits without holding up other chats"""
+        service = TelegramAPIService(AsyncMock())
+        service.SEND_WORKERS = 1
+        service.CHAT_BURST = 1
+        
+        def send(chat_id):
+            return asyncio.create_task(
+                service._call("send_message", per_chat=True, chat_id=chat_id, text="hi")
+            )
+        
+        await send(1)
+        blocked = send(1)
+        await asyncio.wait_for(send(2), 1)
+        assert not blocked.done()
+        
+        await service.shutdown()
+        with pytest.raises(TelegramAPIError):
+            await blocked
+    
+    @pytest.mark.asyncio
+    async def test_queue_send_message_flush(self):
+        """Test queued messages are only sent on flush and resolve their futures"""
+        service = TelegramAPIService(AsyncMock())
+        service.send_message = AsyncMock(side_effect=lambda **kw: kw["text"])
+        
+        futures = [service.queue_send_message(1, text) for text in ("a", "b")]
+        service.send_message.assert_not_called()
+        
+        await service.flush()
+        assert [future.result() for future in futures] == ["a", "b"]
+        assert service.send_message.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_flush_resolves_every_future(self):
+        """Test queued sends resolve even when a send fails or flush is cancelled"""
+        service = TelegramAPIService(AsyncMock())
+        service.send_message = AsyncMock(side_effect=[RuntimeError("boom"), "b"])
+        futures = [service.queue_send_message(1, text) for text in ("a", "b")]
+        
+        await service.flush()
+        assert isinstance(futures[0].exception(), RuntimeError)
+        assert futures[1].result() == "b"
+        
+        async def never_sent(**kwargs):
+            await asyncio.Event().wait()
+        
+        service.send_message = never_sent
+        future = service.queue_send_message(1, "c")
+        flush = asyncio.create_task(service.flush())
+        await asyncio.sleep(0.01)
+        flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
+        assert future.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_get_chat_cached_until_changed(self):
+        """Test get_chat hits the API once until the chat is modified"""
+        bot = AsyncMock()
+        bot.get_chat.return_value = telegram.Chat(id=1, type="group", title="Old")
+        service = TelegramAPIService(bot)
+        
+        assert (await service.get_chat(1)).title == "Old"
+        await service.get_chat(1)
+        assert bot.get_chat.await_count == 1
+        
+        await service.set_chat_title(1, "New")
+        await service.get_chat(1)
+        assert bot.get_chat.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_cached_lookups_not_shared(self):
+        """Test callers get copies of cached chats and members"""
+        bot = AsyncMock()
+        bot.get_chat.return_value = telegram.Chat(id=1, type="group", title="Old")
+        bot.get_chat_member.return_value = telegram.ChatMemberMember(
+            telegram.User(id=2, is_bot=False, first_name="John")
+        )
+        service = TelegramAPIService(bot)
+        
+        (await service.get_chat(1)).title = "Changed"
+        assert (await service.get_chat(1)).title == "Old"
+        
+        member = await service.get_chat_member(1, 2)
+        member["status"] = "administrator"
+        member["user"]["first_name"] = "Mallory"
+        member = await service.get_chat_member(1, 2)
+        assert member["status"] == "member"
+        assert member["user"]["first_name"] == "John"
+        assert bot.get_chat_member.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_chat_cache_keyed_by_id(self):
+        """Test @username lookups share and invalidate the numeric id entry"""
+        bot = AsyncMock()
+        bot.get_chat.return_value = telegram.Chat(id=-100, type="supergroup", username="Group")
+        service = TelegramAPIService(bot)
+        
+        await service.get_chat("@group")
+        await service.get_chat(-100)
+        await service.get_chat("-100")
+        assert bot.get_chat.await_count == 1
+        
+        service.invalidate_chat(-100)
+        await service.get_chat("@Group")
+        assert bot.get_chat.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_send_media_group(self):
+        """Test an album is sent as one call and converted per message"""
+        chat = telegram.Chat(id=1, type="private")
+        bot = AsyncMock()
+        bot.send_media_group.return_value = [
+            telegram.Message(message_id=i, date=datetime.now(), chat=chat)
+            for i in (10, 11)
+        ]
+        service = TelegramAPIService(bot)
+        media = [telegram.InputMediaPhoto("a"), telegram.InputMediaPhoto("b")]
+        
+        messages = await service.send_media_group(1, media)
+        
+        assert [message.message_id for message in messages] == [10, 11]
+        bot.send_media_group.assert_awaited_once()
+        assert await service.send_media_group(1, media, return_model=False) == [10, 11]
+        await service.shutdown()
+
+class TestBatchingSender:
+    """Test reply batching"""
+    
+    @pytest.mark.asyncio
+    async def test_replies_coalesced(self):
+        """Test short replies to one chat are sent as one message"""
+        api_service = AsyncMock()
+        sender = BatchingSender(api_service, window=0.01)
+        
+        await sender.send_message(1, "one")
+        await sender.send_message(1, "two")
+        await sender.send_message(2, "three")
+        api_service.send_message.assert_not_called()
+        
+        await asyncio.sleep(0.05)
+        
+        api_service.send_message.assert_any_call(1, "one\ntwo", return_model=False)
+        api_service.send_message.assert_any_call(2, "three", return_model=False)
+        assert api_service.send_message.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_long_reply_flushes_first(self):
+        """Test unbatched replies go out after the chat's pending ones"""
+        api_service = AsyncMock()
+        sender = BatchingSender(api_service, batch_threshold=5, max_length=10)
+        
+        await sender.send_message(1, "abc")
+        await sender.send_message(1, "defgh")
+        await sender.send_message(1, "long reply")
+        
+        sent = [call.args[1] for call in api_service.send_message.call_args_list]
+        assert sent == ["abc\ndefgh", "long reply"]
+
+class TestMessageService:
+    """Test message persistence"""
+    
+    @pytest.mark.asyncio
+    async def test_save_text_messages(self):
+        """Test messages without media are bulk inserted once"""
+        pytest.importorskip("aiosqlite")
+        from sqlalchemy import select
+        
+        db_service = DatabaseService("sqlite+aiosqlite://")
+        await db_service.initialize()
+        await db_service.create_tables()
+        message = TelegramMessage(
+            message_id=1,
+            date=datetime.utcnow(),
+            chat=TelegramChat(id=67890, type=ChatType.PRIVATE),
+            text="hello"
+        )
+        
+        service = MessageService(db_service)
+        await service.save_messages([(message, None, 1)])
+        await service.save_messages([(message, None, 1)])
+        
+        async with db_service.get_session() as session:
+            rows = (await session.execute(select(Message))).scalars().all()
+        await db_service.close()
+        
+        assert [(row.text, row.media_type, row.file_id) for row in rows] == [("hello", None, None)]
+
+class TestBotLogService:
+    """Test bot log partition maintenance"""
+    
+    @pytest.mark.asyncio
+    async def test_partition_takes_over_default_rows(self):
+        """Test rows stranded in the default partition move to the new week"""
+        conn = Mock()
+        conn.scalar = AsyncMock(side_effect=[False, True])
+        conn.execute = AsyncMock()
+        begin = AsyncMock()
+        begin.__aenter__.return_value = conn
+        engine = Mock()
+        engine.dialect.name = "postgresql"
+        engine.begin.return_value = begin
+        
+        await BotLogService(Mock(engine=engine)).ensure_log_partitions(weeks_ahead=0)
+        
+        statements = [str(call.args[0]).split()[:2] for call in conn.execute.await_args_list]
+        assert statements == [
+            ["ALTER", "TABLE"],
+            ["CREATE", "TABLE"],
+            ["INSERT", "INTO"],
+            ["DELETE", "FROM"],
+            ["ALTER", "TABLE"],
+        ]
+        assert "DETACH" in str(conn.execute.await_args_list[0].args[0])
+        assert "ATTACH" in str(conn.execute.await_args_list[-1].args[0])
+
+class TestUpdateProcessor:
+    """Test update processor"""
+    
+    @pytest.fixture
+    def processor(self):
+        """Create update processor instance"""
+        return UpdateProcessor(BotConfig(token="test_token", update_workers=2))
+    
+    @pytest.fixture
+    def poll_update(self):
+        """Mock poll update"""
+        update = Mock(spec=["update_id", "poll"])
+        update.update_id = 1
+        update.poll = Mock()
+        return update
+    
+    @pytest.mark.asyncio
+    async def test_inline_dispatch(self, processor, poll_update):
+        """Test updates fed in by hand are dispatched to their handlers"""
+        received = []
+        
+        async def handler(update):
+            received.append(update)
+        
+        processor.register_handler("poll", handler)
+        
+        with patch.object(TelegramUpdate, "from_telegram_update", return_value=Mock()):
+            assert await processor.process_update(poll_update) is True
+        
+        assert len(received) == 1
+    
+    @pytest.mark.asyncio
+    async def test_queued_dispatch(self, processor, poll_update):
+        """Test updates are dispatched by the worker pool"""
+        received = []
+        
+        async def handler(update):
+            received.append(update)
+        
+        processor.register_handler("poll", handler)
+        
+        await processor.start()
+        with patch.object(TelegramUpdate, "from_telegram_update", return_value=Mock()):
+            assert await processor.process_update(poll_update) is True
+            await processor.drain()
+        await processor.stop()
+        
+        assert len(received) == 1
+    
+    def test_update_type_specialized(self, processor):
+        """Test the generated classifier checks only handled kinds, hottest first"""
+        # Reading any attribute outside the spec raises AttributeError
+        update = Mock(spec=["poll"])
+        update.poll = Mock()
+        assert processor._get_update_type(update) == -1
+        
+        processor.register_handler("poll", AsyncMock())
+        processor.register_handler("message", AsyncMock())
+        with pytest.raises(AttributeError):
+            processor._get_update_type(update)
+        
+        for _ in range(_RECOMPILE_INTERVAL):
+            processor._record_hit(UpdateKind.POLL)
+        assert processor._get_update_type(update) == UpdateKind.POLL
+    
+    @pytest.mark.asyncio
+    async def test_unhandled_update_skips_conversion(self, processor, poll_update):
+        """Test updates without handlers are not converted"""
+        with patch.object(TelegramUpdate, "from_telegram_update") as convert:
+            assert await processor.process_update(poll_update) is False
+
+        convert.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_attached_dispatch(self, processor, poll_update):
+        """Test handlers are dispatched through the application's handler groups"""
+        received = []
+        
+        async def handler(update):
+            received.append(update)
+        
+        application = Application.builder().token("123:abc").build()
+        processor.attach(application)
+        processor.register_handler("poll", handler)
+        processor.register_handler("poll", handler)
+        
+        native = application.handlers[1]
+        assert len(native) == 1
+        assert isinstance(native[0], PollHandler)
+        
+        with patch.object(TelegramUpdate, "from_telegram_update", return_value=Mock()):
+            await native[0].callback(poll_update, None)
+        
+        assert len(received) == 2
+
+class TestChatOrderedUpdateProcessor:
+    """Test per-chat ordered update processing"""
+    
+    @staticmethod
+    def chat_update(chat_id):
+        """Mock update from a chat"""
+        update = Mock()
+        update.effective_chat.id = chat_id
+        return update
+    
+    @pytest.mark.asyncio
+    async def test_chat_ordering(self):
+        """Test one chat runs in order while other chats proceed"""
+        processor = ChatOrderedUpdateProcessor(4)
+        events = []
+        gate = asyncio.Event()
+        
+        async def work(name, wait=False):
+            events.append(f"{name} start")
+            if wait:
+                await gate.wait()
+            events.append(f"{name} end")
+        
+        tasks = [
+            asyncio.create_task(processor.process_update(self.chat_update(1), work("a1", wait=True))),
+            asyncio.create_task(processor.process_update(self.chat_update(1), work("a2"))),
+            asyncio.create_task(processor.process_update(self.chat_update(2), work("b1"))),
+        ]
+        await asyncio.sleep(0.01)
+        
+        assert events == ["a1 start", "b1 start", "b1 end"]
+        # The waiting update stays in flight until its turn has run
+        assert not tasks[1].done()
+        
+        gate.set()
+        await asyncio.gather(*tasks)
+        await processor.shutdown()
+        
+        assert events[3:] == ["a1 end", "a2 start", "a2 end"]
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        """Test running updates are limited to max_concurrent_updates"""
+        processor = ChatOrderedUpdateProcessor(1)
+        events = []
+        gate = asyncio.Event()
+        
+        async def work(name):
+            events.append(name)
+            await gate.wait()
+        
+        tasks = [
+            asyncio.create_task(processor.process_update(self.chat_update(chat_id), work(chat_id)))
+            for chat_id in (1, 2)
+        ]
+        await asyncio.sleep(0.01)
+        assert events == [1]
+        
+        gate.set()
+        await asyncio.gather(*tasks)
+        assert events == [1, 2]
+    
+    @pytest.mark.asyncio
+    async def test_busy_chat_does_not_block_others(self):
+        """Test a chat queueing more updates than there are workers leaves other chats running"""
+        processor = ChatOrderedUpdateProcessor(2)
+        events = []
+        gate = asyncio.Event()
+        
+        async def work(name, wait=False):
+            if wait:
+                await gate.wait()
+            events.append(name)
+        
+        tasks = [asyncio.create_task(processor.process_update(self.chat_update(1), work("a0", wait=True)))]
+        tasks += [
+            asyncio.create_task(processor.process_update(self.chat_update(1), work(f"a{i}")))
+            for i in range(1, 5)
+        ]
+        tasks.append(asyncio.create_task(processor.process_update(self.chat_update(2), work("b"))))
+        await asyncio.sleep(0.01)
+        assert events == ["b"]
+        
+        gate.set()
+        await asyncio.gather(*tasks)
+        await processor.shutdown()
+        assert events == ["b", "a0", "a1", "a2", "a3", "a4"]
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_keeps_order(self):
+        """Test cancelling a waiting update does not let the next one overtake the running one"""
+        processor = ChatOrderedUpdateProcessor(4)
+        events = []
+        gate = asyncio.Event()
+        
+        async def work(name, wait=False):
+            if wait:
+                await gate.wait()
+            events.append(name)
+        
+        first = asyncio.create_task(processor.process_update(self.chat_update(1), work("first", wait=True)))
+        waiter = asyncio.create_task(processor.process_update(self.chat_update(1), work("cancelled")))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        
+        last = asyncio.create_task(processor.process_update(self.chat_update(1), work("last")))
+        await asyncio.sleep(0.01)
+        assert events == []
+        
+        gate.set()
+        await asyncio.gather(first, last)
+        await processor.shutdown()
+        assert events == ["first", "last"]
+        assert not processor._tails
+    
+    @pytest.mark.asyncio
+    async def test_chat_queue_full(self):
+        """Test updates beyond a chat's queue size are dropped"""
+        processor = ChatOrderedUpdateProcessor(4, max_pending=1)
+        done = []
+        gate = asyncio.Event()
+        
+        async def work(name):
+            await gate.wait()
+            done.append(name)
+        
+        tasks = [
+            asyncio.create_task(processor.process_update(self.chat_update(1), work(name)))
+            for name in ("first", "second")
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        await asyncio.gather(*tasks)
+        await processor.shutdown()
+        
+        assert done == ["first"]
 
 class TestTelegramBot:
     """Test main Telegram bot class"""
@@ -390,12 +1389,73 @@ class TestTelegramBot:
     def test_bot_status(self, telegram_bot):
         """Test bot status"""
         status = telegram_bot.get_status()
-        assert isinstance(status, dict)
-        assert "is_running" in status
-        assert "mode" in status
-        assert "token_configured" in status
-        assert status["mode"] == "polling"
-        assert status["token_configured"] is True
+        assert isinstance(status, BotStatus)
+        assert status.is_running is False
+        assert status.mode == "polling"
+        assert status.token_configured is True
+        assert status.to_dict()["mode"] == "polling"
+    
+    def test_bot_status_cached(self, telegram_bot):
+        """Test bot status is reused until invalidated"""
+        status = telegram_bot.get_status()
+        assert telegram_bot.get_status() is status
+        
+        telegram_bot.invalidate_status()
+        assert telegram_bot.get_status() is not status
+    
+    @pytest.mark.asyncio
+    async def test_failed_initialize_closes_read_pool(self, bot_config):
+        """Test a failing startup step shuts down the already opened read bot"""
+        from telegram.request import HTTPXRequest
+        
+        bot_config.mode = BotMode.WEBHOOK
+        bot_config.webhook_url = "https://example.com"
+        telegram_bot = TelegramBot(bot_config)
+        shutdown = HTTPXRequest.shutdown
+        
+        with (
+            patch.object(telegram.Bot, "get_me", AsyncMock()),
+            patch.object(WebhookManager, "setup_webhook", AsyncMock(return_value=False)),
+            patch.object(HTTPXRequest, "shutdown", autospec=True, side_effect=shutdown) as closed,
+        ):
+            assert await telegram_bot.initialize() is False
+        
+        assert telegram_bot.api_service is None
+        assert all(call.args[0]._client.is_closed for call in closed.await_args_list)
+        assert closed.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_stop_leaves_foreign_log_listener(self, telegram_bot):
+        """Test only the bot that installed queue logging tears it down"""
+        core_module = sys.modules[TelegramBot.__module__]
+        with patch.object(core_module, "_stop_queue_logging") as stop_logging:
+            await telegram_bot.stop()
+            stop_logging.assert_not_called()
+            
+            telegram_bot._owns_log_listener = True
+            await telegram_bot.stop()
+            stop_logging.assert_called_once()
+        assert telegram_bot._owns_log_listener is False
+    
+    @pytest.mark.asyncio
+    async def test_unauthorized_user_stopped(self, bot_config):
+        """Test any update from a user outside allowed_users stops all handlers"""
+        bot_config.allowed_users = [1]
+        telegram_bot = TelegramBot(bot_config)
+        update = Mock()
+        update.effective_user.id = 2
+        update.message.reply_text = AsyncMock()
+        
+        with pytest.raises(ApplicationHandlerStop):
+            await telegram_bot._check_allowed_user(update, None)
+        update.message.reply_text.assert_awaited_once()
+        
+        update.effective_user.id = 1
+        assert await telegram_bot._check_allowed_user(update, None) is None
+        
+        telegram_bot.application = Application.builder().token("123:abc").build()
+        await telegram_bot._register_default_handlers()
+        assert isinstance(telegram_bot.application.handlers[-1][0], TypeHandler)
 
 # Integration tests
 class TestIntegration: